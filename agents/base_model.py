@@ -1,2 +1,130 @@
+"""
+Base contract for campAIgn-pilot agents: async, batched and streaming inference.
+
+Concurrent `ainvoke` calls are coalesced into a single batched model request:
+the first call opens a short window (`batch_window_ms`) and every call that
+arrives before it closes, up to `max_batch_size`, is sent in the same batch.
+
+A subclass only has to say how to call its model in bulk, either by passing a
+`model` with `abatch`/`batch` (any LangChain runnable works) or by overriding
+`_agenerate_batch`. It gets ainvoke/abatch/astream and their sync forms for free.
+"""
+
+import asyncio
+from typing import Any, AsyncIterator, Dict, List, Optional, Set
+
+
 class BaseModel:
-    pass 
\ No newline at end of file
+    max_batch_size: int = 16
+    batch_window_ms: float = 5.0
+
+    def __init__(self, model: Any = None, max_batch_size: Optional[int] = None,
+                 batch_window_ms: Optional[float] = None):
+        self.model = model
+        if max_batch_size is not None:
+            self.max_batch_size = max_batch_size
+        if batch_window_ms is not None:
+            self.batch_window_ms = batch_window_ms
+        self.stats: Dict[str, int] = {"requests": 0, "batches": 0, "largest_batch": 0}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._pending: List[tuple] = []
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        # The loop only keeps weak references to tasks, so in-flight batches are held here
+        self._batch_tasks: Set[asyncio.Task] = set()
+
+    # ------------------------------------------------------------------
+    # Hooks for subclasses
+    # ------------------------------------------------------------------
+
+    def prepare(self, input: Any) -> Any:
+        """Turn a caller's input into the model's input (e.g. fill a prompt template)."""
+        return input
+
+    def parse(self, output: Any) -> Any:
+        """Turn a raw model output into the agent's result (chat messages become their text)."""
+        return getattr(output, "content", output)
+
+    async def _agenerate_batch(self, inputs: List[Any]) -> List[Any]:
+        """Run one batched model request. Override to call a model without abatch/batch."""
+        if self.model is None:
+            raise RuntimeError(f"{type(self).__name__} has no model configured")
+        if hasattr(self.model, "abatch"):
+            return await self.model.abatch(inputs)
+        return await asyncio.to_thread(self.model.batch, inputs)
+
+    async def _astream_model(self, input: Any) -> AsyncIterator[Any]:
+        """Stream raw chunks for one input; falls back to a single chunk without model streaming."""
+        if self.model is not None and hasattr(self.model, "astream"):
+            async for chunk in self.model.astream(input):
+                yield chunk
+        else:
+            yield (await self._agenerate_batch([input]))[0]
+
+    # ------------------------------------------------------------------
+    # Micro-batching
+    # ------------------------------------------------------------------
+
+    def _flush(self) -> None:
+        self._flush_handle = None
+        batch, self._pending = self._pending[:self.max_batch_size], self._pending[self.max_batch_size:]
+        if self._pending:
+            self._flush_handle = self._loop.call_soon(self._flush)
+        if batch:
+            task = self._loop.create_task(self._run_batch(batch))
+            self._batch_tasks.add(task)
+            task.add_done_callback(self._batch_tasks.discard)
+
+    async def _run_batch(self, batch: List[tuple]) -> None:
+        self.stats["batches"] += 1
+        self.stats["largest_batch"] = max(self.stats["largest_batch"], len(batch))
+        try:
+            outputs = await self._agenerate_batch([input for input, _ in batch])
+            if len(outputs) != len(batch):
+                raise RuntimeError(f"Model returned {len(outputs)} outputs for {len(batch)} inputs")
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        except BaseException:
+            # Cancelled mid-request: cancel the callers' futures too instead of leaving them waiting
+            for _, future in batch:
+                future.cancel()
+            raise
+        for (_, future), output in zip(batch, outputs):
+            if not future.done():
+                future.set_result(output)
+
+    # ------------------------------------------------------------------
+    # Public interface
+    # ------------------------------------------------------------------
+
+    async def ainvoke(self, input: Any) -> Any:
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            # Batches never span event loops (e.g. successive asyncio.run calls)
+            self._loop, self._pending, self._flush_handle = loop, [], None
+
+        future = loop.create_future()
+        self._pending.append((self.prepare(input), future))
+        self.stats["requests"] += 1
+        if len(self._pending) >= self.max_batch_size:
+            if self._flush_handle is not None:
+                self._flush_handle.cancel()
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.batch_window_ms / 1000, self._flush)
+        return self.parse(await future)
+
+    async def abatch(self, inputs: List[Any]) -> List[Any]:
+        return list(await asyncio.gather(*(self.ainvoke(input) for input in inputs)))
+
+    async def astream(self, input: Any) -> AsyncIterator[Any]:
+        async for chunk in self._astream_model(self.prepare(input)):
+            yield self.parse(chunk)
+
+    def invoke(self, input: Any) -> Any:
+        return asyncio.run(self.ainvoke(input))
+
+    def batch(self, inputs: List[Any]) -> List[Any]:
+        return asyncio.run(self.abatch(inputs))
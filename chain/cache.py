@@ -0,0 +1,258 @@
+"""
+Semantic LLM response cache for LCEL chains.
+
+Usage:
+    cache = SemanticCache("chain_cache.sqlite")
+    chain = prompt | cached(llm, cache) | StrOutputParser()
+
+Lookups match the exact prompt. Similarity matching (the most similar cached
+prompt, by cosine of embeddings, at or above a threshold) is off by default:
+prompts rendered from one template differ only in their variables, so
+"...the game: Diablo II" and "...the game: Diablo III" score about 0.9 and
+would share an answer. Only pass a threshold (or set
+CHAIN_CACHE_SIMILARITY_THRESHOLD) for prompts that are free text.
+"""
+
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+Embedder = Callable[[List[str]], Sequence[Sequence[float]]]
+
+DEFAULT_CACHE_PATH = os.getenv("CHAIN_CACHE_PATH", "chain_cache.sqlite")
+# None turns similarity matching off (exact prompts only)
+DEFAULT_SIMILARITY_THRESHOLD = (float(os.environ["CHAIN_CACHE_SIMILARITY_THRESHOLD"])
+                                if os.getenv("CHAIN_CACHE_SIMILARITY_THRESHOLD") else None)
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+class HashingEmbedder:
+    """Local embedder: signed feature hashing of words and word pairs (no model or API)."""
+
+    def __init__(self, dim: int = 256):
+        self.dim = dim
+
+    def __call__(self, texts: List[str]) -> List[List[float]]:
+        vectors = []
+        for text in texts:
+            vector = [0.0] * self.dim
+            tokens = _TOKEN_PATTERN.findall(text.lower())
+            for feature in tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]:
+                h = zlib.crc32(feature.encode("utf-8"))
+                vector[h % self.dim] += 1.0 if h & 0x80000000 else -1.0
+            vectors.append(vector)
+        return vectors
+
+
+def _normalize(vector: Sequence[float]) -> np.ndarray:
+    vector = np.asarray(vector, dtype=np.float32)
+    norm = float(np.linalg.norm(vector)) or 1.0
+    return vector / norm
+
+
+class _VectorIndex:
+    """
+    Normalised embeddings of one llm_string, one row per entry of a float32 matrix.
+
+    Rows are only ever appended; removed entries just lose their key. When the
+    matrix is full it is replaced by a compacted copy, so a snapshot taken
+    earlier stays valid while it is scanned outside the cache lock.
+    """
+
+    def __init__(self):
+        self.matrix: Optional[np.ndarray] = None
+        self.keys: List[Optional[str]] = []
+        self.rows: Dict[str, int] = {}
+
+    def add(self, key: str, vector: np.ndarray) -> None:
+        if key in self.rows:
+            return  # same key, same prompt, same embedding
+        if self.matrix is None or len(self.keys) == len(self.matrix):
+            self._compact(len(vector))
+        row = len(self.keys)
+        self.matrix[row] = vector
+        self.keys.append(key)
+        self.rows[key] = row
+
+    def remove(self, key: str) -> None:
+        row = self.rows.pop(key, None)
+        if row is not None:
+            self.keys[row] = None
+
+    def _compact(self, dim: int) -> None:
+        live = list(self.rows.items())
+        matrix = np.empty((max(16, 2 * len(live)), dim), dtype=np.float32)
+        for new_row, (_, old_row) in enumerate(live):
+            matrix[new_row] = self.matrix[old_row]
+        self.matrix = matrix
+        self.keys = [key for key, _ in live]
+        self.rows = {key: row for row, key in enumerate(self.keys)}
+
+    def snapshot(self) -> Tuple[List[Optional[str]], np.ndarray]:
+        """Keys and matrix rows as of now; later adds go to rows beyond the snapshot."""
+        return self.keys, self.matrix[:len(self.keys)]
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+
+class SemanticCache:
+    """
+    Persistent prompt -> response cache with exact and embedding-similarity lookup.
+
+    Entries live in a local SQLite file; their normalised embeddings are also kept
+    in memory as a float32 matrix per llm_string, so a similarity lookup is one
+    matrix-vector product. The embedding and the scan run outside the lock.
+    Responses are stored as JSON, so callers cache anything JSON-serialisable.
+    """
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, threshold: Optional[float] = DEFAULT_SIMILARITY_THRESHOLD,
+                 embedder: Optional[Embedder] = None, max_entries: int = 10000):
+        self.path = path
+        self.threshold = threshold
+        self.embedder = embedder or HashingEmbedder()
+        self.max_entries = max_entries
+        self.stats = {"lookups": 0, "exact_hits": 0, "semantic_hits": 0, "misses": 0, "updates": 0}
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache ("
+            " key TEXT PRIMARY KEY, llm_string TEXT, prompt TEXT, response TEXT,"
+            " embedding BLOB, created_at REAL)"
+        )
+        self._conn.commit()
+        self._vectors: Dict[str, _VectorIndex] = {}
+        for key, llm_string, embedding in self._conn.execute("SELECT key, llm_string, embedding FROM cache"):
+            self._vectors.setdefault(llm_string, _VectorIndex()).add(key, np.frombuffer(embedding, dtype=np.float32))
+
+    @staticmethod
+    def _key(prompt: str, llm_string: str) -> str:
+        return hashlib.sha256(f"{llm_string}\x00{prompt}".encode("utf-8")).hexdigest()
+
+    def _fetch(self, key: str) -> Any:
+        row = self._conn.execute("SELECT response FROM cache WHERE key = ?", (key,)).fetchone()
+        return None if row is None else json.loads(row[0])
+
+    def lookup(self, prompt: str, llm_string: str = "") -> Any:
+        """Return the cached response for a prompt (exact or similar enough), or None."""
+        key = self._key(prompt, llm_string)
+        with self._lock:
+            self.stats["lookups"] += 1
+            response = self._fetch(key)
+            if response is not None:
+                self.stats["exact_hits"] += 1
+                return response
+
+            index = self._vectors.get(llm_string)
+            if self.threshold is None or not index:
+                self.stats["misses"] += 1
+                return None
+            keys, matrix = index.snapshot()
+
+        query = _normalize(self.embedder([prompt])[0])
+        scores = matrix @ query
+        rows = np.flatnonzero(scores >= self.threshold)
+        rows = rows[np.argsort(-scores[rows])]
+
+        with self._lock:
+            # Entries evicted since the snapshot are skipped; the best live one wins
+            for row in rows:
+                candidate_key = keys[row]
+                if candidate_key is not None and candidate_key in index.rows:
+                    response = self._fetch(candidate_key)
+                    if response is not None:
+                        self.stats["semantic_hits"] += 1
+                        return response
+            self.stats["misses"] += 1
+            return None
+
+    def update(self, prompt: str, llm_string: str, response: Any) -> None:
+        """Store a response, evicting the oldest entries beyond max_entries."""
+        key = self._key(prompt, llm_string)
+        vector = _normalize(self.embedder([prompt])[0])
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache VALUES (?, ?, ?, ?, ?, ?)",
+                (key, llm_string, prompt, json.dumps(response), vector.tobytes(), time.time()),
+            )
+            self._vectors.setdefault(llm_string, _VectorIndex()).add(key, vector)
+            overflow = sum(len(v) for v in self._vectors.values()) - self.max_entries
+            if overflow > 0:
+                oldest = self._conn.execute(
+                    "SELECT key, llm_string FROM cache ORDER BY created_at LIMIT ?", (overflow,)
+                ).fetchall()
+                self._conn.executemany("DELETE FROM cache WHERE key = ?", [(k,) for k, _ in oldest])
+                for old_key, old_llm_string in oldest:
+                    if old_llm_string in self._vectors:
+                        self._vectors[old_llm_string].remove(old_key)
+            self._conn.commit()
+            self.stats["updates"] += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM cache")
+            self._conn.commit()
+            self._vectors.clear()
+
+    def hit_rate(self) -> float:
+        lookups = self.stats["lookups"]
+        return (self.stats["exact_hits"] + self.stats["semantic_hits"]) / lookups if lookups else 0.0
+
+    def __len__(self) -> int:
+        return sum(len(v) for v in self._vectors.values())
+
+
+def cached(model: Any, cache: SemanticCache, llm_string: Optional[str] = None):
+    """
+    Wrap a chat model or LLM in a cache-aware runnable for use inside an LCEL chain.
+
+    Args:
+        model: Any runnable taking a prompt value (e.g. ChatGoogleGenerativeAI)
+        cache: The SemanticCache to read and populate
+        llm_string: Cache namespace; defaults to the model's class and model name so
+            different models never share entries
+    """
+    from langchain_core.messages import AIMessage
+    from langchain_core.runnables import RunnableLambda
+
+    namespace = llm_string or f"{type(model).__name__}:{getattr(model, 'model', '')}"
+
+    def _from_cache(hit: Dict[str, Any]) -> Any:
+        return AIMessage(content=hit["content"]) if hit["type"] == "message" else hit["content"]
+
+    def _to_cache(output: Any) -> Dict[str, Any]:
+        if isinstance(output, AIMessage):
+            return {"type": "message", "content": output.content}
+        return {"type": "text", "content": output}
+
+    def _prompt_text(prompt: Any) -> str:
+        return prompt.to_string() if hasattr(prompt, "to_string") else str(prompt)
+
+    def _invoke(prompt: Any, config: Optional[Dict[str, Any]] = None) -> Any:
+        text = _prompt_text(prompt)
+        hit = cache.lookup(text, namespace)
+        if hit is not None:
+            return _from_cache(hit)
+        output = model.invoke(prompt, config)
+        cache.update(text, namespace, _to_cache(output))
+        return output
+
+    async def _ainvoke(prompt: Any, config: Optional[Dict[str, Any]] = None) -> Any:
+        text = _prompt_text(prompt)
+        hit = cache.lookup(text, namespace)
+        if hit is not None:
+            return _from_cache(hit)
+        output = await model.ainvoke(prompt, config)
+        cache.update(text, namespace, _to_cache(output))
+        return output
+
+    return RunnableLambda(_invoke, afunc=_ainvoke, name=f"Cached{type(model).__name__}")
@@ -0,0 +1,198 @@
+"""
+Conversation checkpointing for agent chains.
+
+State is stored incrementally: each `append` writes only the new turns (and the
+metadata keys that changed), never a full snapshot. Once a thread holds more than
+MAX_CONVERSATION_HISTORY turns, the oldest are folded into a running summary and
+deleted, so both storage and `load` cost stay bounded however long the
+conversation runs.
+
+    checkpointer = get_checkpointer()          # LANGGRAPH_CHECKPOINT_BACKEND=memory|sqlite
+    checkpointer.append("thread-1", [{"role": "user", "content": "hi"}])
+    state = checkpointer.load("thread-1")      # summary + recent turns + metadata
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+MAX_CONVERSATION_HISTORY = int(os.getenv("MAX_CONVERSATION_HISTORY", "10"))
+CHECKPOINT_BACKEND = os.getenv("LANGGRAPH_CHECKPOINT_BACKEND", "memory").split("#")[0].strip()
+CHECKPOINT_URI = os.getenv("LANGGRAPH_CHECKPOINT_URI", "").split("#")[0].strip()
+
+Turn = Dict[str, Any]
+Summarizer = Callable[[Optional[str], List[Turn]], str]
+
+
+def truncating_summarizer(summary: Optional[str], turns: List[Turn], max_chars: int = 2000) -> str:
+    """Fold turns into the summary as short 'role: text' lines, keeping only the newest max_chars."""
+    lines = [summary] if summary else []
+    lines += [f"{turn.get('role', '?')}: {str(turn.get('content', ''))[:200]}" for turn in turns]
+    return "\n".join(lines)[-max_chars:]
+
+
+@dataclass
+class Checkpoint:
+    thread_id: str
+    summary: Optional[str] = None
+    turns: List[Turn] = field(default_factory=list)
+    metadata: Dict[str, Any] = field(default_factory=dict)
+    version: int = 0  # sequence number of the last stored turn
+
+
+class Checkpointer(ABC):
+    """Delta-based checkpoint store with bounded history; backends supply row storage."""
+
+    def __init__(self, max_history: int = MAX_CONVERSATION_HISTORY, summarizer: Summarizer = truncating_summarizer):
+        self.max_history = max_history
+        self.summarizer = summarizer
+        self._lock = threading.Lock()
+
+    # Backend primitives ------------------------------------------------
+
+    @abstractmethod
+    def _write_turns(self, thread_id: str, turns: List[Tuple[int, Turn]], metadata: Dict[str, Any]) -> None:
+        """Append (seq, turn) rows and merge metadata keys."""
+
+    @abstractmethod
+    def _read(self, thread_id: str) -> Checkpoint:
+        """Return the stored summary, turns (oldest first), metadata and last seq."""
+
+    @abstractmethod
+    def _compact(self, thread_id: str, summary: str, through_seq: int) -> None:
+        """Store the new summary and delete turns with seq <= through_seq."""
+
+    @abstractmethod
+    def delete(self, thread_id: str) -> None:
+        """Remove everything stored for a thread."""
+
+    # Public interface --------------------------------------------------
+
+    def append(self, thread_id: str, turns: List[Turn], metadata: Optional[Dict[str, Any]] = None) -> int:
+        """
+        Record new turns (and changed metadata keys) for a thread.
+
+        Returns:
+            The thread's new version (sequence number of its last turn)
+        """
+        with self._lock:
+            state = self._read(thread_id)
+            rows = [(state.version + i + 1, {**turn, "ts": turn.get("ts", time.time())}) for i, turn in enumerate(turns)]
+            changed = {k: v for k, v in (metadata or {}).items() if state.metadata.get(k) != v}
+            self._write_turns(thread_id, rows, changed)
+
+            overflow = len(state.turns) + len(rows) - self.max_history
+            if overflow > 0:
+                folded = (state.turns + [turn for _, turn in rows])[:overflow]
+                through_seq = state.version - len(state.turns) + overflow
+                self._compact(thread_id, self.summarizer(state.summary, folded), through_seq)
+            return state.version + len(rows)
+
+    def load(self, thread_id: str) -> Checkpoint:
+        """Resume a thread: running summary, the last max_history turns and metadata."""
+        with self._lock:
+            return self._read(thread_id)
+
+
+class MemoryCheckpointer(Checkpointer):
+    """In-process backend (state is lost on exit)."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._threads: Dict[str, Checkpoint] = {}
+
+    def _write_turns(self, thread_id, turns, metadata):
+        state = self._threads.setdefault(thread_id, Checkpoint(thread_id))
+        state.turns.extend(turn for _, turn in turns)
+        state.metadata.update(metadata)
+        if turns:
+            state.version = turns[-1][0]
+
+    def _read(self, thread_id):
+        state = self._threads.get(thread_id)
+        if state is None:
+            return Checkpoint(thread_id)
+        return Checkpoint(thread_id, state.summary, list(state.turns), dict(state.metadata), state.version)
+
+    def _compact(self, thread_id, summary, through_seq):
+        state = self._threads[thread_id]
+        first_seq = state.version - len(state.turns) + 1
+        del state.turns[:through_seq - first_seq + 1]
+        state.summary = summary
+
+    def delete(self, thread_id):
+        with self._lock:
+            self._threads.pop(thread_id, None)
+
+
+class SQLiteCheckpointer(Checkpointer):
+    """Local SQLite backend: one row per turn, one row per thread for summary and metadata."""
+
+    def __init__(self, path: str = "checkpoints.sqlite", **kwargs):
+        super().__init__(**kwargs)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.executescript(
+            "CREATE TABLE IF NOT EXISTS threads ("
+            " thread_id TEXT PRIMARY KEY, summary TEXT, metadata TEXT NOT NULL DEFAULT '{}', version INTEGER NOT NULL);"
+            "CREATE TABLE IF NOT EXISTS turns ("
+            " thread_id TEXT NOT NULL, seq INTEGER NOT NULL, turn TEXT NOT NULL, PRIMARY KEY (thread_id, seq));"
+        )
+        self._conn.commit()
+
+    def _write_turns(self, thread_id, turns, metadata):
+        with self._conn:
+            row = self._conn.execute("SELECT metadata FROM threads WHERE thread_id = ?", (thread_id,)).fetchone()
+            merged = {**(json.loads(row[0]) if row else {}), **metadata}
+            version = turns[-1][0] if turns else None
+            self._conn.execute(
+                "INSERT INTO threads (thread_id, metadata, version) VALUES (?, ?, ?) "
+                "ON CONFLICT(thread_id) DO UPDATE SET metadata = excluded.metadata, "
+                "version = COALESCE(?, threads.version)",
+                (thread_id, json.dumps(merged), version or 0, version),
+            )
+            self._conn.executemany(
+                "INSERT INTO turns (thread_id, seq, turn) VALUES (?, ?, ?)",
+                [(thread_id, seq, json.dumps(turn)) for seq, turn in turns],
+            )
+
+    def _read(self, thread_id):
+        row = self._conn.execute(
+            "SELECT summary, metadata, version FROM threads WHERE thread_id = ?", (thread_id,)
+        ).fetchone()
+        if row is None:
+            return Checkpoint(thread_id)
+        turns = [json.loads(turn) for (turn,) in self._conn.execute(
+            "SELECT turn FROM turns WHERE thread_id = ? ORDER BY seq", (thread_id,)
+        )]
+        return Checkpoint(thread_id, row[0], turns, json.loads(row[1]), row[2])
+
+    def _compact(self, thread_id, summary, through_seq):
+        with self._conn:
+            self._conn.execute("UPDATE threads SET summary = ? WHERE thread_id = ?", (summary, thread_id))
+            self._conn.execute("DELETE FROM turns WHERE thread_id = ? AND seq <= ?", (thread_id, through_seq))
+
+    def delete(self, thread_id):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM turns WHERE thread_id = ?", (thread_id,))
+            self._conn.execute("DELETE FROM threads WHERE thread_id = ?", (thread_id,))
+
+
+def get_checkpointer(backend: Optional[str] = None, uri: Optional[str] = None, **kwargs) -> Checkpointer:
+    """
+    Build the configured checkpointer.
+
+    Args:
+        backend: memory | sqlite (defaults to LANGGRAPH_CHECKPOINT_BACKEND)
+        uri: SQLite file path (defaults to LANGGRAPH_CHECKPOINT_URI, then checkpoints.sqlite)
+    """
+    backend = backend or CHECKPOINT_BACKEND
+    if backend == "memory":
+        return MemoryCheckpointer(**kwargs)
+    if backend == "sqlite":
+        return SQLiteCheckpointer(uri or CHECKPOINT_URI or "checkpoints.sqlite", **kwargs)
+    raise ValueError(f"Unsupported checkpointer backend: {backend}")
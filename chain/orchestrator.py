@@ -1 +1,157 @@
-# Orchestrator stub 
\ No newline at end of file
+"""
+Async orchestrator that chains requests between agents (AD_Agent, DM_Agent, ...).
+
+An agent receives an input and returns either a final output or a hand-off:
+
+    Handoff("dm_agent", payload)            -> the next hop goes to dm_agent
+    [Handoff("ad_agent", a), Handoff("dm_agent", b)]
+                                            -> both run concurrently; the list of
+                                               their results goes back to the caller
+
+Every agent call counts as one hop against MAX_CHAIN_HOPS and is bounded by
+AGENT_RESPONSE_TIMEOUT. An optional overall deadline cancels whatever is still
+in flight when it passes, so end-to-end latency is bounded.
+"""
+
+import asyncio
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+MAX_CHAIN_HOPS = int(os.getenv("MAX_CHAIN_HOPS", "5"))
+AGENT_RESPONSE_TIMEOUT = float(os.getenv("AGENT_RESPONSE_TIMEOUT", "30"))
+
+
+@dataclass
+class Handoff:
+    """Route `input` to the agent registered as `agent`."""
+    agent: str
+    input: Any
+
+
+@dataclass
+class Hop:
+    """One agent call within a chain."""
+    agent: str
+    input: Any
+    output: Any = None
+    status: str = "ok"  # ok | timeout | error | cancelled
+    elapsed_ms: float = 0.0
+
+
+@dataclass
+class ChainResult:
+    """Outcome of a chain: the final output plus every hop taken."""
+    output: Any
+    status: str  # completed | hop_limit | timeout | deadline | error
+    hops: List[Hop] = field(default_factory=list)
+    elapsed_ms: float = 0.0
+    error: Optional[str] = None
+
+
+class HopLimitExceeded(Exception):
+    pass
+
+
+class HopFailed(Exception):
+    def __init__(self, hop: Hop):
+        super().__init__(f"{hop.agent} {hop.status}: {hop.output}")
+        self.hop = hop
+
+
+class Orchestrator:
+    """Routes hand-offs between registered agents under hop, per-hop and overall time limits."""
+
+    def __init__(self, agents: Optional[Dict[str, Any]] = None, max_hops: int = MAX_CHAIN_HOPS,
+                 hop_timeout: float = AGENT_RESPONSE_TIMEOUT):
+        self.agents = agents if agents is not None else default_agents()
+        self.max_hops = max_hops
+        self.hop_timeout = hop_timeout
+
+    async def _call_agent(self, name: str, payload: Any, hops: List[Hop]) -> Any:
+        if name not in self.agents:
+            raise KeyError(f"Unknown agent: {name}")
+        if len(hops) >= self.max_hops:
+            raise HopLimitExceeded(f"Chain exceeded {self.max_hops} hops")
+
+        agent = self.agents[name]
+        hop = Hop(agent=name, input=payload)
+        hops.append(hop)
+        start = time.perf_counter()
+        try:
+            if hasattr(agent, "ainvoke"):
+                call = agent.ainvoke(payload)
+            else:
+                call = asyncio.to_thread(agent.invoke, payload)
+            hop.output = await asyncio.wait_for(call, self.hop_timeout)
+        except asyncio.TimeoutError:
+            hop.status = "timeout"
+            raise HopFailed(hop)
+        except asyncio.CancelledError:
+            hop.status = "cancelled"
+            raise
+        except Exception as e:
+            hop.status, hop.output = "error", str(e)
+            raise HopFailed(hop) from e
+        finally:
+            hop.elapsed_ms = (time.perf_counter() - start) * 1000
+        return hop.output
+
+    async def _follow(self, name: str, payload: Any, hops: List[Hop]) -> Any:
+        """Call an agent and keep following its hand-offs until one returns a final output."""
+        output = await self._call_agent(name, payload, hops)
+        while True:
+            if isinstance(output, Handoff):
+                name, payload = output.agent, output.input
+                output = await self._call_agent(name, payload, hops)
+            elif isinstance(output, list) and output and all(isinstance(o, Handoff) for o in output):
+                # Independent sub-requests run concurrently; a failure cancels the siblings
+                async with asyncio.TaskGroup() as group:
+                    tasks = [group.create_task(self._follow(h.agent, h.input, hops)) for h in output]
+                output = await self._call_agent(name, [task.result() for task in tasks], hops)
+            else:
+                return output
+
+    async def run(self, agent: str, payload: Any, deadline: Optional[float] = None) -> ChainResult:
+        """
+        Run a chain starting at `agent`.
+
+        Args:
+            agent: Name of the first agent
+            payload: Input for the first agent
+            deadline: Optional overall time budget in seconds; in-flight calls are cancelled when it passes
+        """
+        hops: List[Hop] = []
+        start = time.perf_counter()
+        result = ChainResult(output=None, status="completed", hops=hops)
+        try:
+            async with asyncio.timeout(deadline):
+                result.output = await self._follow(agent, payload, hops)
+        except* TimeoutError:
+            _fail(result, "deadline", f"Chain exceeded its {deadline}s deadline")
+        except* HopLimitExceeded as group:
+            _fail(result, "hop_limit", str(group.exceptions[0]))
+        except* HopFailed as group:
+            hop = group.exceptions[0].hop
+            _fail(result, "timeout" if hop.status == "timeout" else "error", str(group.exceptions[0]))
+        except* KeyError as group:
+            _fail(result, "error", group.exceptions[0].args[0])
+        result.elapsed_ms = (time.perf_counter() - start) * 1000
+        return result
+
+    def run_sync(self, agent: str, payload: Any, deadline: Optional[float] = None) -> ChainResult:
+        return asyncio.run(self.run(agent, payload, deadline))
+
+
+def _fail(result: ChainResult, status: str, error: str) -> None:
+    # Concurrent branches can fail together; report the first failure
+    if result.status == "completed":
+        result.status, result.error = status, error
+
+
+def default_agents() -> Dict[str, Any]:
+    from agents.ad_agent import AD_Agent
+    from agents.dm_agent import DM_Agent
+
+    return {"ad_agent": AD_Agent(), "dm_agent": DM_Agent()}
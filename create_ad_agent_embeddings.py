@@ -1 +1,205 @@
-# Stub for AD Agent embeddings creation 
\ No newline at end of file
+#!/usr/bin/env python3
+"""
+Ad Agent Catalog Embeddings
+Batch pipeline that embeds the product catalog and past campaign copy into the
+memory-mapped vector store used by the Campaign Creator agent
+
+Only items whose content hash changed since the last run are re-embedded, so
+repeated runs over an unchanged catalog cost one pass of hashing.
+
+Usage:
+    python create_ad_agent_embeddings.py                        # products + campaigns from the API
+    python create_ad_agent_embeddings.py --products catalog.jsonl --no-campaigns
+    python create_ad_agent_embeddings.py --embedder mypkg.embed:Embedder --batch-size 64
+"""
+
+import argparse
+import hashlib
+import json
+import sys
+import time
+from itertools import islice
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+MULTI_AGENT_DIR = Path(__file__).resolve().parent / "multi-agent-system"
+sys.path.insert(0, str(MULTI_AGENT_DIR))
+
+from memory_store import (  # noqa: E402
+    DEFAULT_CATALOG_DIR, DEFAULT_CATALOG_EMBEDDER, MemmapVectorIndex, load_embedder
+)
+
+# =============================================================================
+# CATALOG SOURCES
+# =============================================================================
+
+def iter_products_from_file(path: str) -> Iterator[Dict[str, Any]]:
+    """Stream products from a .jsonl file (one product per line) or a .json array"""
+    with open(path, "r", encoding="utf-8") as f:
+        if path.endswith(".jsonl"):
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+        else:
+            yield from json.load(f)
+
+def iter_products_from_api() -> Iterator[Dict[str, Any]]:
+    """Fetch the whole catalog the way the agents' fetch_all_products tool does, without the prompt budget"""
+    from tools import list_products
+    yield from list_products()
+
+def iter_campaigns_from_api() -> Iterator[Dict[str, Any]]:
+    """Fetch every past campaign (name and ad copy), without the prompt budget"""
+    from tools import list_campaigns
+    yield from list_campaigns()
+
+# =============================================================================
+# ITEM PREPARATION
+# =============================================================================
+
+def product_item(product: Dict[str, Any]) -> Dict[str, Any]:
+    """Index entry for a product: text to embed plus the payload returned on retrieval"""
+    text = " | ".join(str(product.get(field, "")) for field in ("name", "category", "description"))
+    return {
+        "id": f"product:{product['id']}",
+        "text": f"{text} | ${product.get('price', '')}",
+        "payload": {
+            "kind": "product",
+            "product_id": product["id"],
+            "name": product.get("name"),
+            "category": product.get("category"),
+            "price": product.get("price")
+        }
+    }
+
+def campaign_item(campaign: Dict[str, Any]) -> Dict[str, Any]:
+    """Index entry for a past campaign, keyed by campaign id"""
+    return {
+        "id": f"campaign:{campaign['campaign_id']}",
+        "text": f"{campaign.get('campaign_name', '')} | {campaign.get('campaign_copy', '')}",
+        "payload": {
+            "kind": "campaign",
+            "campaign_id": campaign["campaign_id"],
+            "product_id": campaign.get("product_id"),
+            "campaign_name": campaign.get("campaign_name"),
+            "campaign_copy": campaign.get("campaign_copy"),
+            "roas": (campaign.get("metrics") or {}).get("roas")
+        }
+    }
+
+def content_hash(text: str, embedder_spec: str) -> str:
+    """Hash of the embedded text and the embedder that produced the vector"""
+    return hashlib.sha256(f"{embedder_spec}\x00{text}".encode("utf-8")).hexdigest()
+
+def batched(items: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    iterator = iter(items)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+# =============================================================================
+# PIPELINE
+# =============================================================================
+
+class EmbeddingPipeline:
+    """
+    Incrementally embeds catalog items into a MemmapVectorIndex
+
+    Items are streamed in batches; within a batch, unchanged items (same content
+    hash as the stored payload) are skipped and the rest are embedded with a
+    single embedder call and written with a single upsert.
+    """
+
+    def __init__(self, index: MemmapVectorIndex, embedder: Callable[[List[str]], Any],
+                 embedder_spec: str, batch_size: int = 32):
+        self.index = index
+        self.embedder = embedder
+        self.embedder_spec = embedder_spec
+        self.batch_size = batch_size
+        self.stats = {"seen": 0, "embedded": 0, "unchanged": 0, "removed": 0, "batches": 0}
+
+    def run(self, items: Iterable[Dict[str, Any]], prune_prefix: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Embed new and changed items
+
+        Args:
+            items: Iterable of {"id", "text", "payload"} entries
+            prune_prefix: If set, stored ids with this prefix that were not seen are removed
+                          (use only when `items` is the complete set for that prefix)
+        """
+        seen_ids = set()
+        for batch in batched(items, self.batch_size):
+            changed = []
+            for item in batch:
+                seen_ids.add(item["id"])
+                digest = content_hash(item["text"], self.embedder_spec)
+                stored = self.index.payload(item["id"])
+                if stored is not None and stored.get("content_hash") == digest:
+                    self.stats["unchanged"] += 1
+                    # Same text, so keep the vector; only refresh metadata such as ROAS
+                    payload = {**item["payload"], "content_hash": digest, "text": item["text"]}
+                    if payload != stored:
+                        self.index.update_payload(item["id"], payload)
+                else:
+                    changed.append((item, digest))
+            self.stats["seen"] += len(batch)
+            if not changed:
+                continue
+
+            vectors = self.embedder([item["text"] for item, _ in changed])
+            self.index.upsert(
+                [item["id"] for item, _ in changed],
+                vectors,
+                [{**item["payload"], "content_hash": digest, "text": item["text"]} for item, digest in changed]
+            )
+            self.stats["embedded"] += len(changed)
+            self.stats["batches"] += 1
+
+        if prune_prefix is not None:
+            stale = [item_id for item_id in self.index.ids() if item_id.startswith(prune_prefix) and item_id not in seen_ids]
+            self.stats["removed"] += self.index.remove(stale)
+
+        self.index.flush()
+        return self.stats
+
+def open_catalog_index(store: str, embedder: Callable[[List[str]], Any]) -> MemmapVectorIndex:
+    """Open (or create) the catalog index, sized to the embedder's dimension"""
+    path = Path(store)
+    if not path.is_absolute():
+        path = MULTI_AGENT_DIR / path
+    dim = len(embedder(["dimension probe"])[0])
+    index = MemmapVectorIndex(str(path), dim=dim)
+    if index.dim != dim:
+        raise ValueError(
+            f"{path} holds {index.dim}-dimensional vectors but the embedder produces {dim}; "
+            "use a different --store or delete the existing one"
+        )
+    return index
+
+def main():
+    parser = argparse.ArgumentParser(description="Embed the product catalog and past campaigns for the ad agent")
+    parser.add_argument("--products", help="Product file (.json array or .jsonl); default: fetch from the store API")
+    parser.add_argument("--no-campaigns", action="store_true", help="Skip indexing past campaign copy")
+    parser.add_argument("--store", default=DEFAULT_CATALOG_DIR,
+                        help="Vector store directory (relative paths resolve inside multi-agent-system/)")
+    parser.add_argument("--embedder", default=DEFAULT_CATALOG_EMBEDDER,
+                        help="'hashing' or module:attribute of an embedding callable")
+    parser.add_argument("--batch-size", type=int, default=32, help="Items per embedding call")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    embedder = load_embedder(args.embedder)
+    index = open_catalog_index(args.store, embedder)
+    pipeline = EmbeddingPipeline(index, embedder, args.embedder, batch_size=args.batch_size)
+
+    products = iter_products_from_file(args.products) if args.products else iter_products_from_api()
+    pipeline.run((product_item(p) for p in products), prune_prefix="product:")
+    if not args.no_campaigns:
+        pipeline.run((campaign_item(c) for c in iter_campaigns_from_api()), prune_prefix="campaign:")
+
+    stats = pipeline.stats
+    print(f"✅ Indexed {stats['seen']} items into {index.directory} in {time.perf_counter() - start:.2f}s")
+    print(f"   embedded: {stats['embedded']} ({stats['batches']} batches)  "
+          f"unchanged: {stats['unchanged']}  removed: {stats['removed']}  total stored: {len(index)}")
+
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,7 @@ from dotenv import load_dotenv
 from langchain_google_genai import ChatGoogleGenerativeAI # We'll use this for Gemini
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import StrOutputParser
+from chain.cache import SemanticCache, cached
 
 load_dotenv()
 
@@ -14,9 +15,11 @@ prompt = ChatPromptTemplate.from_messages(
     [("user", "Write a viral tweet promoting the game: {game_name}")]
 )
 
-# 3. Create the chain using LCEL
-chain = prompt | llm | StrOutputParser()
+# 3. Create the chain using LCEL, with repeated prompts served from the local cache
+cache = SemanticCache()
+chain = prompt | cached(llm, cache) | StrOutputParser()
 
 # 4. Invoke the chain
 result = chain.invoke({"game_name": "Diablo II"})
 print(result)
+print(f"cache: {cache.stats} hit rate {cache.hit_rate():.0%}")
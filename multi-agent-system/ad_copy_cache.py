@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Campaign Pilot Ad-Copy Cache
+Persistent cache of generated campaign names and ad copy, keyed by product fingerprint
+
+fetch_all_products marks unchanged products with their "cached_ad_copy", and
+create_campaign fills in the cached name and copy when the agent leaves them
+empty. A hit therefore saves the tokens of writing (and repeating) the copy.
+The creator agent still makes its LLM calls to pick products, budgets and
+tool calls; the cache does not skip the crew itself.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+# Bump whenever the campaign creation prompt changes so copy written under the old prompt is regenerated
+AD_COPY_PROMPT_VERSION = os.getenv("AD_COPY_PROMPT_VERSION", "v1")
+
+DEFAULT_CACHE_PATH = os.getenv("AD_COPY_CACHE_PATH", os.path.join("memory", "ad_copy_cache.json"))
+DEFAULT_MAX_ENTRIES = int(os.getenv("AD_COPY_CACHE_MAX_ENTRIES", "1000"))
+DEFAULT_TTL_SECONDS = float(os.getenv("AD_COPY_CACHE_TTL_SECONDS", str(30 * 86400)))
+
+def product_fingerprint(product: Dict[str, Any]) -> str:
+    """Hash of the product fields the copy is written from (name, description, price)"""
+    content = "\x00".join(str(product.get(field, "")) for field in ("name", "description", "price"))
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()[:16]
+
+class AdCopyCache:
+    """
+    LRU + TTL cache of generated ad copy, persisted as one compact JSON file
+
+    Keys combine product id, product fingerprint and prompt version, so editing a
+    product or the prompt naturally misses. Entries are kept in recency order and
+    the file is rewritten atomically, so a load is a single json.load.
+    """
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, max_entries: int = DEFAULT_MAX_ENTRIES,
+                 ttl_seconds: float = DEFAULT_TTL_SECONDS, prompt_version: str = AD_COPY_PROMPT_VERSION):
+        self.path = Path(path)
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.prompt_version = prompt_version
+        self.stats = {"hits": 0, "misses": 0, "stores": 0, "evictions": 0}
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._loaded = False
+
+    def key(self, product: Dict[str, Any]) -> str:
+        return f"{product['id']}:{product_fingerprint(product)}:{self.prompt_version}"
+
+    def _load(self):
+        if self._loaded:
+            return
+        self._loaded = True
+        if self.path.exists():
+            with open(self.path, "r", encoding="utf-8") as f:
+                self._entries = OrderedDict(json.load(f))
+
+    def _expired(self, entry: Dict[str, Any], now: float) -> bool:
+        return now - entry["created_at"] > self.ttl_seconds
+
+    def get(self, product: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Return cached copy for a product, or None on a miss
+
+        Returns:
+            Dictionary with campaign_name and campaign_copy
+        """
+        key = self.key(product)
+        with self._lock:
+            self._load()
+            entry = self._entries.get(key)
+            if entry is None or self._expired(entry, time.time()):
+                if entry is not None:
+                    del self._entries[key]
+                    self.stats["evictions"] += 1
+                self.stats["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self.stats["hits"] += 1
+            return {"campaign_name": entry["campaign_name"], "campaign_copy": entry["campaign_copy"]}
+
+    def put(self, product: Dict[str, Any], campaign_name: str, campaign_copy: str):
+        """Store copy for a product and persist the cache"""
+        key = self.key(product)
+        with self._lock:
+            self._load()
+            # Any entry for an older fingerprint/prompt of this product is now dead weight
+            stale = [k for k in self._entries if k.split(":", 1)[0] == str(product["id"]) and k != key]
+            for k in stale:
+                del self._entries[k]
+            self._entries[key] = {
+                "campaign_name": campaign_name,
+                "campaign_copy": campaign_copy,
+                "created_at": time.time()
+            }
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats["evictions"] += 1
+            self.stats["stores"] += 1
+            self._save()
+
+    def _save(self):
+        now = time.time()
+        live = [(k, v) for k, v in self._entries.items() if not self._expired(v, now)]
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(live, f, separators=(",", ":"))
+        os.replace(tmp_path, self.path)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._loaded = True
+            self._save()
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._load()
+            return len(self._entries)
+
+# Shared instance used by the tools (resolved next to this module so the working directory doesn't matter)
+ad_copy_cache = AdCopyCache(
+    DEFAULT_CACHE_PATH if os.path.isabs(DEFAULT_CACHE_PATH)
+    else str(Path(__file__).resolve().parent / DEFAULT_CACHE_PATH)
+)
+
+@lru_cache(maxsize=None)
+def get_ad_copy_cache(tenant_id: Optional[str] = None) -> AdCopyCache:
+    """Return the shared cache, or a separate one under tenants/<tenant_id>/ for another store"""
+    if tenant_id is None:
+        return ad_copy_cache
+    return AdCopyCache(str(ad_copy_cache.path.parent / "tenants" / tenant_id / ad_copy_cache.path.name))
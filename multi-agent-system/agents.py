@@ -4,112 +4,167 @@ Multi-Agent Campaign System Agents
 Three specialized agents for campaign creation, analysis, and management
 """
 
-from crewai import Agent
-from tools import (
-    fetch_all_products, fetch_product_details, fetch_product_analytics,
-    create_campaign, fetch_campaign_details, fetch_all_campaigns,
-    pause_campaign, resume_campaign, check_api_health
-)
+from functools import lru_cache
+from typing import Optional
+
+# Agents are built on first use (importing crewai and the tools only then), so
+# lightweight commands that import this module don't pay for the whole stack
 
 # =============================================================================
 # AGENT 1: CAMPAIGN CREATOR AGENT
 # =============================================================================
 
-campaign_creator_agent = Agent(
-    role="Campaign Creator Specialist",
-    goal="Analyze store products and create targeted advertising campaigns that drive sales and engagement",
-    backstory="""You are an expert digital marketing strategist with 10+ years of experience in 
-    e-commerce advertising. You have a deep understanding of product positioning, target audience 
-    analysis, and campaign optimization. Your specialty is creating high-converting ad campaigns 
-    that maximize ROI for online stores.
+@lru_cache(maxsize=None)
+def get_campaign_creator_agent(tenant_id: Optional[str] = None):
+    """Build the Campaign Creator agent on first use and return the shared instance (one per tenant)"""
+    from crewai import Agent
+    from memory_store import get_agent_memory
+    from tools import (
+        fetch_all_products, fetch_more_results, fetch_product_details, fetch_product_analytics,
+        find_similar_campaigns, create_campaign, check_api_health
+    )
     
-    You excel at:
-    - Analyzing product data to identify market opportunities
-    - Creating compelling campaign strategies
-    - Setting optimal budgets and targeting parameters
-    - Writing persuasive ad copy that converts browsers into buyers
+    return Agent(
+        role="Campaign Creator Specialist",
+        goal="Analyze store products and create targeted advertising campaigns that drive sales and engagement",
+        backstory="""You are an expert digital marketing strategist with 10+ years of experience in 
+        e-commerce advertising. You have a deep understanding of product positioning, target audience 
+        analysis, and campaign optimization. Your specialty is creating high-converting ad campaigns 
+        that maximize ROI for online stores.
     
-    Your mission is to systematically review store inventory, identify products with potential, 
-    and launch strategic advertising campaigns that will boost visibility and sales.""",
-    verbose=True,
-    allow_delegation=False,
-    tools=[
-        fetch_all_products,
-        fetch_product_details,
-        fetch_product_analytics,
-        create_campaign,
-        check_api_health
-    ],
-    max_iter=5,
-    memory=True
-)
+        You excel at:
+        - Analyzing product data to identify market opportunities
+        - Creating compelling campaign strategies
+        - Setting optimal budgets and targeting parameters
+        - Writing persuasive ad copy that converts browsers into buyers
+    
+        Your mission is to systematically review store inventory, identify products with potential, 
+        and launch strategic advertising campaigns that will boost visibility and sales.""",
+        verbose=True,
+        allow_delegation=False,
+        tools=[
+            fetch_all_products,
+            fetch_more_results,
+            fetch_product_details,
+            fetch_product_analytics,
+            find_similar_campaigns,
+            create_campaign,
+            check_api_health
+        ],
+        max_iter=5,
+        memory=get_agent_memory(tenant_id)
+    )
 
 # =============================================================================
 # AGENT 2: DATA ANALYZER AGENT
 # =============================================================================
 
-data_analyzer_agent = Agent(
-    role="Performance Data Analyst",
-    goal="Monitor campaign performance and store metrics to generate actionable insights for dashboard reporting",
-    backstory="""You are a data science expert specializing in marketing analytics and performance 
-    measurement. With a background in statistics and business intelligence, you transform raw data 
-    into meaningful insights that drive business decisions.
+@lru_cache(maxsize=None)
+def get_data_analyzer_agent(tenant_id: Optional[str] = None):
+    """Build the Data Analyzer agent on first use and return the shared instance (one per tenant)"""
+    from crewai import Agent
+    from memory_store import get_agent_memory
+    from tools import (
+        fetch_all_campaigns, fetch_more_results, fetch_campaign_changes, fetch_campaign_details,
+        fetch_product_details, fetch_product_analytics, fetch_metrics_history, check_api_health
+    )
     
-    Your expertise includes:
-    - Campaign performance analysis and attribution modeling
-    - E-commerce metrics interpretation and trend analysis
-    - Data correlation and pattern recognition
-    - Creating comprehensive performance reports
-    - Identifying optimization opportunities through data
+    return Agent(
+        role="Performance Data Analyst",
+        goal="Monitor campaign performance and store metrics to generate actionable insights for dashboard reporting",
+        backstory="""You are a data science expert specializing in marketing analytics and performance 
+        measurement. With a background in statistics and business intelligence, you transform raw data 
+        into meaningful insights that drive business decisions.
     
-    Your role is to continuously monitor both advertising campaign performance and store analytics, 
-    then synthesize this information into clear, actionable insights that inform strategic decisions. 
-    You ensure all stakeholders have real-time visibility into what's working and what needs adjustment.""",
-    verbose=True,
-    allow_delegation=False,
-    tools=[
-        fetch_all_campaigns,
-        fetch_campaign_details,
-        fetch_product_details,
-        fetch_product_analytics,
-        check_api_health
-    ],
-    max_iter=5,
-    memory=True
-)
+        Your expertise includes:
+        - Campaign performance analysis and attribution modeling
+        - E-commerce metrics interpretation and trend analysis
+        - Data correlation and pattern recognition
+        - Creating comprehensive performance reports
+        - Identifying optimization opportunities through data
+    
+        Your role is to continuously monitor both advertising campaign performance and store analytics, 
+        then synthesize this information into clear, actionable insights that inform strategic decisions. 
+        You ensure all stakeholders have real-time visibility into what's working and what needs adjustment.""",
+        verbose=True,
+        allow_delegation=False,
+        tools=[
+            fetch_all_campaigns,
+            fetch_more_results,
+            fetch_campaign_changes,
+            fetch_campaign_details,
+            fetch_product_details,
+            fetch_product_analytics,
+            fetch_metrics_history,
+            check_api_health
+        ],
+        max_iter=5,
+        memory=get_agent_memory(tenant_id)
+    )
 
 # =============================================================================
 # AGENT 3: CAMPAIGN MANAGER AGENT
 # =============================================================================
 
-campaign_manager_agent = Agent(
-    role="Strategic Campaign Manager",
-    goal="Make data-driven decisions to optimize campaign performance by continuing successful campaigns and pausing underperforming ones",
-    backstory="""You are a seasoned advertising operations manager with expertise in campaign 
-    optimization and budget management. You've managed millions in ad spend across various platforms 
-    and have developed a keen sense for when to scale, pause, or pivot campaigns.
+@lru_cache(maxsize=None)
+def get_campaign_manager_agent(tenant_id: Optional[str] = None):
+    """Build the Campaign Manager agent on first use and return the shared instance (one per tenant)"""
+    from crewai import Agent
+    from memory_store import get_agent_memory
+    from tools import (
+        fetch_all_campaigns, fetch_more_results, fetch_campaign_changes, fetch_campaign_details,
+        fetch_product_analytics, fetch_metrics_history, pause_campaign, resume_campaign,
+        check_api_health
+    )
     
-    Your core competencies:
-    - Performance threshold analysis and decision-making
-    - Budget optimization and ROI maximization
-    - Campaign lifecycle management
-    - Risk assessment and mitigation
-    - Strategic resource allocation
+    return Agent(
+        role="Strategic Campaign Manager",
+        goal="Make data-driven decisions to optimize campaign performance by continuing successful campaigns and pausing underperforming ones",
+        backstory="""You are a seasoned advertising operations manager with expertise in campaign 
+        optimization and budget management. You've managed millions in ad spend across various platforms 
+        and have developed a keen sense for when to scale, pause, or pivot campaigns.
     
-    Your responsibility is to make critical go/no-go decisions based on performance data. You analyze 
-    metrics like sales increases, view improvements, and conversion rates to determine whether each 
-    campaign should continue running or be paused. Your decisions directly impact campaign ROI and 
-    overall marketing efficiency.""",
-    verbose=True,
-    allow_delegation=False,
-    tools=[
-        fetch_all_campaigns,
-        fetch_campaign_details,
-        fetch_product_analytics,
-        pause_campaign,
-        resume_campaign,
-        check_api_health
-    ],
-    max_iter=5,
-    memory=True
-) 
\ No newline at end of file
+        Your core competencies:
+        - Performance threshold analysis and decision-making
+        - Budget optimization and ROI maximization
+        - Campaign lifecycle management
+        - Risk assessment and mitigation
+        - Strategic resource allocation
+    
+        Your responsibility is to make critical go/no-go decisions based on performance data. You analyze 
+        metrics like sales increases, view improvements, and conversion rates to determine whether each 
+        campaign should continue running or be paused. Your decisions directly impact campaign ROI and 
+        overall marketing efficiency.""",
+        verbose=True,
+        allow_delegation=False,
+        tools=[
+            fetch_all_campaigns,
+            fetch_more_results,
+            fetch_campaign_changes,
+            fetch_campaign_details,
+            fetch_product_analytics,
+            fetch_metrics_history,
+            pause_campaign,
+            resume_campaign,
+            check_api_health
+        ],
+        max_iter=5,
+        memory=get_agent_memory(tenant_id)
+    )
+
+# =============================================================================
+# LAZY MODULE ATTRIBUTES
+# =============================================================================
+
+_AGENT_FACTORIES = {
+    "campaign_creator_agent": get_campaign_creator_agent,
+    "data_analyzer_agent": get_data_analyzer_agent,
+    "campaign_manager_agent": get_campaign_manager_agent
+}
+
+def __getattr__(name):
+    """Keep `from agents import campaign_creator_agent` working, building the agent on access"""
+    factory = _AGENT_FACTORIES.get(name)
+    if factory is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return factory(None)
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Campaign Pilot Crew Setup Benchmark
+Compares per-run setup time of rebuilding agents/crews against leasing them from the CrewPool
+(no LLM calls are made - only construction and per-run reset are timed)
+"""
+
+import argparse
+import os
+import statistics
+import time
+
+# Agents validate that an LLM is configured; nothing is sent during the benchmark
+os.environ.setdefault("OPENAI_API_KEY", "sk-benchmark-placeholder")
+
+def clear_factory_caches():
+    """Forget the cached agent and task singletons so the next build starts cold"""
+    import agents
+    import tasks
+
+    for factory in (*agents._AGENT_FACTORIES.values(), *tasks._TASK_FACTORIES.values()):
+        factory.cache_clear()
+
+def rebuild_from_scratch(kind: str):
+    """Build a crew the way every run did before pooling: fresh agents, tasks and crew"""
+    from crew import CrewPool
+
+    clear_factory_caches()
+    return CrewPool.BUILDERS[kind]()
+
+def time_runs(fn, runs: int):
+    """Time repeated calls, returning per-call milliseconds"""
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-run crew setup benchmark")
+    parser.add_argument("--runs", type=int, default=10, help="Runs per measurement")
+    parser.add_argument("--kind", choices=["full", "analysis", "creation"], default="full")
+    args = parser.parse_args()
+
+    # Import the stack once up front so neither side pays for module loading
+    import crewai  # noqa: F401
+    from crew import CrewPool
+
+    rebuilt = time_runs(lambda: rebuild_from_scratch(args.kind), args.runs)
+
+    clear_factory_caches()
+    pool = CrewPool()
+
+    def lease_once():
+        with pool.lease(args.kind):
+            pass
+
+    first_lease = time_runs(lease_once, 1)[0]  # cold: builds agents, tasks and crew
+    pooled = time_runs(lease_once, args.runs)
+
+    print(f"Crew setup per run ({args.kind}, {args.runs} runs)")
+    print(f"  rebuild every run : median {statistics.median(rebuilt):8.2f}ms  max {max(rebuilt):8.2f}ms")
+    print(f"  pool, first lease : {first_lease:8.2f}ms")
+    print(f"  pool, warm lease  : median {statistics.median(pooled):8.2f}ms  max {max(pooled):8.2f}ms")
+    print(f"  speedup           : {statistics.median(rebuilt) / max(statistics.median(pooled), 1e-6):,.0f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Campaign Pilot Import-Time Benchmark
+Measures module import cost with `python -X importtime` to keep lightweight CLI commands fast
+"""
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+HERE = Path(__file__).resolve().parent
+
+# Entry points that must stay light, with their import-time budget in milliseconds
+SCENARIOS = {
+    "main (--status / --reset)": ("import main", 800),
+    "crew (no crew built)": ("import crew", 500),
+    "agents + tasks (no agents built)": ("import agents, tasks", 500),
+    "daemon": ("import daemon", 800),
+}
+
+# Heavy packages that none of the scenarios above may load
+FORBIDDEN_MODULES = ("crewai", "langchain", "langchain_core", "litellm", "chromadb", "openai")
+
+IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+def measure(statement: str) -> Tuple[float, List[Tuple[str, float]], List[str]]:
+    """
+    Run a statement in a fresh interpreter with -X importtime
+
+    Returns:
+        Tuple of (total import time ms, top-level and direct imports with cumulative ms, all imported module names)
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        cwd=HERE,
+        capture_output=True,
+        text=True,
+        env={**os.environ, "PYTHONDONTWRITEBYTECODE": "1"}
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"`{statement}` failed:\n{result.stderr[-2000:]}")
+
+    total_ms = 0.0
+    direct: Dict[str, float] = {}
+    modules = []
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if not match:
+            continue
+        _, cumulative_us, indent, module = match.groups()
+        modules.append(module)
+        cumulative_ms = int(cumulative_us) / 1000
+        # Nesting is one space plus two per level after the separator
+        depth = (len(indent) - 1) // 2
+        if depth == 0:
+            total_ms += cumulative_ms
+        if depth <= 1:
+            direct[module] = cumulative_ms
+
+    ranked = sorted(direct.items(), key=lambda item: item[1], reverse=True)
+    return total_ms, ranked, modules
+
+def main():
+    parser = argparse.ArgumentParser(description="Import-time benchmark for the Campaign Pilot CLI")
+    parser.add_argument("--runs", type=int, default=3, help="Runs per scenario (best run is reported)")
+    parser.add_argument("--top", type=int, default=8, help="Number of slowest imports to show per scenario")
+    args = parser.parse_args()
+
+    failures = []
+    for name, (statement, budget_ms) in SCENARIOS.items():
+        runs = [measure(statement) for _ in range(args.runs)]
+        total_ms, ranked, modules = min(runs, key=lambda run: run[0])
+
+        heavy = sorted({m.split(".")[0] for m in modules if m.split(".")[0] in FORBIDDEN_MODULES})
+        status = "OK"
+        if total_ms > budget_ms:
+            status = "OVER BUDGET"
+            failures.append(f"{name}: {total_ms:.1f}ms > {budget_ms}ms")
+        if heavy:
+            status = "HEAVY IMPORT"
+            failures.append(f"{name}: imports {', '.join(heavy)}")
+
+        print(f"\n{name}  [{status}]")
+        print(f"  `{statement}` -> {total_ms:.1f}ms (budget {budget_ms}ms, best of {args.runs})")
+        for module, cumulative_ms in ranked[:args.top]:
+            print(f"    {cumulative_ms:8.1f}ms  {module}")
+
+    if failures:
+        print("\n❌ Import-time regressions:")
+        for failure in failures:
+            print(f"   - {failure}")
+        sys.exit(1)
+
+    print("\n✅ All entry points within their import-time budgets")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Campaign Pilot Blackboard
+Parsed tool results shared between agents, keyed by entity and version
+
+Tasks only pass free text to each other, so without this every agent re-fetches
+the same products and campaigns and re-parses the JSON. Tools write what they
+parse here (kind + key, e.g. "campaign" / "camp_0001"), and any agent's tool
+reads a fresh entry instead of calling the API. An entry's version goes up only
+when its content changes. Mutating tools invalidate what they make stale.
+
+    board = get_blackboard()                  # BLACKBOARD_BACKEND=memory|sqlite
+    board.put("product", 3, product, source="fetch_product_details")
+    entry = board.get("product", 3)           # None if missing or older than max_age
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+BLACKBOARD_BACKEND = os.getenv("BLACKBOARD_BACKEND", "memory")
+BLACKBOARD_PATH = os.getenv("BLACKBOARD_PATH", os.path.join("memory", "blackboard.sqlite"))
+# Entries older than this are treated as missing (0 turns blackboard reads off). The default
+# matches the API's 30 s metrics refresh, so reads past it go back to the API and revalidate by ETag
+BLACKBOARD_MAX_AGE_SECONDS = float(os.getenv("BLACKBOARD_MAX_AGE_SECONDS", "30"))
+
+@dataclass
+class Entry:
+    kind: str
+    key: str
+    version: int  # bumped each time the content changes
+    digest: str  # content hash of `data`
+    data: Any  # parsed result; shared between readers, so treat as read-only
+    source: str  # tool that wrote it
+    updated_at: float
+
+    @property
+    def age_seconds(self) -> float:
+        return time.time() - self.updated_at
+
+def _digest(data: Any) -> str:
+    return hashlib.sha256(json.dumps(data, sort_keys=True, default=str).encode("utf-8")).hexdigest()[:16]
+
+class Blackboard(ABC):
+    """Versioned entity store shared by all agents of a tenant; backends supply row storage"""
+
+    def __init__(self, max_age_seconds: float = BLACKBOARD_MAX_AGE_SECONDS):
+        self.max_age_seconds = max_age_seconds
+        self.stats = {"hits": 0, "misses": 0, "writes": 0, "unchanged": 0, "invalidations": 0}
+        self._lock = threading.Lock()
+
+    # Backend primitives ------------------------------------------------
+
+    @abstractmethod
+    def _load(self, kind: str, key: str) -> Optional[Entry]:
+        """Return the stored entry, or None."""
+
+    @abstractmethod
+    def _store(self, entry: Entry) -> None:
+        """Insert or replace the entry for (kind, key)."""
+
+    @abstractmethod
+    def _delete(self, kind: str, key: Optional[str]) -> int:
+        """Remove one entry (or every entry of the kind if key is None); returns how many."""
+
+    # Public interface --------------------------------------------------
+
+    def put(self, kind: str, key: Any, data: Any, source: str = "") -> Entry:
+        """
+        Store a parsed result, bumping its version only if the content changed
+
+        Returns:
+            The stored entry
+        """
+        key = str(key)
+        digest = _digest(data)
+        with self._lock:
+            current = self._load(kind, key)
+            if current is not None and current.digest == digest:
+                version = current.version
+                self.stats["unchanged"] += 1
+            else:
+                version = current.version + 1 if current is not None else 1
+                self.stats["writes"] += 1
+            entry = Entry(kind, key, version, digest, data, source, time.time())
+            self._store(entry)
+            return entry
+
+    def get(self, kind: str, key: Any, max_age_seconds: Optional[float] = None) -> Optional[Entry]:
+        """Latest entry for (kind, key), or None if there is none or it is too old"""
+        max_age = self.max_age_seconds if max_age_seconds is None else max_age_seconds
+        with self._lock:
+            entry = self._load(kind, str(key))
+            if entry is None or entry.age_seconds > max_age:
+                self.stats["misses"] += 1
+                return None
+            self.stats["hits"] += 1
+            return entry
+
+    def invalidate(self, kind: str, key: Any = None) -> int:
+        """Drop one entry, or every entry of a kind; returns how many were dropped"""
+        with self._lock:
+            removed = self._delete(kind, None if key is None else str(key))
+            self.stats["invalidations"] += removed
+            return removed
+
+class MemoryBlackboard(Blackboard):
+    """In-process backend (entries are lost on exit)"""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._entries: Dict[tuple, Entry] = {}
+
+    def _load(self, kind, key):
+        return self._entries.get((kind, key))
+
+    def _store(self, entry):
+        self._entries[(entry.kind, entry.key)] = entry
+
+    def _delete(self, kind, key):
+        if key is not None:
+            return 1 if self._entries.pop((kind, key), None) is not None else 0
+        doomed = [k for k in self._entries if k[0] == kind]
+        for k in doomed:
+            del self._entries[k]
+        return len(doomed)
+
+class SQLiteBlackboard(Blackboard):
+    """Local SQLite backend, so separate processes (daemon, job workers) share entries"""
+
+    def __init__(self, path: str, **kwargs):
+        super().__init__(**kwargs)
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            " kind TEXT NOT NULL, key TEXT NOT NULL, version INTEGER NOT NULL, digest TEXT NOT NULL,"
+            " data TEXT NOT NULL, source TEXT NOT NULL, updated_at REAL NOT NULL, PRIMARY KEY (kind, key))"
+        )
+        self._conn.commit()
+
+    def _load(self, kind, key):
+        row = self._conn.execute(
+            "SELECT version, digest, data, source, updated_at FROM entries WHERE kind = ? AND key = ?", (kind, key)
+        ).fetchone()
+        if row is None:
+            return None
+        return Entry(kind, key, row[0], row[1], json.loads(row[2]), row[3], row[4])
+
+    def _store(self, entry):
+        with self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries (kind, key, version, digest, data, source, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (entry.kind, entry.key, entry.version, entry.digest, json.dumps(entry.data, default=str),
+                 entry.source, entry.updated_at),
+            )
+
+    def _delete(self, kind, key):
+        with self._conn:
+            if key is None:
+                return self._conn.execute("DELETE FROM entries WHERE kind = ?", (kind,)).rowcount
+            return self._conn.execute("DELETE FROM entries WHERE kind = ? AND key = ?", (kind, key)).rowcount
+
+def _blackboard_path(tenant) -> Path:
+    path = Path(BLACKBOARD_PATH)
+    if not path.is_absolute():
+        path = Path(__file__).resolve().parent / path
+    return path if tenant.is_default else path.parent / "tenants" / tenant.tenant_id / path.name
+
+def build_blackboard(backend: Optional[str] = None, path: Optional[str] = None, **kwargs) -> Blackboard:
+    """
+    Build a blackboard
+
+    Args:
+        backend: memory | sqlite (defaults to BLACKBOARD_BACKEND)
+        path: SQLite file path (required for the sqlite backend)
+    """
+    backend = backend or BLACKBOARD_BACKEND
+    if backend == "memory":
+        return MemoryBlackboard(**kwargs)
+    if backend == "sqlite":
+        return SQLiteBlackboard(path or BLACKBOARD_PATH, **kwargs)
+    raise ValueError(f"Unknown blackboard backend: {backend}")
+
+_create_lock = threading.Lock()
+
+def get_blackboard(tenant=None) -> Blackboard:
+    """Blackboard of a tenant (default: the current one), created on first use"""
+    from tenancy import current_tenant
+
+    tenant = tenant or current_tenant()
+    with _create_lock:
+        if "blackboard" not in tenant.state:
+            tenant.state["blackboard"] = build_blackboard(path=str(_blackboard_path(tenant)))
+        return tenant.state["blackboard"]
@@ -5,42 +5,61 @@ Orchestrates the three specialized agents to work together
 """
 
 import os
+import threading
+import time
+from contextlib import contextmanager
 from datetime import datetime
-from crewai import Crew, Process
-from agents import campaign_creator_agent, data_analyzer_agent, campaign_manager_agent
-from tasks import campaign_creation_task, data_analysis_task, campaign_management_task
 from logger import log_agent_action, log_system_event, LogLevel
+from run_checkpoint import kickoff_with_checkpoints
+from tracing import install_tracing
+from usage_tracker import install_usage_tracking
+
+# crewai, agents and tasks are imported inside the builders below so that
+# importing this module does not pull in the LLM stack until a crew is needed
 
 class CampaignPilotCrew:
     """
     Main crew class that coordinates the multi-agent campaign system
     """
     
-    def __init__(self):
+    def __init__(self, tenant_id=None):
+        from crewai import Crew, Process
+        from memory_store import get_agent_memory
+        from agents import get_campaign_creator_agent, get_data_analyzer_agent, get_campaign_manager_agent
+        from tasks import get_campaign_creation_task, get_data_analysis_task, get_campaign_management_task
+        
+        install_usage_tracking()
+        install_tracing()
         self.crew = Crew(
             agents=[
-                campaign_creator_agent,
-                data_analyzer_agent, 
-                campaign_manager_agent
+                get_campaign_creator_agent(tenant_id),
+                get_data_analyzer_agent(tenant_id), 
+                get_campaign_manager_agent(tenant_id)
             ],
             tasks=[
-                campaign_creation_task,
-                data_analysis_task,
-                campaign_management_task
+                get_campaign_creation_task(tenant_id),
+                get_data_analysis_task(tenant_id),
+                get_campaign_management_task(tenant_id)
             ],
             process=Process.sequential,
             verbose=True,
-            memory=True,
+            memory=get_agent_memory(tenant_id),
             max_rpm=10,  # Rate limiting
             share_crew=False
         )
     
-    def run_campaign_flow(self, inputs=None):
+    def run_campaign_flow(self, inputs=None, run_id=None, resume=True, retry=False):
         """
         Execute the complete multi-agent campaign flow
         
+        Each task's output is checkpointed as it completes, so retrying a failed
+        run resumes at the failed task instead of creating campaigns again.
+        
         Args:
             inputs: Optional input parameters for the crew
+            run_id: Checkpoint id of a failed run to resume (default: a fresh run)
+            resume: Set False to start over even if the run_id's checkpoint is unfinished
+            retry: Resume the latest unfinished run of the same inputs, if any
             
         Returns:
             Crew execution results
@@ -70,8 +89,8 @@ class CampaignPilotCrew:
                     }
                 )
             
-            # Execute the crew workflow
-            result = self.crew.kickoff(inputs=inputs or {})
+            # Execute the crew workflow (resuming a failed run only when asked to)
+            result = kickoff_with_checkpoints(self.crew, inputs or {}, run_id=run_id, resume=resume, retry=retry)
             
             # Log completion
             log_system_event("Multi-Agent Crew Workflow Completed", {
@@ -118,6 +137,138 @@ class CampaignPilotCrew:
             "verbose_level": self.crew.verbose
         }
 
+# =============================================================================
+# CREW BUILDERS
+# =============================================================================
+
+def build_analysis_crew(tenant_id=None):
+    """
+    Build a crew with only the data analysis and campaign management tasks
+    """
+    from crewai import Crew, Process
+    from agents import get_data_analyzer_agent, get_campaign_manager_agent
+    from tasks import get_data_analysis_task, get_campaign_management_task
+    
+    install_usage_tracking()
+    install_tracing()
+    return Crew(
+        agents=[get_data_analyzer_agent(tenant_id), get_campaign_manager_agent(tenant_id)],
+        tasks=[get_data_analysis_task(tenant_id), get_campaign_management_task(tenant_id)],
+        process=Process.sequential,
+        verbose=True
+    )
+
+def build_creation_crew(tenant_id=None):
+    """
+    Build a crew with only the campaign creation task
+    """
+    from crewai import Crew, Process
+    from agents import get_campaign_creator_agent
+    from tasks import get_campaign_creation_task
+    
+    install_usage_tracking()
+    install_tracing()
+    return Crew(
+        agents=[get_campaign_creator_agent(tenant_id)],
+        tasks=[get_campaign_creation_task(tenant_id)],
+        process=Process.sequential,
+        verbose=True
+    )
+
+# =============================================================================
+# CREW POOL
+# =============================================================================
+
+# Per-run task fields that must not leak from one kickoff into the next
+_TASK_RUN_STATE = {
+    "output": None,
+    "used_tools": 0,
+    "tools_errors": 0,
+    "delegations": 0,
+    "retry_count": 0,
+    "start_time": None,
+    "end_time": None
+}
+
+class CrewPool:
+    """
+    Builds each workflow's crew once and reuses it across runs.
+    
+    Agents (with their LLM clients), crews and their memory backends are created
+    on first lease and kept warm; only per-run task state is reset between
+    runs. Crew memory is intentionally shared so later runs can draw on earlier
+    ones. The full, analysis and creation crews share the tenant's agents and
+    tasks, so the pool leases one crew at a time whatever its kind. Each tenant
+    has its own pool (and so its own agents and memory), so different stores'
+    crews can run concurrently.
+    """
+    
+    BUILDERS = {
+        "full": CampaignPilotCrew,
+        "analysis": build_analysis_crew,
+        "creation": build_creation_crew
+    }
+    
+    def __init__(self, tenant_id=None):
+        self.tenant_id = tenant_id
+        self._crews = {}
+        # One lock for all kinds: their crews run on the same Agent and Task objects
+        self._lock = threading.Lock()
+        self.stats = {kind: {"builds": 0, "runs": 0, "setup_ms": 0.0} for kind in self.BUILDERS}
+    
+    @staticmethod
+    def reset_run_state(crew):
+        """Clear per-run state from a pooled crew's tasks"""
+        for task in getattr(crew, "crew", crew).tasks:
+            for attr, value in _TASK_RUN_STATE.items():
+                if hasattr(task, attr):
+                    setattr(task, attr, value)
+            if hasattr(task, "processed_by_agents"):
+                task.processed_by_agents = set()
+    
+    @contextmanager
+    def lease(self, kind: str):
+        """
+        Lease the pooled crew for a workflow, building it on first use
+        
+        Args:
+            kind: One of "full", "analysis" or "creation"
+            
+        Yields:
+            CampaignPilotCrew for "full", a crewai Crew otherwise
+        """
+        if kind not in self.BUILDERS:
+            raise ValueError(f"Unknown crew kind: {kind}")
+        
+        with self._lock:
+            start = time.perf_counter()
+            crew = self._crews.get(kind)
+            if crew is None:
+                crew = self.BUILDERS[kind](self.tenant_id)
+                self._crews[kind] = crew
+                self.stats[kind]["builds"] += 1
+            else:
+                self.reset_run_state(crew)
+            
+            self.stats[kind]["runs"] += 1
+            self.stats[kind]["setup_ms"] += (time.perf_counter() - start) * 1000
+            yield crew
+    
+    def clear(self):
+        """Drop every pooled crew so the next lease rebuilds it"""
+        with self._lock:
+            self._crews.clear()
+
+_crew_pools = {}
+_crew_pools_lock = threading.Lock()
+
+def get_crew_pool(tenant_id=None) -> CrewPool:
+    """Get or create the process-wide crew pool for a tenant (None is the default store)"""
+    with _crew_pools_lock:
+        if tenant_id not in _crew_pools:
+            _crew_pools[tenant_id] = CrewPool(tenant_id)
+        return _crew_pools[tenant_id]
+
 # =============================================================================
 # STANDALONE EXECUTION FUNCTIONS
 # =============================================================================
@@ -126,8 +277,6 @@ def run_full_campaign_cycle():
     """
     Run the complete campaign cycle with all three agents
     """
-    crew = CampaignPilotCrew()
-    
     print("Campaign Pilot Multi-Agent System")
     print("=" * 50)
     print("🤖 Agent 1: Campaign Creator - Analyzes products and creates campaigns")
@@ -135,8 +284,9 @@ def run_full_campaign_cycle():
     print("⚖️  Agent 3: Campaign Manager - Makes optimization decisions")
     print("=" * 50)
     
-    # Run the complete workflow
-    results = crew.run_campaign_flow()
+    # Run the complete workflow on the pooled crew
+    with get_crew_pool().lease("full") as crew:
+        results = crew.run_campaign_flow()
     
     return results
 
@@ -145,18 +295,9 @@ def run_analysis_only():
     Run only the data analysis and campaign management tasks
     (assumes campaigns already exist)
     """
-    crew = CampaignPilotCrew()
-    
-    # Create a modified crew with only analysis and management tasks
-    analysis_crew = Crew(
-        agents=[data_analyzer_agent, campaign_manager_agent],
-        tasks=[data_analysis_task, campaign_management_task],
-        process=Process.sequential,
-        verbose=True
-    )
-    
     print("🔍 Running Analysis and Management Only...")
-    results = analysis_crew.kickoff()
+    with get_crew_pool().lease("analysis") as analysis_crew:
+        results = kickoff_with_checkpoints(analysis_crew)
     
     return results
 
@@ -164,21 +305,12 @@ def run_campaign_creation_only():
     """
     Run only the campaign creation task
     """
-    crew = CampaignPilotCrew()
-    
-    # Create a modified crew with only campaign creation
-    creation_crew = Crew(
-        agents=[campaign_creator_agent],
-        tasks=[campaign_creation_task],
-        process=Process.sequential,
-        verbose=True
-    )
-    
     print("🎯 Running Campaign Creation Only...")
-    results = creation_crew.kickoff()
+    with get_crew_pool().lease("creation") as creation_crew:
+        results = kickoff_with_checkpoints(creation_crew)
     
     return results
 
 if __name__ == "__main__":
     # Run the full cycle when script is executed directly
-    run_full_campaign_cycle() 
\ No newline at end of file
+    run_full_campaign_cycle()
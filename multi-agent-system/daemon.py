@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+Campaign Pilot Monitoring Daemon
+Keeps the system resident, runs cheap rule-based checks on a schedule and
+only invokes the LLM crew when a campaign crosses a performance threshold
+"""
+
+import os
+import random
+import signal
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, Any, List, Optional
+
+import requests
+
+from data_models import CampaignTable
+from logger import log_system_event, log_decision, log_performance_metrics, LogLevel
+
+@dataclass
+class DaemonConfig:
+    """Schedule and threshold settings for the monitoring daemon"""
+    interval_seconds: float = 60.0
+    jitter: float = 0.1                  # +/- fraction of the interval
+    llm_cooldown_seconds: float = 900.0  # minimum gap between crew invocations
+    use_stream: bool = True
+    min_roas: float = 2.0
+    min_ctr: float = 1.5
+    max_budget_utilization: float = 0.85
+    max_cycles: Optional[int] = None     # stop after N cycles (None = run until signalled)
+
+    @classmethod
+    def from_env(cls, **overrides) -> "DaemonConfig":
+        """Build a config from DAEMON_* environment variables, then apply explicit overrides"""
+        config = cls(
+            interval_seconds=float(os.getenv("DAEMON_INTERVAL_SECONDS", cls.interval_seconds)),
+            jitter=float(os.getenv("DAEMON_JITTER", cls.jitter)),
+            llm_cooldown_seconds=float(os.getenv("DAEMON_LLM_COOLDOWN_SECONDS", cls.llm_cooldown_seconds)),
+            min_roas=float(os.getenv("DAEMON_MIN_ROAS", cls.min_roas)),
+            min_ctr=float(os.getenv("DAEMON_MIN_CTR", cls.min_ctr)),
+            max_budget_utilization=float(os.getenv("DAEMON_MAX_BUDGET_UTILIZATION", cls.max_budget_utilization))
+        )
+        for key, value in overrides.items():
+            if value is not None:
+                setattr(config, key, value)
+        return config
+
+@dataclass
+class CycleResult:
+    """Outcome of one monitoring cycle"""
+    cycle: int
+    duration_ms: float
+    campaigns_checked: int
+    breaches: Dict[str, List[str]] = field(default_factory=dict)
+    new_breaches: List[str] = field(default_factory=list)
+    crew_invoked: bool = False
+
+class CampaignMonitorDaemon:
+    """
+    Resident campaign monitor.
+
+    The HTTP session, campaign view and SSE subscriber from tools.py stay warm
+    between cycles, and the analysis crew comes from the shared crew pool. A cycle
+    that finds nothing new costs a local rule pass over the cached campaigns.
+    """
+
+    def __init__(self, config: Optional[DaemonConfig] = None):
+        self.config = config or DaemonConfig.from_env()
+        self.cycles = 0
+        self.crew_runs = 0
+        self._stop = threading.Event()
+        self._breached: Dict[str, List[str]] = {}
+        self._last_crew_run = 0.0
+
+    # -------------------------------------------------------------------------
+    # Lifecycle
+    # -------------------------------------------------------------------------
+
+    def install_signal_handlers(self):
+        """Stop gracefully on SIGINT / SIGTERM (finishes the current cycle first)"""
+        def _handle(signum, frame):
+            log_system_event("Monitoring Daemon Shutdown Requested", {"signal": signal.Signals(signum).name})
+            self.stop()
+
+        signal.signal(signal.SIGINT, _handle)
+        signal.signal(signal.SIGTERM, _handle)
+
+    def stop(self):
+        """Ask the run loop to exit after the current cycle"""
+        self._stop.set()
+
+    def run(self):
+        """Run monitoring cycles until stopped"""
+        from tools import campaign_stream
+
+        log_system_event("Monitoring Daemon Started", {
+            "interval_seconds": self.config.interval_seconds,
+            "jitter": self.config.jitter,
+            "llm_cooldown_seconds": self.config.llm_cooldown_seconds,
+            "use_stream": self.config.use_stream
+        })
+
+        if self.config.use_stream:
+            campaign_stream.start()
+            campaign_stream.wait_connected(timeout=5)
+
+        try:
+            while not self._stop.is_set():
+                try:
+                    self.run_cycle()
+                except requests.RequestException as e:
+                    log_system_event("Monitoring Cycle Failed", {"cycle": self.cycles, "error": str(e)}, LogLevel.WARNING)
+
+                if self.config.max_cycles is not None and self.cycles >= self.config.max_cycles:
+                    break
+                self._stop.wait(self._next_delay())
+        finally:
+            if self.config.use_stream:
+                campaign_stream.stop()
+            log_system_event("Monitoring Daemon Stopped", {
+                "cycles": self.cycles,
+                "crew_runs": self.crew_runs
+            })
+
+    def _next_delay(self) -> float:
+        """Interval with random jitter so many daemons don't poll in lockstep"""
+        spread = self.config.interval_seconds * self.config.jitter
+        return max(0.0, self.config.interval_seconds + random.uniform(-spread, spread))
+
+    # -------------------------------------------------------------------------
+    # Monitoring
+    # -------------------------------------------------------------------------
+
+    def check_campaign(self, campaign: Dict[str, Any]) -> List[str]:
+        """
+        Apply the rule-based thresholds to one campaign (see check_campaigns)
+
+        Returns:
+            List of breached rule names (empty if the campaign is healthy)
+        """
+        table = CampaignTable.from_campaigns([campaign])
+        return self.check_campaigns(table).get(table.column("campaign_id")[0], [])
+
+    def check_campaigns(self, table: CampaignTable) -> Dict[str, List[str]]:
+        """
+        Apply the rule-based thresholds to every campaign of a table at once
+
+        Only active campaigns are checked. low_roas and low_ctr need impressions;
+        budget_exhausted compares spend with the campaign budget.
+
+        Returns:
+            Breached rule names per campaign id (healthy campaigns are left out)
+        """
+        import numpy as np
+
+        columns = table.to_numpy(["campaign_id", "status", "impressions", "roas", "ctr", "budget", "spend"])
+        active = columns["status"] == "active"
+        served = active & (columns["impressions"] > 0)
+        budget = columns["budget"]
+        utilization = np.divide(columns["spend"], budget, out=np.zeros_like(budget), where=budget != 0)
+        rules = {
+            "low_roas": served & (columns["roas"] < self.config.min_roas),
+            "low_ctr": served & (columns["ctr"] < self.config.min_ctr),
+            "budget_exhausted": active & (budget != 0) & (utilization > self.config.max_budget_utilization)
+        }
+
+        breaches: Dict[str, List[str]] = {}
+        for rule, breached in rules.items():
+            for campaign_id in columns["campaign_id"][breached]:
+                breaches.setdefault(str(campaign_id), []).append(rule)
+        return breaches
+
+    def run_cycle(self) -> CycleResult:
+        """Refresh the campaign view, evaluate thresholds and trigger the crew on new breaches"""
+        from tools import campaign_view, campaign_stream
+
+        start = time.perf_counter()
+        self.cycles += 1
+
+        # With the SSE stream connected the view is already current; otherwise pull the deltas
+        if not campaign_stream.connected:
+            campaign_view.sync()
+
+        campaigns = campaign_view.table()
+        breaches = self.check_campaigns(campaigns)
+
+        # Only campaigns that newly crossed a threshold (or breached a new rule) warrant the LLM.
+        # _breached holds the breaches the crew has already run on; recovered rules drop out
+        new_breaches = [
+            campaign_id for campaign_id, rules in breaches.items()
+            if set(rules) - set(self._breached.get(campaign_id, []))
+        ]
+        handled = {
+            campaign_id: [rule for rule in self._breached.get(campaign_id, []) if rule in rules]
+            for campaign_id, rules in breaches.items()
+        }
+        self._breached = {campaign_id: rules for campaign_id, rules in handled.items() if rules}
+
+        result = CycleResult(
+            cycle=self.cycles,
+            duration_ms=0.0,
+            campaigns_checked=len(campaigns),
+            breaches=breaches,
+            new_breaches=new_breaches
+        )
+
+        if new_breaches and time.time() - self._last_crew_run >= self.config.llm_cooldown_seconds:
+            result.crew_invoked = True
+            if self._invoke_crew(new_breaches, breaches):
+                self._breached = breaches
+        # Otherwise the new breaches stay pending and are reported again after the cooldown
+
+        result.duration_ms = (time.perf_counter() - start) * 1000
+        log_performance_metrics({
+            "daemon_cycle": result.cycle,
+            "daemon_cycle_ms": round(result.duration_ms, 2),
+            "daemon_campaigns_checked": result.campaigns_checked,
+            "daemon_breaches": len(breaches),
+            "daemon_crew_invoked": result.crew_invoked
+        })
+        return result
+
+    def _invoke_crew(self, new_breaches: List[str], breaches: Dict[str, List[str]]) -> bool:
+        """Run the pooled analysis/management crew; returns whether it completed"""
+        from crew import get_crew_pool
+        from run_checkpoint import kickoff_with_checkpoints
+
+        log_decision(
+            agent="MonitoringDaemon",
+            decision_type="crew_trigger",
+            criteria={campaign_id: breaches[campaign_id] for campaign_id in new_breaches},
+            decision="invoke_analysis_crew",
+            rationale=f"{len(new_breaches)} campaign(s) crossed a performance threshold"
+        )
+
+        self._last_crew_run = time.time()
+        self.crew_runs += 1
+        started = datetime.now()
+        try:
+            # Checkpointed like every other crew run, which also opens the run's trace span
+            with get_crew_pool().lease("analysis") as crew:
+                kickoff_with_checkpoints(crew)
+        except Exception as e:
+            log_system_event("Daemon Crew Run Failed", {"error": str(e)}, LogLevel.ERROR)
+            return False
+
+        log_system_event("Daemon Crew Run Completed", {
+            "campaigns": new_breaches,
+            "duration_seconds": (datetime.now() - started).total_seconds()
+        })
+        return True
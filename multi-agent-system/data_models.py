@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+Campaign Pilot Data Models
+Typed, slotted records for products, campaigns and analytics, plus a column store for campaign lists
+
+The APIs speak JSON dicts. These models decode them once into slotted dataclasses
+(no per-instance __dict__) and encode back to the same JSON shape. Fields the
+model doesn't know are kept in `extra`, so a decode/encode round trip is lossless.
+
+CampaignTable holds many campaigns column by column: numbers in typed arrays and
+text in plain lists. A portfolio of thousands of campaigns then takes a fraction
+of the memory of a list of dicts, and `to_numpy()` hands whole columns to NumPy
+without touching one row at a time.
+
+    campaign = Campaign.from_dict(api_response["data"])
+    table = CampaignTable.from_campaigns(api_response["data"])
+    columns = table.to_numpy()                # {"roas": ndarray, "status": ndarray, ...}
+"""
+
+import json
+import sys
+from array import array
+from dataclasses import dataclass, field, fields
+from typing import Any, ClassVar, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+class _Model:
+    """Dict/JSON conversion shared by the models (field names are cached per class)"""
+
+    __slots__ = ()
+    _FIELDS: ClassVar[Tuple[str, ...]] = ()
+    _NESTED: ClassVar[Dict[str, type]] = {}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]):
+        """Build a model from an API dict; unknown keys go to `extra`"""
+        values: Dict[str, Any] = {}
+        extra: Dict[str, Any] = {}
+        for key, value in data.items():
+            if key not in cls._FIELDS:
+                extra[key] = value
+                continue
+            nested = cls._NESTED.get(key)
+            values[key] = nested.from_dict(value) if nested is not None and isinstance(value, dict) else value
+        return cls(**values, extra=extra)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain dict in the API's shape (nested models included)"""
+        data = {}
+        for name in self._FIELDS:
+            value = getattr(self, name)
+            data[name] = value.to_dict() if isinstance(value, _Model) else value
+        data.update(self.extra)
+        return data
+
+    @classmethod
+    def decode(cls, text: Union[str, bytes]):
+        return cls.from_dict(json.loads(text))
+
+    def encode(self) -> str:
+        """Compact JSON"""
+        return json.dumps(self.to_dict(), separators=(",", ":"), default=str)
+
+def _model(cls):
+    """Turn a class into a slotted dataclass with cached field names"""
+    cls = dataclass(slots=True)(cls)
+    cls._FIELDS = tuple(f.name for f in fields(cls) if f.name != "extra")
+    return cls
+
+@_model
+class Product(_Model):
+    id: int = 0
+    name: str = ""
+    category: str = ""
+    price: float = 0.0
+    description: str = ""
+    image_url: str = ""
+    stock: int = 0
+    page_views: int = 0
+    sales: int = 0
+    revenue: float = 0.0
+    extra: Dict[str, Any] = field(default_factory=dict)
+
+@_model
+class CampaignMetrics(_Model):
+    impressions: int = 0
+    clicks: int = 0
+    conversions: int = 0
+    spend: float = 0.0
+    ctr: float = 0.0
+    cpc: float = 0.0
+    roas: float = 0.0
+    extra: Dict[str, Any] = field(default_factory=dict)
+
+@_model
+class Campaign(_Model):
+    campaign_id: str = ""
+    product_id: int = 0
+    campaign_name: str = ""
+    status: str = ""
+    budget: float = 0.0
+    duration_days: int = 0
+    campaign_copy: str = ""
+    created_at: str = ""
+    start_date: str = ""
+    end_date: str = ""
+    metrics: CampaignMetrics = field(default_factory=CampaignMetrics)
+    extra: Dict[str, Any] = field(default_factory=dict)
+
+    _NESTED: ClassVar[Dict[str, type]] = {"metrics": CampaignMetrics}
+
+@_model
+class MetricChange(_Model):
+    current: float = 0.0
+    previous: float = 0.0
+    change_percent: float = 0.0
+    extra: Dict[str, Any] = field(default_factory=dict)
+
+@_model
+class ProductAnalytics(_Model):
+    product_id: int = 0
+    time_range: str = ""
+    page_views: MetricChange = field(default_factory=MetricChange)
+    sales: MetricChange = field(default_factory=MetricChange)
+    revenue: MetricChange = field(default_factory=MetricChange)
+    conversion_rate: float = 0.0
+    bounce_rate: float = 0.0
+    avg_session_duration: int = 0
+    extra: Dict[str, Any] = field(default_factory=dict)
+
+    _NESTED: ClassVar[Dict[str, type]] = {"page_views": MetricChange, "sales": MetricChange,
+                                         "revenue": MetricChange}
+
+# =============================================================================
+# COLUMN STORE
+# =============================================================================
+
+# array typecode per numeric column ("q": int64, "d": float64); metrics are flattened to top level
+_CAMPAIGN_NUMERIC = {"product_id": "q", "budget": "d", "duration_days": "q"}
+_METRIC_NUMERIC = {"impressions": "q", "clicks": "q", "conversions": "q", "spend": "d", "ctr": "d",
+                   "cpc": "d", "roas": "d"}
+_CAMPAIGN_TEXT = ("campaign_id", "campaign_name", "status", "campaign_copy", "created_at", "start_date", "end_date")
+# Low-cardinality text whose strings are interned, so every row shares one object
+_INTERNED = {"status"}
+
+def _number(value: Any, typecode: str):
+    try:
+        return int(value) if typecode == "q" else float(value)
+    except (TypeError, ValueError):
+        return 0 if typecode == "q" else 0.0
+
+class CampaignTable:
+    """
+    Array-backed campaign list
+
+    Campaign fields and metrics are stored as one column each. Fields outside
+    the Campaign model (and non-numeric ids) are not kept.
+    """
+
+    NUMERIC_COLUMNS = {**_CAMPAIGN_NUMERIC, **_METRIC_NUMERIC}
+    TEXT_COLUMNS = _CAMPAIGN_TEXT
+
+    def __init__(self):
+        self._numeric: Dict[str, array] = {name: array(code) for name, code in self.NUMERIC_COLUMNS.items()}
+        self._text: Dict[str, List[str]] = {name: [] for name in self.TEXT_COLUMNS}
+        self._index: Dict[str, int] = {}
+
+    @classmethod
+    def from_campaigns(cls, campaigns: Iterable[Union[Dict[str, Any], Campaign]]) -> "CampaignTable":
+        table = cls()
+        table.extend(campaigns)
+        return table
+
+    def append(self, campaign: Union[Dict[str, Any], Campaign]):
+        """Add one campaign (an API dict or a Campaign)"""
+        if isinstance(campaign, Campaign):
+            campaign = campaign.to_dict()
+        metrics = campaign.get("metrics") or {}
+        for name, code in _CAMPAIGN_NUMERIC.items():
+            self._numeric[name].append(_number(campaign.get(name), code))
+        for name, code in _METRIC_NUMERIC.items():
+            self._numeric[name].append(_number(metrics.get(name), code))
+        for name in self.TEXT_COLUMNS:
+            value = str(campaign.get(name) or "")
+            self._text[name].append(sys.intern(value) if name in _INTERNED else value)
+        self._index[self._text["campaign_id"][-1]] = len(self) - 1
+
+    def extend(self, campaigns: Iterable[Union[Dict[str, Any], Campaign]]):
+        for campaign in campaigns:
+            self.append(campaign)
+
+    def __len__(self) -> int:
+        return len(self._text["campaign_id"])
+
+    def __getitem__(self, row: int) -> Campaign:
+        """Campaign model for one row"""
+        values = {name: self._numeric[name][row] for name in _CAMPAIGN_NUMERIC}
+        values.update((name, self._text[name][row]) for name in self.TEXT_COLUMNS)
+        metrics = CampaignMetrics(**{name: self._numeric[name][row] for name in _METRIC_NUMERIC})
+        return Campaign(metrics=metrics, **values)
+
+    def __iter__(self) -> Iterator[Campaign]:
+        for row in range(len(self)):
+            yield self[row]
+
+    def row_of(self, campaign_id: str) -> Optional[int]:
+        """Row index of a campaign (the last row if the id was appended more than once)"""
+        return self._index.get(campaign_id)
+
+    def column(self, name: str) -> Union[array, List[str]]:
+        """One column as stored (a typed array or a list of strings); don't modify it"""
+        if name in self._numeric:
+            return self._numeric[name]
+        if name in self._text:
+            return self._text[name]
+        raise KeyError(name)
+
+    def to_numpy(self, columns: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+        """
+        Columns as NumPy arrays (int64/float64 for numbers, str for text)
+
+        Args:
+            columns: Column names to convert (default: all)
+        """
+        import numpy as np
+
+        result = {}
+        for name in columns or (*self.NUMERIC_COLUMNS, *self.TEXT_COLUMNS):
+            if name in self._numeric:
+                # One memcpy from the array's buffer; the copy keeps later appends legal
+                column = self._numeric[name]
+                result[name] = np.frombuffer(column, dtype=np.int64 if column.typecode == "q" else np.float64).copy()
+            else:
+                result[name] = np.array(self.column(name), dtype=str)
+        return result
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        """Rows back in the API's dict shape"""
+        return [campaign.to_dict() for campaign in self]
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate memory held by the columns (arrays, lists and their distinct strings)"""
+        total = sum(sys.getsizeof(column) for column in self._numeric.values())
+        for column in self._text.values():
+            total += sys.getsizeof(column) + sum(sys.getsizeof(value) for value in {id(v): v for v in column}.values())
+        return total
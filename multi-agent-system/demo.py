@@ -7,6 +7,7 @@ Enhanced demo with comprehensive logging and reporting for pitch presentations
 import os
 import sys
 import time
+import argparse
 import json
 from datetime import datetime
 from pathlib import Path
@@ -15,15 +16,13 @@ from rich.console import Console
 from rich.panel import Panel
 from rich.table import Table
 from rich.progress import Progress, SpinnerColumn, TextColumn
-from rich.live import Live
-from rich.layout import Layout
 
 # Load environment variables
 load_dotenv()
 
 # Import our modules
 from logger import get_logger, log_system_event, LogLevel
-from main import check_prerequisites, show_api_status
+from main import check_prerequisites, save_profile, show_api_status
 
 console = Console()
 
@@ -32,11 +31,13 @@ class DemoPitchRunner:
     Enhanced demo runner with comprehensive logging and presentation features
     """
     
-    def __init__(self, session_name: str = None):
-        """Initialize the demo runner"""
+    def __init__(self, session_name: str = None, profile: bool = False):
+        """Initialize the demo runner (with profile=True the live cycle is CPU-profiled)"""
         self.session_name = session_name or f"demo_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
         self.logger = get_logger(session_name=self.session_name)
         self.start_time = time.time()
+        self.profile = profile
+        self.profile_files = []
         
     def display_welcome_banner(self):
         """Display an impressive welcome banner"""
@@ -227,7 +228,16 @@ class DemoPitchRunner:
                     "expected_duration": "5-8 minutes"
                 })
                 
-                results = run_full_campaign_cycle()
+                profiler = None
+                if self.profile:
+                    from profiler import SamplingProfiler
+                    profiler = SamplingProfiler()
+                    profiler.start()
+                try:
+                    results = run_full_campaign_cycle()
+                finally:
+                    if profiler is not None:
+                        self.profile_files = list(save_profile(profiler))
                 
                 end_time = time.time()
                 duration = end_time - start_time
@@ -354,6 +364,9 @@ class DemoPitchRunner:
                 session_file = self.logger.save_session()
                 artifacts.append(session_file)
                 progress.update(task, description="✅ Session data saved")
+                
+                # CPU profile from the live cycle (--profile)
+                artifacts.extend(self.profile_files)
             
             # Display artifact summary
             console.print(f"\n📋 Demo Artifacts Generated:", style="bold white")
@@ -366,7 +379,9 @@ class DemoPitchRunner:
                 ("JSON Export", "Technical analysis"),
                 ("CSV Export", "Data analysis"),
                 ("HTML Report", "Executive presentation"),
-                ("Session Data", "Complete audit trail")
+                ("Session Data", "Complete audit trail"),
+                ("CPU Profile (collapsed stacks)", "Flame graph input"),
+                ("CPU Profile (hotspots)", "Per-task CPU hotspots")
             ]
             
             for i, (artifact_type, purpose) in enumerate(artifact_purposes):
@@ -437,7 +452,13 @@ class DemoPitchRunner:
 
 def main():
     """Main demo execution function"""
-    demo_runner = DemoPitchRunner()
+    parser = argparse.ArgumentParser(description="Campaign Pilot pitch demo")
+    parser.add_argument('--session', type=str, help='Custom session name for demo logging')
+    parser.add_argument('--profile', action='store_true',
+                        help='Sample CPU usage during the live cycle and save per-task hotspots with the artifacts')
+    args = parser.parse_args()
+    
+    demo_runner = DemoPitchRunner(session_name=args.session, profile=args.profile)
     
     try:
         # Phase 1: Welcome and setup
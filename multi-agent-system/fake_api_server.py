@@ -4,8 +4,14 @@ Fake API Server for Multi-Agent Campaign System
 Simulates both Store API and Impact.com API responses
 """
 
-from flask import Flask, jsonify, request
+from flask import Flask, Response, g, jsonify, request
+import json
+import math
+import os
+import re
+import bisect
 import random
+import threading
 import time
 from datetime import datetime, timedelta
 import uuid
@@ -78,6 +84,281 @@ products_db = {
 
 campaigns_db = {}
 
+# =============================================================================
+# SIMULATION WINDOWS & CONDITIONAL REQUESTS
+# =============================================================================
+
+# Simulated real-time metrics are re-rolled once per window, so repeated reads of an
+# unchanged resource return identical bodies (and ETags) until the window rolls over
+METRICS_REFRESH_SECONDS = 30
+
+def _metrics_rng(kind: str, entity_id) -> random.Random:
+    """Random generator seeded by entity and current refresh window"""
+    return random.Random(f"{kind}:{entity_id}:{int(time.time() // METRICS_REFRESH_SECONDS)}")
+
+# =============================================================================
+# TRACE PROPAGATION
+# =============================================================================
+
+# W3C trace context sent by the agents' tools: version-trace_id-parent_span_id-flags
+TRACEPARENT_PATTERN = re.compile(r"^[0-9a-f]{2}-([0-9a-f]{32})-([0-9a-f]{16})-[0-9a-f]{2}$")
+
+@app.before_request
+def start_request_timer():
+    g.request_started = time.perf_counter()
+    match = TRACEPARENT_PATTERN.match(request.headers.get("traceparent", ""))
+    g.trace = match.groups() if match else None
+
+@app.after_request
+def add_trace_headers(response):
+    """Report handling time (Server-Timing) and log traced requests with their trace and parent span"""
+    elapsed_ms = (time.perf_counter() - g.request_started) * 1000
+    response.headers["Server-Timing"] = f"app;dur={elapsed_ms:.1f}"
+    if g.trace:
+        app.logger.info("trace=%s parent_span=%s %s %s -> %s in %.1fms", g.trace[0], g.trace[1],
+                        request.method, request.full_path.rstrip("?"), response.status_code, elapsed_ms)
+    return response
+
+@app.after_request
+def add_conditional_headers(response):
+    """Tag GET responses with a content ETag and answer If-None-Match with 304 Not Modified"""
+    if request.method == 'GET' and response.status_code == 200 and not response.is_streamed:
+        response.add_etag()
+        response.make_conditional(request)
+    return response
+
+# =============================================================================
+# CAMPAIGN CHANGE LOG
+# =============================================================================
+
+# Oldest entries are dropped beyond this; clients behind the retained window get 410 and re-sync
+MAX_CHANGE_LOG_ENTRIES = 10000
+# Shortest keepalive interval a stream client may ask for
+MIN_STREAM_HEARTBEAT_SECONDS = 1.0
+
+campaign_changes = []
+change_seq = 0
+# Guards the change log and wakes long-poll / SSE clients when a change is recorded
+_changes_cond = threading.Condition()
+
+# campaign_id -> refresh window whose metrics were last written to the change log
+_logged_metrics_window = {}
+
+def _record_change(change_type: str, campaign_id, data: dict):
+    """Append a change to the campaign change log under a new sequence number"""
+    global change_seq
+    with _changes_cond:
+        change_seq += 1
+        campaign_changes.append({
+            "seq": change_seq,
+            "type": change_type,
+            "campaign_id": campaign_id,
+            "timestamp": datetime.now().isoformat(),
+            "data": data
+        })
+        if len(campaign_changes) > MAX_CHANGE_LOG_ENTRIES:
+            del campaign_changes[:len(campaign_changes) - MAX_CHANGE_LOG_ENTRIES]
+        _changes_cond.notify_all()
+
+def _changes_after(since: int):
+    """
+    Return the logged changes after a cursor, or None if the cursor is outside
+    the retained log. Must be called with _changes_cond held.
+    """
+    oldest = campaign_changes[0]["seq"] if campaign_changes else change_seq + 1
+    if since < oldest - 1 or since > change_seq:
+        return None
+    # Sequence numbers are contiguous, so the cursor maps straight to a list offset
+    return campaign_changes[max(0, since - oldest + 1):]
+
+def _seconds_until_metrics_refresh() -> float:
+    """Time left in the current simulated metrics window"""
+    return METRICS_REFRESH_SECONDS - time.time() % METRICS_REFRESH_SECONDS
+
+def _simulate_campaign_list_metrics(campaign_id, campaign: dict) -> dict:
+    """Simulated metrics for a campaign as reported by the campaign list"""
+    rng = _metrics_rng("campaign_list", campaign_id)
+    days_running = (datetime.now() - datetime.fromisoformat(campaign['created_at'].replace('Z', ''))).days + 1
+    base_impressions = rng.randint(1000, 8000) * days_running
+    
+    return {
+        "impressions": base_impressions,
+        "clicks": int(base_impressions * rng.uniform(0.01, 0.05)),
+        "conversions": int(base_impressions * rng.uniform(0.001, 0.008)),
+        "spend": round(rng.uniform(5, campaign['budget'] * 0.9), 2),
+        "ctr": round(rng.uniform(1.2, 4.8), 2),
+        "cpc": round(rng.uniform(0.25, 2.50), 2),
+        "roas": round(rng.uniform(1.5, 6.2), 2)
+    }
+
+def _record_metric_updates():
+    """Log a metrics_updated change for every active campaign whose refresh window rolled over"""
+    window = int(time.time() // METRICS_REFRESH_SECONDS)
+    for campaign_id, campaign in list(campaigns_db.items()):
+        if campaign['status'] != 'active' or _logged_metrics_window.get(campaign_id) == window:
+            continue
+        _logged_metrics_window[campaign_id] = window
+        _record_change("metrics_updated", campaign_id, {
+            "metrics": _simulate_campaign_list_metrics(campaign_id, campaign)
+        })
+
+# =============================================================================
+# METRICS HISTORY (PRE-AGGREGATED ROLLUPS)
+# =============================================================================
+
+HISTORY_DAYS = 90
+HOUR_SECONDS = 3600
+DAY_SECONDS = 86400
+GRANULARITIES = {"hour": HOUR_SECONDS, "day": DAY_SECONDS}
+
+# Flow metrics are summed inside a bucket, ratio metrics are averaged
+ADDITIVE_METRICS = {"page_views", "sales", "revenue", "impressions", "clicks", "conversions", "spend"}
+
+class MetricsRollup:
+    """
+    Hourly and daily rollups of a single entity's metrics.
+
+    Samples are folded into both granularities as they are recorded, so a range
+    query only walks the buckets it returns (found via bisect on the sorted
+    bucket keys) no matter how many months of history are stored.
+    """
+
+    def __init__(self, recorded_until: float):
+        self.recorded_until = recorded_until
+        # Held while hours are filled in and while a query walks the buckets
+        self.lock = threading.Lock()
+        self.keys = {name: [] for name in GRANULARITIES}
+        self.buckets = {name: {} for name in GRANULARITIES}
+
+    def record(self, ts: float, values: dict):
+        """Fold one sample into the hour and day buckets containing ts"""
+        for name, width in GRANULARITIES.items():
+            bucket_start = int(ts // width * width)
+            bucket = self.buckets[name].get(bucket_start)
+            if bucket is None:
+                bucket = {"samples": 0}
+                self.buckets[name][bucket_start] = bucket
+                bisect.insort(self.keys[name], bucket_start)
+            bucket["samples"] += 1
+            for metric, value in values.items():
+                bucket[metric] = bucket.get(metric, 0) + value
+
+    def query(self, start: float, end: float, granularity: str, metrics=None):
+        """Return the buckets overlapping [start, end) as a list of points"""
+        width = GRANULARITIES[granularity]
+        keys = self.keys[granularity]
+        lo = bisect.bisect_left(keys, int(start // width * width))
+        hi = bisect.bisect_left(keys, end)
+
+        series = []
+        for bucket_start in keys[lo:hi]:
+            bucket = self.buckets[granularity][bucket_start]
+            samples = bucket["samples"]
+            point = {
+                "bucket_start": datetime.fromtimestamp(bucket_start).isoformat(),
+                "samples": samples
+            }
+            for metric, total in bucket.items():
+                if metric == "samples" or (metrics and metric not in metrics):
+                    continue
+                value = total if metric in ADDITIVE_METRICS else total / samples
+                point[metric] = round(value, 2)
+            series.append(point)
+        return series
+
+# (entity_type, entity_id) -> MetricsRollup
+metrics_history = {}
+# Guards creating rollups in metrics_history (each rollup guards its own buckets)
+_history_lock = threading.Lock()
+
+def _simulate_hourly_metrics(entity_type: str, entity: dict, rng: random.Random) -> dict:
+    """Generate one hour of activity for a product or campaign"""
+    if entity_type == "product":
+        page_views = max(0, int(entity['page_views'] / (7 * 24) * rng.uniform(0.4, 1.6)))
+        sales = max(0, int(round(page_views * rng.uniform(0.005, 0.04))))
+        return {
+            "page_views": page_views,
+            "sales": sales,
+            "revenue": round(sales * entity['price'], 2),
+            "conversion_rate": round(rng.uniform(2.1, 8.5), 2)
+        }
+
+    impressions = rng.randint(40, 420)
+    clicks = int(impressions * rng.uniform(0.01, 0.05))
+    spend = round(clicks * rng.uniform(0.25, 2.50), 2)
+    conversions = int(impressions * rng.uniform(0.001, 0.008))
+    return {
+        "impressions": impressions,
+        "clicks": clicks,
+        "conversions": conversions,
+        "spend": spend,
+        "ctr": round(clicks / impressions * 100, 2) if impressions else 0.0,
+        "cpc": round(spend / clicks, 2) if clicks else 0.0,
+        "roas": round(rng.uniform(1.5, 6.2), 2)
+    }
+
+def _get_rollup(entity_type: str, entity_id, since: float) -> MetricsRollup:
+    """
+    Fetch the rollup for an entity, creating it and filling any missing hours up to now
+
+    Requests run on separate threads, so the fill holds the rollup's lock; two
+    requests for the same entity would otherwise record the same hour twice.
+    """
+    key = (entity_type, entity_id)
+    with _history_lock:
+        rollup = metrics_history.get(key)
+        if rollup is None:
+            rollup = MetricsRollup(recorded_until=since // HOUR_SECONDS * HOUR_SECONDS)
+            metrics_history[key] = rollup
+
+    entity = products_db[entity_id] if entity_type == "product" else campaigns_db[entity_id]
+    with rollup.lock:
+        rng = random.Random(f"{entity_type}:{entity_id}:{rollup.recorded_until}")
+        now = time.time()
+        while rollup.recorded_until + HOUR_SECONDS <= now:
+            rollup.record(rollup.recorded_until, _simulate_hourly_metrics(entity_type, entity, rng))
+            rollup.recorded_until += HOUR_SECONDS
+    return rollup
+
+def _history_response(entity_type: str, entity_id, since: float):
+    """Parse range query parameters and build a metrics history response"""
+    granularity = request.args.get('granularity', 'day')
+    if granularity not in GRANULARITIES:
+        return jsonify({
+            "status": "error",
+            "message": f"Invalid granularity '{granularity}', expected one of: {', '.join(GRANULARITIES)}"
+        }), 400
+
+    try:
+        end = datetime.fromisoformat(request.args['end']).timestamp() if 'end' in request.args else time.time()
+        if 'start' in request.args:
+            start = datetime.fromisoformat(request.args['start']).timestamp()
+        else:
+            start = end - int(request.args.get('days', 7)) * DAY_SECONDS
+    except ValueError as e:
+        return jsonify({
+            "status": "error",
+            "message": f"Invalid time range: {e}"
+        }), 400
+
+    metrics = [m for m in request.args.get('metrics', '').split(',') if m] or None
+    rollup = _get_rollup(entity_type, entity_id, since)
+    with rollup.lock:
+        series = rollup.query(start, end, granularity, metrics)
+
+    return jsonify({
+        "status": "success",
+        "data": {
+            "entity_type": entity_type,
+            "entity_id": entity_id,
+            "granularity": granularity,
+            "start": datetime.fromtimestamp(start).isoformat(),
+            "end": datetime.fromtimestamp(end).isoformat(),
+            "series": series
+        },
+        "count": len(series)
+    })
+
 # =============================================================================
 # STORE API ENDPOINTS
 # =============================================================================
@@ -104,13 +385,14 @@ def get_product(product_id):
         }), 404
     
     product = products_db[product_id].copy()
+    rng = _metrics_rng("product", product_id)
     
     # Add some randomness to simulate real-time data
     base_views = product['page_views']
     base_sales = product['sales']
     
-    product['page_views'] = base_views + random.randint(-50, 100)
-    product['sales'] = base_sales + random.randint(-5, 15)
+    product['page_views'] = base_views + rng.randint(-50, 100)
+    product['sales'] = base_sales + rng.randint(-5, 15)
     product['revenue'] = product['sales'] * product['price']
     
     return jsonify({
@@ -130,29 +412,30 @@ def get_product_analytics(product_id):
         }), 404
     
     product = products_db[product_id]
+    rng = _metrics_rng("analytics", product_id)
     
     # Generate realistic analytics data
     analytics = {
         "product_id": product_id,
         "time_range": "last_7_days",
         "page_views": {
-            "current": product['page_views'] + random.randint(-100, 200),
+            "current": product['page_views'] + rng.randint(-100, 200),
             "previous": product['page_views'],
-            "change_percent": round(random.uniform(-25, 45), 2)
+            "change_percent": round(rng.uniform(-25, 45), 2)
         },
         "sales": {
-            "current": product['sales'] + random.randint(-10, 25),
+            "current": product['sales'] + rng.randint(-10, 25),
             "previous": product['sales'],
-            "change_percent": round(random.uniform(-20, 35), 2)
+            "change_percent": round(rng.uniform(-20, 35), 2)
         },
         "revenue": {
-            "current": (product['sales'] + random.randint(-10, 25)) * product['price'],
+            "current": (product['sales'] + rng.randint(-10, 25)) * product['price'],
             "previous": product['revenue'],
-            "change_percent": round(random.uniform(-20, 35), 2)
+            "change_percent": round(rng.uniform(-20, 35), 2)
         },
-        "conversion_rate": round(random.uniform(2.1, 8.5), 2),
-        "bounce_rate": round(random.uniform(35, 75), 2),
-        "avg_session_duration": random.randint(120, 500)
+        "conversion_rate": round(rng.uniform(2.1, 8.5), 2),
+        "bounce_rate": round(rng.uniform(35, 75), 2),
+        "avg_session_duration": rng.randint(120, 500)
     }
     
     return jsonify({
@@ -160,6 +443,17 @@ def get_product_analytics(product_id):
         "data": analytics
     })
 
+@app.route('/api/store/products/<int:product_id>/history', methods=['GET'])
+def get_product_history(product_id):
+    """Get downsampled metric history for a product (?start=&end=|days=, granularity=hour|day, metrics=)"""
+    if product_id not in products_db:
+        return jsonify({
+            "status": "error",
+            "message": "Product not found"
+        }), 404
+
+    return _history_response("product", product_id, time.time() - HISTORY_DAYS * DAY_SECONDS)
+
 # =============================================================================
 # IMPACT.COM API ENDPOINTS
 # =============================================================================
@@ -202,6 +496,7 @@ def create_campaign():
     }
     
     campaigns_db[campaign_id] = campaign
+    _record_change("created", campaign_id, campaign.copy())
     
     return jsonify({
         "status": "success",
@@ -221,19 +516,20 @@ def get_campaign(campaign_id):
         }), 404
     
     campaign = campaigns_db[campaign_id].copy()
+    rng = _metrics_rng("campaign", campaign_id)
     
     # Simulate realistic campaign performance
     days_running = (datetime.now() - datetime.fromisoformat(campaign['created_at'].replace('Z', ''))).days + 1
-    base_impressions = random.randint(1000, 10000) * days_running
+    base_impressions = rng.randint(1000, 10000) * days_running
     
     campaign['metrics'] = {
         "impressions": base_impressions,
-        "clicks": int(base_impressions * random.uniform(0.01, 0.05)),
-        "conversions": int(base_impressions * random.uniform(0.001, 0.008)),
-        "spend": round(random.uniform(5, campaign['budget'] * 0.8), 2),
-        "ctr": round(random.uniform(1.2, 4.8), 2),
-        "cpc": round(random.uniform(0.25, 2.50), 2),
-        "roas": round(random.uniform(1.5, 6.2), 2)
+        "clicks": int(base_impressions * rng.uniform(0.01, 0.05)),
+        "conversions": int(base_impressions * rng.uniform(0.001, 0.008)),
+        "spend": round(rng.uniform(5, campaign['budget'] * 0.8), 2),
+        "ctr": round(rng.uniform(1.2, 4.8), 2),
+        "cpc": round(rng.uniform(0.25, 2.50), 2),
+        "roas": round(rng.uniform(1.5, 6.2), 2)
     }
     
     return jsonify({
@@ -250,26 +546,127 @@ def get_all_campaigns():
     for campaign_id, campaign in campaigns_db.items():
         # Update metrics for each campaign
         campaign_copy = campaign.copy()
-        days_running = (datetime.now() - datetime.fromisoformat(campaign['created_at'].replace('Z', ''))).days + 1
-        base_impressions = random.randint(1000, 8000) * days_running
-        
-        campaign_copy['metrics'] = {
-            "impressions": base_impressions,
-            "clicks": int(base_impressions * random.uniform(0.01, 0.05)),
-            "conversions": int(base_impressions * random.uniform(0.001, 0.008)),
-            "spend": round(random.uniform(5, campaign['budget'] * 0.9), 2),
-            "ctr": round(random.uniform(1.2, 4.8), 2),
-            "cpc": round(random.uniform(0.25, 2.50), 2),
-            "roas": round(random.uniform(1.5, 6.2), 2)
-        }
+        campaign_copy['metrics'] = _simulate_campaign_list_metrics(campaign_id, campaign)
         campaigns.append(campaign_copy)
     
     return jsonify({
         "status": "success",
         "data": campaigns,
-        "count": len(campaigns)
+        "count": len(campaigns),
+        "cursor": change_seq
+    })
+
+@app.route('/api/impact/campaigns/changes', methods=['GET'])
+def get_campaign_changes():
+    """Get campaign changes recorded after a cursor (?since=<seq>&limit=&wait=<seconds> to long-poll)"""
+    time.sleep(0.05)  # Simulate network delay
+    
+    try:
+        since = int(request.args.get('since', 0))
+        limit = min(int(request.args.get('limit', 500)), 1000)
+        wait = min(float(request.args.get('wait', 0)), 60.0)
+    except ValueError:
+        return jsonify({
+            "status": "error",
+            "message": "since, limit and wait must be numbers"
+        }), 400
+    
+    _record_metric_updates()
+    deadline = time.time() + wait
+    
+    with _changes_cond:
+        pending = _changes_after(since)
+        # Long-poll: hold the request open until something changes or the wait expires
+        while pending == [] and time.time() < deadline:
+            _changes_cond.wait(timeout=min(deadline - time.time(), _seconds_until_metrics_refresh()))
+            _record_metric_updates()
+            pending = _changes_after(since)
+        
+        if pending is None:
+            return jsonify({
+                "status": "error",
+                "message": "Cursor is outside the retained change log, re-sync from /api/impact/campaigns",
+                "cursor": change_seq
+            }), 410
+        
+        changes = pending[:limit]
+        cursor = changes[-1]["seq"] if changes else max(since, 0)
+        has_more = len(pending) > limit
+    
+    return jsonify({
+        "status": "success",
+        "data": changes,
+        "count": len(changes),
+        "cursor": cursor,
+        "has_more": has_more
     })
 
+@app.route('/api/impact/campaigns/stream', methods=['GET'])
+def stream_campaign_changes():
+    """Stream campaign changes as Server-Sent Events (resume with Last-Event-ID or ?since=)"""
+    try:
+        last_event_id = request.headers.get('Last-Event-ID') or request.args.get('since')
+        since = int(last_event_id) if last_event_id is not None else change_seq
+        heartbeat = float(request.args.get('heartbeat', 15))
+    except ValueError:
+        return jsonify({
+            "status": "error",
+            "message": "Last-Event-ID, since and heartbeat must be numbers"
+        }), 400
+    # A zero, negative or NaN heartbeat would skip the wait and spin sending keepalives
+    if not math.isfinite(heartbeat) or heartbeat < MIN_STREAM_HEARTBEAT_SECONDS:
+        return jsonify({
+            "status": "error",
+            "message": f"heartbeat must be at least {MIN_STREAM_HEARTBEAT_SECONDS:g} seconds"
+        }), 400
+    
+    def generate():
+        cursor = since
+        last_sent = time.time()
+        # Flush headers right away and suggest a reconnect delay to EventSource clients
+        yield "retry: 3000\n\n"
+        
+        while True:
+            _record_metric_updates()
+            with _changes_cond:
+                pending = _changes_after(cursor)
+                until_heartbeat = heartbeat - (time.time() - last_sent)
+                if pending == [] and until_heartbeat > 0:
+                    _changes_cond.wait(timeout=min(until_heartbeat, _seconds_until_metrics_refresh()))
+                    pending = _changes_after(cursor)
+                latest = change_seq
+            
+            if pending is None:
+                # Client is too far behind (or the server restarted): tell it to re-sync
+                cursor = latest
+                yield f"event: resync\nid: {cursor}\ndata: {json.dumps({'cursor': cursor})}\n\n"
+            elif pending:
+                for change in pending:
+                    cursor = change["seq"]
+                    yield f"event: {change['type']}\nid: {cursor}\ndata: {json.dumps(change)}\n\n"
+            elif time.time() - last_sent >= heartbeat:
+                yield ": keepalive\n\n"
+            else:
+                continue
+            last_sent = time.time()
+    
+    return Response(generate(), mimetype='text/event-stream', headers={
+        "Cache-Control": "no-cache",
+        "X-Accel-Buffering": "no"
+    })
+
+@app.route('/api/impact/campaigns/<campaign_id>/history', methods=['GET'])
+def get_campaign_history(campaign_id):
+    """Get downsampled metric history for a campaign (?start=&end=|days=, granularity=hour|day, metrics=)"""
+    if campaign_id not in campaigns_db:
+        return jsonify({
+            "status": "error",
+            "message": "Campaign not found"
+        }), 404
+
+    created_at = datetime.fromisoformat(campaigns_db[campaign_id]['created_at'].replace('Z', ''))
+    return _history_response("campaign", campaign_id, created_at.timestamp())
+
 @app.route('/api/impact/campaigns/<campaign_id>/pause', methods=['POST'])
 def pause_campaign(campaign_id):
     """Pause a campaign"""
@@ -282,6 +679,7 @@ def pause_campaign(campaign_id):
         }), 404
     
     campaigns_db[campaign_id]['status'] = 'paused'
+    _record_change("paused", campaign_id, {"status": "paused"})
     
     return jsonify({
         "status": "success",
@@ -301,6 +699,7 @@ def resume_campaign(campaign_id):
         }), 404
     
     campaigns_db[campaign_id]['status'] = 'active'
+    _record_change("resumed", campaign_id, {"status": "active"})
     
     return jsonify({
         "status": "success",
@@ -330,6 +729,10 @@ def reset_data():
     """Reset all campaign data (for testing)"""
     global campaigns_db
     campaigns_db = {}
+    for key in [key for key in metrics_history if key[0] == "campaign"]:
+        del metrics_history[key]
+    _logged_metrics_window.clear()
+    _record_change("reset", None, {})
     
     return jsonify({
         "status": "success",
@@ -337,10 +740,12 @@ def reset_data():
     })
 
 if __name__ == '__main__':
+    # FAKE_API_PORT lets several stores run side by side (e.g. for portfolio.py)
+    port = int(os.getenv('FAKE_API_PORT', '6000'))
     print("🚀 Starting Fake API Server...")
-    print("📍 Store API: http://localhost:5000/api/store/*")
-    print("📍 Impact.com API: http://localhost:5000/api/impact/*")
-    print("📍 Health Check: http://localhost:5000/api/health")
-    print("📍 Reset Data: http://localhost:5000/api/reset")
+    print(f"📍 Store API: http://localhost:{port}/api/store/*")
+    print(f"📍 Impact.com API: http://localhost:{port}/api/impact/*")
+    print(f"📍 Health Check: http://localhost:{port}/api/health")
+    print(f"📍 Reset Data: http://localhost:{port}/api/reset")
     
-    app.run(debug=True, host='0.0.0.0', port=6000) 
\ No newline at end of file
+    app.run(debug=True, host='0.0.0.0', port=port) 
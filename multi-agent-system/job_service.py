@@ -0,0 +1,385 @@
+#!/usr/bin/env python3
+"""
+Campaign Pilot Job Service
+FastAPI service that accepts crew runs as jobs, queues them and runs them on a bounded worker pool
+
+Endpoints:
+    POST   /jobs                  submit {"kind": "full|analysis|creation", "inputs": {...}, "tenant": "..."}
+    GET    /jobs                  list jobs (optionally ?status=queued|running|succeeded|failed|cancelled)
+    GET    /jobs/{id}             job status
+    GET    /jobs/{id}/result      job result (409 until finished)
+    GET    /jobs/{id}/events      progress as Server-Sent Events (resumable with Last-Event-ID)
+    DELETE /jobs/{id}             cancel a queued job
+    GET    /health                queue depth and worker usage
+"""
+
+import asyncio
+import json
+import os
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
+
+from logger import log_system_event, LogLevel
+from tenancy import DEFAULT_TENANTS_FILE, TenantContext, default_tenant, load_tenants, tenant_scope
+
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "2"))
+JOB_QUEUE_SIZE = int(os.getenv("JOB_QUEUE_SIZE", "100"))
+JOB_HISTORY_SIZE = int(os.getenv("JOB_HISTORY_SIZE", "500"))
+SSE_HEARTBEAT_SECONDS = 15.0
+
+JOB_KINDS = ("full", "analysis", "creation")
+FINISHED_STATUSES = ("succeeded", "failed", "cancelled")
+
+ProgressCallback = Callable[[str, Dict[str, Any]], None]
+JobRunner = Callable[[str, Dict[str, Any], ProgressCallback, TenantContext], str]
+
+# =============================================================================
+# JOBS
+# =============================================================================
+
+@dataclass
+class Job:
+    """A queued or executed crew run"""
+    job_id: str
+    kind: str
+    inputs: Dict[str, Any] = field(default_factory=dict)
+    tenant: Optional[str] = None
+    status: str = "queued"
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    result: Optional[str] = None
+    error: Optional[str] = None
+    events: List[Dict[str, Any]] = field(default_factory=list)
+    _changed: Optional[asyncio.Event] = field(default=None, repr=False)
+
+    def emit(self, event_type: str, data: Dict[str, Any]):
+        """Record a progress event and wake any streaming readers (event loop thread only)"""
+        self.events.append({"seq": len(self.events) + 1, "type": event_type, "data": data, "ts": time.time()})
+        if self._changed is not None:
+            self._changed.set()
+        self._changed = asyncio.Event()
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "job_id": self.job_id,
+            "kind": self.kind,
+            "tenant": self.tenant,
+            "status": self.status,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "duration_seconds": round(self.finished_at - self.started_at, 3)
+                if self.started_at and self.finished_at else None,
+            "progress_events": len(self.events),
+            "error": self.error
+        }
+
+class QueueFull(Exception):
+    pass
+
+def run_crew_job(kind: str, inputs: Dict[str, Any], on_progress: ProgressCallback,
+                 tenant: Optional[TenantContext] = None) -> str:
+    """Run one crew workflow on the tenant's pooled crew, reporting task and step progress"""
+    from crew import get_crew_pool
+    from run_checkpoint import kickoff_with_checkpoints
+
+    tenant = tenant or default_tenant()
+    pool = get_crew_pool(None if tenant.is_default else tenant.tenant_id)
+    with tenant_scope(tenant), pool.lease(kind) as leased:
+        crew = getattr(leased, "crew", leased)
+        previous_callbacks = (crew.task_callback, crew.step_callback)
+        steps = 0
+
+        def on_step(step):
+            nonlocal steps
+            steps += 1
+            on_progress("step", {"step": steps, "detail": str(step)[:300]})
+
+        def on_task(output):
+            on_progress("task_completed", {
+                "task": getattr(output, "name", None) or str(getattr(output, "description", ""))[:120],
+                "agent": getattr(output, "agent", None),
+                "summary": str(getattr(output, "raw", output))[:500]
+            })
+
+        crew.task_callback, crew.step_callback = on_task, on_step
+        try:
+            if kind == "full":
+                result = leased.run_campaign_flow(inputs)
+            else:
+                result = kickoff_with_checkpoints(crew, inputs)
+        finally:
+            crew.task_callback, crew.step_callback = previous_callbacks
+    return str(result)
+
+class JobManager:
+    """
+    Bounded job queue drained by a fixed number of async workers.
+
+    Each worker runs the (blocking) crew in a thread pool of the same size, so at
+    most `workers` crews execute at once. A job runs in its tenant's scope on that
+    tenant's crew pool. Jobs for the same tenant share its agents and therefore
+    run one after another; jobs for different tenants run side by side. A worker
+    takes the oldest queued job whose tenant has nothing running, so a tenant's
+    backlog never holds a worker while it waits.
+
+    Tenants come from `tenants` (default: TENANTS_FILE if it exists); a job
+    without a tenant runs for the default store.
+    """
+
+    def __init__(self, runner: JobRunner = run_crew_job, workers: int = JOB_WORKERS,
+                 max_queue: int = JOB_QUEUE_SIZE, history_size: int = JOB_HISTORY_SIZE,
+                 tenants: Optional[List[TenantContext]] = None):
+        self.runner = runner
+        if tenants is None:
+            tenants = load_tenants(DEFAULT_TENANTS_FILE) if os.path.exists(DEFAULT_TENANTS_FILE) else []
+        # Kept for the service's lifetime so each tenant's HTTP session and caches stay warm
+        self.tenants: Dict[str, TenantContext] = {default_tenant().tenant_id: default_tenant()}
+        self.tenants.update((tenant.tenant_id, tenant) for tenant in tenants)
+        self.workers = workers
+        self.max_queue = max_queue
+        self.history_size = history_size
+        self.jobs: Dict[str, Job] = {}
+        self.running = 0
+        self._waiting: List[Job] = []
+        self._busy_tenants: set = set()
+        self._changed: Optional[asyncio.Condition] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._worker_tasks: List[asyncio.Task] = []
+
+    async def start(self):
+        self._changed = asyncio.Condition()
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="crew-job")
+        self._worker_tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+        log_system_event("Job Service Started", {"workers": self.workers, "max_queue": self.max_queue})
+
+    async def stop(self):
+        for task in self._worker_tasks:
+            task.cancel()
+        await asyncio.gather(*self._worker_tasks, return_exceptions=True)
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        log_system_event("Job Service Stopped", {"jobs": len(self.jobs)})
+
+    def submit(self, kind: str, inputs: Optional[Dict[str, Any]] = None, tenant: Optional[str] = None) -> Job:
+        if kind not in JOB_KINDS:
+            raise ValueError(f"Unknown job kind: {kind}")
+        if tenant is not None and tenant not in self.tenants:
+            raise ValueError(f"Unknown tenant: {tenant}")
+        if len(self._waiting) >= self.max_queue:
+            raise QueueFull(f"Job queue is full ({self.max_queue} waiting)")
+        job = Job(job_id=f"job_{uuid.uuid4().hex[:10]}", kind=kind, inputs=inputs or {}, tenant=tenant)
+        self._waiting.append(job)
+        self.jobs[job.job_id] = job
+        job.emit("queued", {"position": len(self._waiting)})
+        self._prune_history()
+        asyncio.get_running_loop().create_task(self._notify())
+        return job
+
+    def cancel(self, job_id: str) -> bool:
+        """Cancel a job that hasn't started yet (running crews can't be interrupted safely)"""
+        job = self.jobs.get(job_id)
+        if job is None or job.status != "queued":
+            return False
+        self._waiting.remove(job)
+        job.status, job.finished_at = "cancelled", time.time()
+        job.emit("cancelled", {})
+        return True
+
+    async def _notify(self):
+        async with self._changed:
+            self._changed.notify_all()
+
+    async def _next_job(self) -> Job:
+        """Take the oldest queued job whose tenant has no job running, waiting for one if needed"""
+        async with self._changed:
+            while True:
+                for job in self._waiting:
+                    tenant_id = job.tenant or default_tenant().tenant_id
+                    if tenant_id not in self._busy_tenants:
+                        self._waiting.remove(job)
+                        self._busy_tenants.add(tenant_id)
+                        return job
+                await self._changed.wait()
+
+    def _prune_history(self):
+        finished = [job for job in self.jobs.values() if job.status in FINISHED_STATUSES]
+        for job in sorted(finished, key=lambda j: j.finished_at)[:max(0, len(finished) - self.history_size)]:
+            del self.jobs[job.job_id]
+
+    async def _worker(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            job = await self._next_job()
+            tenant_id = job.tenant or default_tenant().tenant_id
+            try:
+                job.status, job.started_at = "running", time.time()
+                job.emit("started", {"kind": job.kind, "tenant": job.tenant})
+                self.running += 1
+
+                def on_progress(event_type, data, job=job):
+                    loop.call_soon_threadsafe(job.emit, event_type, data)
+
+                try:
+                    job.result = await loop.run_in_executor(
+                        self._executor, self.runner, job.kind, job.inputs, on_progress, self.tenants[tenant_id]
+                    )
+                    job.status = "succeeded"
+                except Exception as e:
+                    job.status, job.error = "failed", str(e)
+                    log_system_event("Job Failed", {"job_id": job.job_id, "kind": job.kind, "error": str(e)}, LogLevel.ERROR)
+                finally:
+                    self.running -= 1
+                    job.finished_at = time.time()
+                    job.emit(job.status, {"error": job.error} if job.error else {})
+            finally:
+                async with self._changed:
+                    self._busy_tenants.discard(tenant_id)
+                    self._changed.notify_all()
+
+    async def stream_events(self, job_id: str, after: int = 0) -> AsyncIterator[Optional[Dict[str, Any]]]:
+        """Yield a job's progress events after `after`, then new ones as they arrive (None = heartbeat)"""
+        job = self.jobs[job_id]
+        while True:
+            for event in job.events[after:]:
+                after = event["seq"]
+                yield event
+            if job.status in FINISHED_STATUSES:
+                return
+            try:
+                await asyncio.wait_for(job._changed.wait(), SSE_HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                yield None
+
+    def health(self) -> Dict[str, Any]:
+        counts: Dict[str, int] = {}
+        for job in self.jobs.values():
+            counts[job.status] = counts.get(job.status, 0) + 1
+        return {
+            "status": "healthy",
+            "workers": self.workers,
+            "running": self.running,
+            "queued": len(self._waiting),
+            "max_queue": self.max_queue,
+            "jobs": counts
+        }
+
+# =============================================================================
+# HTTP API
+# =============================================================================
+
+def _env_list(name: str, default: str) -> List[str]:
+    value = os.getenv(name, default)
+    try:
+        return json.loads(value)
+    except json.JSONDecodeError:
+        return [item.strip() for item in value.split(",") if item.strip()]
+
+def create_app(manager: Optional[JobManager] = None):
+    """Build the FastAPI app around a JobManager (a default one if not given)"""
+    from fastapi import FastAPI, HTTPException, Request
+    from fastapi.middleware.cors import CORSMiddleware
+    from fastapi.responses import StreamingResponse
+    from pydantic import BaseModel, Field
+
+    manager = manager or JobManager()
+
+    class JobRequest(BaseModel):
+        kind: str = Field("full", description="full | analysis | creation")
+        inputs: Dict[str, Any] = Field(default_factory=dict)
+        tenant: Optional[str] = None
+
+    @asynccontextmanager
+    async def lifespan(app):
+        await manager.start()
+        yield
+        await manager.stop()
+
+    app = FastAPI(title="Campaign Pilot Job Service", lifespan=lifespan)
+    # No cross-origin access unless origins are listed (sample.env2 has the localhost UI origins)
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=_env_list("CORS_ALLOW_ORIGINS", "[]"),
+        allow_credentials=os.getenv("CORS_ALLOW_CREDENTIALS", "false").lower() == "true",
+        allow_methods=_env_list("CORS_ALLOW_METHODS", '["GET", "POST", "DELETE"]'),
+        allow_headers=_env_list("CORS_ALLOW_HEADERS", '["*"]')
+    )
+    app.state.manager = manager
+
+    def get_job(job_id: str) -> Job:
+        job = manager.jobs.get(job_id)
+        if job is None:
+            raise HTTPException(status_code=404, detail="Job not found")
+        return job
+
+    @app.post("/jobs", status_code=202)
+    async def submit_job(request: JobRequest):
+        try:
+            job = manager.submit(request.kind, request.inputs, request.tenant)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        except QueueFull as e:
+            raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": "30"})
+        return job.to_dict()
+
+    @app.get("/jobs")
+    async def list_jobs(status: Optional[str] = None):
+        jobs = [job.to_dict() for job in manager.jobs.values() if status is None or job.status == status]
+        return {"count": len(jobs), "jobs": jobs}
+
+    @app.get("/jobs/{job_id}")
+    async def job_status(job_id: str):
+        return get_job(job_id).to_dict()
+
+    @app.get("/jobs/{job_id}/result")
+    async def job_result(job_id: str):
+        job = get_job(job_id)
+        if job.status not in FINISHED_STATUSES:
+            raise HTTPException(status_code=409, detail=f"Job is {job.status}")
+        return {**job.to_dict(), "result": job.result}
+
+    @app.delete("/jobs/{job_id}")
+    async def cancel_job(job_id: str):
+        job = get_job(job_id)
+        if not manager.cancel(job_id):
+            raise HTTPException(status_code=409, detail=f"Job is {job.status} and can't be cancelled")
+        return job.to_dict()
+
+    @app.get("/jobs/{job_id}/events")
+    async def job_events(job_id: str, request: Request):
+        get_job(job_id)
+        try:
+            after = int(request.headers.get("Last-Event-ID", "0") or 0)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Last-Event-ID must be a number")
+
+        async def stream():
+            async for event in manager.stream_events(job_id, after):
+                if event is None:
+                    yield ": keepalive\n\n"
+                else:
+                    yield f"id: {event['seq']}\nevent: {event['type']}\ndata: {json.dumps(event['data'])}\n\n"
+
+        return StreamingResponse(stream(), media_type="text/event-stream",
+                                 headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+    @app.get("/health")
+    async def health():
+        return manager.health()
+
+    return app
+
+if __name__ == "__main__":
+    import uvicorn
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    uvicorn.run(
+        create_app(),
+        host=os.getenv("SERVER_HOST", "0.0.0.0"),
+        port=int(os.getenv("SERVER_PORT", "8000"))
+    )
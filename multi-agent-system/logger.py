@@ -5,6 +5,7 @@ Comprehensive logging system for demo and analytics purposes
 """
 
 import os
+import html
 import json
 import logging
 import time
@@ -12,9 +13,11 @@ from datetime import datetime, timezone
 from typing import Dict, Any, List, Optional
 from pathlib import Path
 import threading
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, field
 from enum import Enum
 
+from tracing import current_span_id, current_trace_id
+
 class LogLevel(Enum):
     """Log levels for different types of events"""
     INFO = "INFO"
@@ -25,6 +28,7 @@ class LogLevel(Enum):
     DECISION = "DECISION"
     PERFORMANCE = "PERFORMANCE"
     API_CALL = "API_CALL"
+    LLM_CALL = "LLM_CALL"
 
 @dataclass
 class LogEntry:
@@ -36,6 +40,23 @@ class LogEntry:
     data: Dict[str, Any]
     duration_ms: Optional[float] = None
     session_id: Optional[str] = None
+    # Span open when the entry was logged (see tracing.py), to place it in a trace
+    trace_id: Optional[str] = field(default_factory=current_trace_id)
+    span_id: Optional[str] = field(default_factory=current_span_id)
+
+def _usage_bucket() -> Dict[str, Any]:
+    return {"calls": 0, "prompt_tokens": 0, "completion_tokens": 0, "cost_usd": 0.0, "latency_ms": 0.0}
+
+def _usage_table(label: str, buckets: Dict[str, Dict[str, Any]]) -> str:
+    """HTML table of usage buckets, most expensive first"""
+    rows = "".join(
+        f"<tr><td>{html.escape(name)}</td><td>{bucket['calls']}</td><td>{bucket['prompt_tokens']:,}</td>"
+        f"<td>{bucket['completion_tokens']:,}</td><td>{bucket['cost_usd']:.4f}</td>"
+        f"<td>{bucket['latency_ms'] / max(bucket['calls'], 1):.0f}</td></tr>"
+        for name, bucket in sorted(buckets.items(), key=lambda item: item[1]["cost_usd"], reverse=True)
+    )
+    return (f"<h3>By {label}</h3><table><tr><th>{label}</th><th>Calls</th><th>Prompt</th><th>Completion</th>"
+            f"<th>Cost (USD)</th><th>Avg Latency (ms)</th></tr>{rows}</table>")
 
 class CampaignPilotLogger:
     """
@@ -70,7 +91,19 @@ class CampaignPilotLogger:
             "campaigns_paused": 0,
             "campaigns_resumed": 0,
             "total_budget_allocated": 0.0,
-            "performance_metrics": {}
+            "performance_metrics": {},
+            "llm_usage": {
+                **_usage_bucket(),
+                "failed_calls": 0,
+                "estimated_calls": 0,
+                "by_agent": {},
+                "by_task": {},
+                "by_model": {}
+            },
+            "tool_output_tokens": {
+                "total": 0,
+                "by_tool": {}
+            }
         }
         
         # Set up file logging
@@ -217,6 +250,82 @@ class CampaignPilotLogger:
             status = "SUCCESS" if success else "FAILED"
             self.logger.info(f"[API] {tool_name} -> {endpoint} ({status}) - {duration_ms:.2f}ms")
     
+    def log_llm_call(self, agent: str, task: str, model: str, prompt_tokens: int, completion_tokens: int,
+                     latency_ms: float, cost_usd: float, success: bool = True, estimated: bool = False):
+        """
+        Log one LLM call and add it to the per-agent, per-task and per-model usage totals
+        
+        Args:
+            agent: Role of the agent that made the call
+            task: Name of the task being worked on
+            model: Model name
+            prompt_tokens: Prompt (input) tokens
+            completion_tokens: Completion (output) tokens
+            latency_ms: Call latency in milliseconds
+            cost_usd: Call cost in USD
+            success: Whether the call succeeded
+            estimated: Whether token counts were estimated because the provider didn't report usage
+        """
+        with self._lock:
+            call_data = {
+                "task": task,
+                "model": model,
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "cost_usd": round(cost_usd, 6),
+                "success": success,
+                "estimated": estimated
+            }
+            
+            entry = LogEntry(
+                timestamp=datetime.now(timezone.utc).isoformat(),
+                level=LogLevel.LLM_CALL.value,
+                agent=agent,
+                action=f"LLM Call: {model}",
+                data=call_data,
+                duration_ms=latency_ms,
+                session_id=self.session_id
+            )
+            
+            self.log_entries.append(entry)
+            
+            usage = self.session_stats["llm_usage"]
+            usage["failed_calls"] += 0 if success else 1
+            usage["estimated_calls"] += 1 if estimated else 0
+            for bucket in (usage, usage["by_agent"].setdefault(agent, _usage_bucket()),
+                           usage["by_task"].setdefault(task, _usage_bucket()),
+                           usage["by_model"].setdefault(model, _usage_bucket())):
+                bucket["calls"] += 1
+                bucket["prompt_tokens"] += prompt_tokens
+                bucket["completion_tokens"] += completion_tokens
+                bucket["cost_usd"] += cost_usd
+                bucket["latency_ms"] += latency_ms
+            
+            status = "" if success else " (FAILED)"
+            self.logger.info(f"[LLM] {agent} / {task} -> {model}{status}: {prompt_tokens}+{completion_tokens} tokens, "
+                             f"${cost_usd:.4f}, {latency_ms:.0f}ms")
+    
+    def log_tool_output(self, tool_name: str, agent: str, task: str, tokens: int, from_cache: bool = False):
+        """
+        Record how many tokens a tool result adds to the agent's context
+        
+        Args:
+            tool_name: Tool that produced the output
+            agent: Role of the agent that called the tool
+            task: Name of the task being worked on
+            tokens: Estimated tokens in the tool output
+            from_cache: Whether crewai served the result from its tool cache
+        """
+        with self._lock:
+            stats = self.session_stats["tool_output_tokens"]
+            tool = stats["by_tool"].setdefault(tool_name, {"calls": 0, "tokens": 0, "cached_calls": 0})
+            tool["calls"] += 1
+            tool["tokens"] += tokens
+            tool["cached_calls"] += 1 if from_cache else 0
+            stats["total"] += tokens
+            
+            self.logger.debug(f"[TOOL] {agent} / {task} <- {tool_name}: ~{tokens} tokens")
+    
     def log_performance_metrics(self, metrics: Dict[str, Any]):
         """
         Log performance metrics for analysis
@@ -279,11 +388,34 @@ class CampaignPilotLogger:
             "total_log_entries": len(self.log_entries),
             "avg_action_duration": self._calculate_avg_duration(),
             "agent_activity": self._get_agent_activity(),
+            "llm_cost_hotspots": self._llm_cost_hotspots(),
             "timeline": self._generate_timeline()
         }
         
         return summary
     
+    def _llm_cost_hotspots(self, limit: int = 5) -> List[Dict[str, Any]]:
+        """Most expensive (agent, task) pairs, with average LLM latency"""
+        totals: Dict[tuple, Dict[str, Any]] = {}
+        for entry in self.log_entries:
+            if entry.level != LogLevel.LLM_CALL.value:
+                continue
+            bucket = totals.setdefault((entry.agent, entry.data["task"]), _usage_bucket())
+            bucket["calls"] += 1
+            bucket["prompt_tokens"] += entry.data["prompt_tokens"]
+            bucket["completion_tokens"] += entry.data["completion_tokens"]
+            bucket["cost_usd"] += entry.data["cost_usd"]
+            bucket["latency_ms"] += entry.duration_ms or 0.0
+        
+        hotspots = [
+            {"agent": agent, "task": task, **bucket,
+             "avg_latency_ms": round(bucket["latency_ms"] / bucket["calls"], 1)}
+            for (agent, task), bucket in totals.items()
+        ]
+        hotspots.sort(key=lambda item: (item["cost_usd"], item["prompt_tokens"] + item["completion_tokens"]),
+                      reverse=True)
+        return hotspots[:limit]
+    
     def _calculate_avg_duration(self) -> float:
         """Calculate average duration of timed actions"""
         durations = [entry.duration_ms for entry in self.log_entries if entry.duration_ms]
@@ -352,7 +484,7 @@ class CampaignPilotLogger:
         
         with open(filename, 'w', newline='') as f:
             writer = csv.writer(f)
-            writer.writerow(['Timestamp', 'Level', 'Agent', 'Action', 'Data', 'Duration_MS'])
+            writer.writerow(['Timestamp', 'Level', 'Agent', 'Action', 'Data', 'Duration_MS', 'Trace_ID', 'Span_ID'])
             
             for entry in self.log_entries:
                 writer.writerow([
@@ -361,7 +493,9 @@ class CampaignPilotLogger:
                     entry.agent,
                     entry.action,
                     json.dumps(entry.data),
-                    entry.duration_ms
+                    entry.duration_ms,
+                    entry.trace_id,
+                    entry.span_id
                 ])
         
         return str(filename)
@@ -371,6 +505,7 @@ class CampaignPilotLogger:
         filename = self.log_dir / f"{self.session_id}_report_{timestamp}.html"
         
         summary = self.get_session_summary()
+        llm_usage = summary["llm_usage"]
         
         html_content = f"""
         <!DOCTYPE html>
@@ -389,6 +524,10 @@ class CampaignPilotLogger:
                 .api-call {{ border-left-color: #f39c12; }}
                 .performance {{ border-left-color: #9b59b6; }}
                 pre {{ background: #2c3e50; color: white; padding: 10px; border-radius: 5px; overflow-x: auto; }}
+                table {{ border-collapse: collapse; margin: 10px 0 20px; }}
+                th, td {{ border: 1px solid #bdc3c7; padding: 6px 12px; text-align: right; }}
+                th:first-child, td:first-child {{ text-align: left; }}
+                .llm-call {{ border-left-color: #16a085; }}
             </style>
         </head>
         <body>
@@ -415,11 +554,46 @@ class CampaignPilotLogger:
                     <h3>${summary['total_budget_allocated']:.2f}</h3>
                     <p>Total Budget</p>
                 </div>
+                <div class="stat-box">
+                    <h3>{llm_usage['prompt_tokens'] + llm_usage['completion_tokens']:,}</h3>
+                    <p>LLM Tokens ({llm_usage['calls']} calls)</p>
+                </div>
+                <div class="stat-box">
+                    <h3>${llm_usage['cost_usd']:.4f}</h3>
+                    <p>LLM Cost</p>
+                </div>
             </div>
             
             <h2>🤖 Agent Activity</h2>
             <pre>{json.dumps(summary['agent_activity'], indent=2)}</pre>
             
+            <h2>💸 LLM Usage</h2>
+            {_usage_table("Agent", llm_usage["by_agent"])}
+            {_usage_table("Task", llm_usage["by_task"])}
+            {_usage_table("Model", llm_usage["by_model"])}
+            
+            <h3>Most Expensive Steps</h3>
+            <table>
+                <tr><th>Agent</th><th>Task</th><th>Calls</th><th>Prompt</th><th>Completion</th><th>Cost (USD)</th><th>Avg Latency (ms)</th></tr>
+                {"".join(
+                    f"<tr><td>{html.escape(item['agent'])}</td><td>{html.escape(item['task'])}</td>"
+                    f"<td>{item['calls']}</td><td>{item['prompt_tokens']:,}</td><td>{item['completion_tokens']:,}</td>"
+                    f"<td>{item['cost_usd']:.4f}</td><td>{item['avg_latency_ms']:.0f}</td></tr>"
+                    for item in summary["llm_cost_hotspots"]
+                )}
+            </table>
+            
+            <h3>Tool Output Tokens ({summary['tool_output_tokens']['total']:,} total)</h3>
+            <table>
+                <tr><th>Tool</th><th>Calls</th><th>Cached</th><th>Output Tokens</th></tr>
+                {"".join(
+                    f"<tr><td>{html.escape(tool)}</td><td>{stats['calls']}</td><td>{stats['cached_calls']}</td>"
+                    f"<td>{stats['tokens']:,}</td></tr>"
+                    for tool, stats in sorted(summary["tool_output_tokens"]["by_tool"].items(),
+                                              key=lambda item: item[1]["tokens"], reverse=True)
+                )}
+            </table>
+            
             <h2>📊 Session Timeline</h2>
             <div class="timeline">
         """
@@ -459,6 +633,88 @@ class CampaignPilotLogger:
         print(f"💾 Session saved to: {session_file}")
         return str(session_file)
 
+# =============================================================================
+# CROSS-PROCESS LOGGING
+# =============================================================================
+
+class QueueLogForwarder:
+    """
+    Logger stand-in for worker processes
+
+    Every log call is put on a multiprocessing queue instead of being written
+    locally; a LogQueueListener in the parent replays it on the parent's
+    CampaignPilotLogger, so one session file and summary cover all workers.
+    """
+    
+    def __init__(self, queue):
+        self.queue = queue
+        self.session_id = f"worker_{os.getpid()}"
+    
+    def _forward(self, method: str, *args):
+        self.queue.put((method, args))
+    
+    def log_agent_action(self, agent, action, data, duration_ms=None):
+        self._forward("log_agent_action", agent, action, data, duration_ms)
+    
+    def log_decision(self, agent, decision_type, criteria, decision, rationale):
+        self._forward("log_decision", agent, decision_type, criteria, decision, rationale)
+    
+    def log_api_call(self, tool_name, endpoint, request_data, response_data, duration_ms, success=True):
+        self._forward("log_api_call", tool_name, endpoint, request_data, response_data, duration_ms, success)
+    
+    def log_llm_call(self, agent, task, model, prompt_tokens, completion_tokens, latency_ms, cost_usd,
+                     success=True, estimated=False):
+        self._forward("log_llm_call", agent, task, model, prompt_tokens, completion_tokens, latency_ms,
+                      cost_usd, success, estimated)
+    
+    def log_tool_output(self, tool_name, agent, task, tokens, from_cache=False):
+        self._forward("log_tool_output", tool_name, agent, task, tokens, from_cache)
+    
+    def log_performance_metrics(self, metrics):
+        self._forward("log_performance_metrics", metrics)
+    
+    def log_system_event(self, event, data, level=LogLevel.INFO):
+        self._forward("log_system_event", event, data, level)
+
+class LogQueueListener:
+    """Background thread in the parent that replays forwarded worker log calls"""
+    
+    FORWARDED_METHODS = {"log_agent_action", "log_decision", "log_api_call", "log_llm_call",
+                         "log_tool_output", "log_performance_metrics", "log_system_event"}
+    
+    def __init__(self, queue, logger: Optional[CampaignPilotLogger] = None):
+        self.queue = queue
+        self.logger = logger
+        self.forwarded = 0
+        self._thread: Optional[threading.Thread] = None
+    
+    def start(self):
+        self.logger = self.logger or get_logger()
+        self._thread = threading.Thread(target=self._run, name="log-queue-listener", daemon=True)
+        self._thread.start()
+    
+    def stop(self):
+        """Replay everything already queued, then stop"""
+        if self._thread:
+            self.queue.put(None)
+            self._thread.join()
+            self._thread = None
+    
+    def _run(self):
+        while True:
+            record = self.queue.get()
+            if record is None:
+                return
+            method, args = record
+            if method in self.FORWARDED_METHODS:
+                getattr(self.logger, method)(*args)
+                self.forwarded += 1
+
+def install_log_forwarder(queue):
+    """Route this process's log calls to the parent over `queue` (call in worker initializers)"""
+    global _logger_instance
+    _logger_instance = QueueLogForwarder(queue)
+
 # Global logger instance
 _logger_instance = None
 
@@ -497,6 +753,18 @@ def log_api_call(tool_name: str, endpoint: str, request_data: Dict[str, Any],
     logger = get_logger()
     logger.log_api_call(tool_name, endpoint, request_data, response_data, duration_ms, success)
 
+def log_llm_call(agent: str, task: str, model: str, prompt_tokens: int, completion_tokens: int,
+                 latency_ms: float, cost_usd: float, success: bool = True, estimated: bool = False):
+    """Convenience function for logging LLM calls"""
+    logger = get_logger()
+    logger.log_llm_call(agent, task, model, prompt_tokens, completion_tokens, latency_ms, cost_usd,
+                        success, estimated)
+
+def log_tool_output(tool_name: str, agent: str, task: str, tokens: int, from_cache: bool = False):
+    """Convenience function for recording tool output tokens"""
+    logger = get_logger()
+    logger.log_tool_output(tool_name, agent, task, tokens, from_cache)
+
 def log_performance_metrics(metrics: Dict[str, Any]):
     """Convenience function for logging performance metrics"""
     logger = get_logger()
@@ -7,13 +7,12 @@ Command-line interface for running the campaign automation system
 import os
 import sys
 import argparse
+import importlib.util
 import time
 from datetime import datetime
 from dotenv import load_dotenv
 from colorama import init, Fore, Style
 from rich.console import Console
-from rich.table import Table
-from rich.panel import Panel
 from logger import get_logger, log_system_event, LogLevel
 
 # Load environment variables
@@ -47,15 +46,13 @@ def check_prerequisites():
         console.print("   python fake_api_server.py", style="cyan")
         return False
     
-    # Check required packages
-    try:
-        import crewai
-        import langchain
-        console.print("✅ Required packages installed", style="bold green")
-    except ImportError as e:
-        console.print(f"❌ Missing required package: {e}", style="bold red")
+    # Check required packages (locate them without importing, which takes seconds)
+    missing = [name for name in ("crewai", "langchain") if importlib.util.find_spec(name) is None]
+    if missing:
+        console.print(f"❌ Missing required package: {', '.join(missing)}", style="bold red")
         console.print("   Install with: pip install -r requirements.txt", style="cyan")
         return False
+    console.print("✅ Required packages installed", style="bold green")
     
     console.print("✅ All prerequisites met!", style="bold green")
     return True
@@ -147,6 +144,7 @@ def run_analysis_management():
 def show_api_status():
     """Display current API status and available data"""
     import requests
+    from rich.table import Table
     
     console.print("\n📊 API Status and Data Overview", style="bold blue")
     
@@ -188,6 +186,30 @@ def show_api_status():
     except requests.RequestException as e:
         console.print(f"❌ Could not fetch API status: {e}", style="bold red")
 
+def run_daemon(args):
+    """Run the resident monitoring daemon until interrupted"""
+    from daemon import CampaignMonitorDaemon, DaemonConfig
+    
+    config = DaemonConfig.from_env(
+        interval_seconds=args.interval,
+        jitter=args.jitter,
+        llm_cooldown_seconds=args.llm_cooldown,
+        use_stream=not args.no_stream,
+        max_cycles=args.max_cycles
+    )
+    
+    console.print("\n🛰️  Starting Monitoring Daemon...", style="bold blue")
+    console.print(f"   Interval: {config.interval_seconds:.0f}s (±{config.jitter:.0%} jitter), "
+                  f"LLM cooldown: {config.llm_cooldown_seconds:.0f}s, "
+                  f"stream: {'on' if config.use_stream else 'off'}", style="cyan")
+    console.print("   Press Ctrl+C to stop gracefully", style="dim")
+    
+    daemon = CampaignMonitorDaemon(config)
+    daemon.install_signal_handlers()
+    daemon.run()
+    
+    console.print(f"\n✅ Daemon stopped after {daemon.cycles} cycles ({daemon.crew_runs} crew runs)", style="bold green")
+
 def reset_system():
     """Reset all campaign data"""
     import requests
@@ -204,6 +226,79 @@ def reset_system():
     except requests.RequestException as e:
         console.print(f"❌ Could not reset data: {e}", style="bold red")
 
+def execute_action(args):
+    """Run the action selected on the command line (interactive menu if none)"""
+    if args.status:
+        show_api_status()
+    elif args.reset:
+        reset_system()
+    elif args.create:
+        run_campaign_creation()
+    elif args.analyze:
+        run_analysis_management()
+    elif args.full:
+        run_full_system()
+    elif args.daemon:
+        run_daemon(args)
+    else:
+        # Interactive mode
+        console.print("\n🎛️  Interactive Mode", style="bold blue")
+        console.print("Choose an action:")
+        console.print("1. Run full campaign cycle")
+        console.print("2. Create campaigns only")
+        console.print("3. Analyze and manage campaigns")
+        console.print("4. Show API status")
+        console.print("5. Reset data")
+        console.print("6. Exit")
+        
+        while True:
+            try:
+                choice = input(f"\n{Fore.CYAN}Enter your choice (1-6): {Style.RESET_ALL}")
+                
+                if choice == '1':
+                    run_full_system()
+                    break
+                elif choice == '2':
+                    run_campaign_creation()
+                    break
+                elif choice == '3':
+                    run_analysis_management()
+                    break
+                elif choice == '4':
+                    show_api_status()
+                    break
+                elif choice == '5':
+                    reset_system()
+                    break
+                elif choice == '6':
+                    console.print("👋 Goodbye!", style="bold blue")
+                    break
+                else:
+                    console.print("❌ Invalid choice. Please enter 1-6.", style="bold red")
+                    
+            except KeyboardInterrupt:
+                console.print("\n👋 Goodbye!", style="bold blue")
+                break
+
+def save_profile(profiler):
+    """Stop the profiler, print its per-task hotspot table and save it with the session logs"""
+    from profiler import format_report
+    
+    profiler.stop()
+    logger = get_logger()
+    folded_file, report_file = profiler.save(logger.log_dir, logger.session_id)
+    report = profiler.report()
+    console.print("\n" + format_report(report), markup=False, highlight=False)
+    console.print(f"🔥 CPU profile saved: {folded_file} (collapsed stacks), {report_file}", style="bold cyan")
+    
+    log_system_event("CPU Profile Saved", {
+        "collapsed_stacks": folded_file,
+        "report": report_file,
+        "samples": report["samples"],
+        "cpu_ms_by_task": {task: stats["cpu_ms"] for task, stats in report["tasks"].items()}
+    })
+    return folded_file, report_file
+
 def main():
     """Main application entry point"""
     parser = argparse.ArgumentParser(
@@ -216,6 +311,8 @@ Examples:
   python main.py --analyze              # Only analyze and manage campaigns
   python main.py --status               # Show API status and data
   python main.py --reset                # Reset all campaign data
+  python main.py --daemon --interval 30 # Monitor continuously, run the crew on threshold breaches
+  python main.py --full --profile       # Run a cycle and save a per-task CPU profile
         """
     )
     
@@ -229,12 +326,26 @@ Examples:
                        help='Show API status and current data')
     parser.add_argument('--reset', action='store_true',
                        help='Reset all campaign data')
+    parser.add_argument('--daemon', action='store_true',
+                       help='Stay resident: run rule checks on a schedule and invoke the crew only on threshold breaches')
+    parser.add_argument('--interval', type=float,
+                       help='Daemon check interval in seconds (default: DAEMON_INTERVAL_SECONDS or 60)')
+    parser.add_argument('--jitter', type=float,
+                       help='Daemon interval jitter as a fraction of the interval (default: 0.1)')
+    parser.add_argument('--llm-cooldown', type=float,
+                       help='Minimum seconds between daemon crew runs (default: 900)')
+    parser.add_argument('--max-cycles', type=int,
+                       help='Stop the daemon after this many cycles')
+    parser.add_argument('--no-stream', action='store_true',
+                       help='Daemon polls the change feed instead of subscribing to the SSE stream')
     parser.add_argument('--skip-checks', action='store_true',
                        help='Skip prerequisite checks')
     parser.add_argument('--demo-session', type=str,
                        help='Custom session name for demo logging')
     parser.add_argument('--export-logs', choices=['json', 'csv', 'html'],
                        help='Export logs in specified format after execution')
+    parser.add_argument('--profile', action='store_true',
+                       help='Sample CPU usage during the run and save per-task hotspots with the session logs')
     
     args = parser.parse_args()
     
@@ -260,56 +371,17 @@ Examples:
         "session_id": logger.session_id
     })
     
-    # Execute requested action
-    if args.status:
-        show_api_status()
-    elif args.reset:
-        reset_system()
-    elif args.create:
-        run_campaign_creation()
-    elif args.analyze:
-        run_analysis_management()
-    elif args.full:
-        run_full_system()
-    else:
-        # Interactive mode
-        console.print("\n🎛️  Interactive Mode", style="bold blue")
-        console.print("Choose an action:")
-        console.print("1. Run full campaign cycle")
-        console.print("2. Create campaigns only")
-        console.print("3. Analyze and manage campaigns")
-        console.print("4. Show API status")
-        console.print("5. Reset data")
-        console.print("6. Exit")
-        
-        while True:
-            try:
-                choice = input(f"\n{Fore.CYAN}Enter your choice (1-6): {Style.RESET_ALL}")
-                
-                if choice == '1':
-                    run_full_system()
-                    break
-                elif choice == '2':
-                    run_campaign_creation()
-                    break
-                elif choice == '3':
-                    run_analysis_management()
-                    break
-                elif choice == '4':
-                    show_api_status()
-                    break
-                elif choice == '5':
-                    reset_system()
-                    break
-                elif choice == '6':
-                    console.print("👋 Goodbye!", style="bold blue")
-                    break
-                else:
-                    console.print("❌ Invalid choice. Please enter 1-6.", style="bold red")
-                    
-            except KeyboardInterrupt:
-                console.print("\n👋 Goodbye!", style="bold blue")
-                break
+    # Execute requested action (sampled by the CPU profiler with --profile)
+    profiler = None
+    if args.profile:
+        from profiler import SamplingProfiler
+        profiler = SamplingProfiler()
+        profiler.start()
+    try:
+        execute_action(args)
+    finally:
+        if profiler is not None:
+            save_profile(profiler)
     
     # Export logs if requested
     if args.export_logs:
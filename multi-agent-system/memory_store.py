@@ -0,0 +1,627 @@
+#!/usr/bin/env python3
+"""
+Campaign Pilot Local Memory Store
+Bounded, file-backed vector memory for the agents - no external embedding or database service
+"""
+
+import asyncio
+import atexit
+import json
+import os
+import re
+import threading
+import zlib
+from datetime import datetime, timedelta
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from logger import log_system_event
+
+def _module_relative(path: str) -> str:
+    """Resolve a relative path against this directory, like the blackboard, run checkpoints and ad-copy cache"""
+    return path if os.path.isabs(path) else str(Path(__file__).resolve().parent / path)
+
+DEFAULT_MEMORY_DIR = _module_relative(os.getenv("AGENT_MEMORY_DIR", "memory"))
+DEFAULT_EMBEDDING_DIM = int(os.getenv("AGENT_MEMORY_DIM", "384"))
+DEFAULT_MAX_RECORDS = int(os.getenv("AGENT_MEMORY_MAX_RECORDS", "5000"))
+DEFAULT_MAX_AGE_DAYS = float(os.getenv("AGENT_MEMORY_MAX_AGE_DAYS", "30"))
+
+# Product / past-campaign vectors written by create_ad_agent_embeddings.py
+DEFAULT_CATALOG_DIR = _module_relative(os.getenv("CATALOG_EMBEDDINGS_DIR", os.path.join(DEFAULT_MEMORY_DIR, "catalog")))
+DEFAULT_CATALOG_EMBEDDER = os.getenv("CATALOG_EMBEDDER", "hashing")
+
+# =============================================================================
+# LOCAL EMBEDDER
+# =============================================================================
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+class HashingEmbedder:
+    """
+    Deterministic local text embedder (signed feature hashing of words and word pairs)
+
+    Cheap enough to embed every memory write and needs no model download or API key.
+    Any callable taking a list of strings and returning one vector per string can be
+    used in its place.
+    """
+
+    def __init__(self, dim: int = DEFAULT_EMBEDDING_DIM):
+        self.dim = dim
+
+    def _features(self, text: str) -> Iterable[str]:
+        tokens = _TOKEN_PATTERN.findall(text.lower())
+        yield from tokens
+        for first, second in zip(tokens, tokens[1:]):
+            yield f"{first} {second}"
+
+    def __call__(self, texts: List[str]) -> List[np.ndarray]:
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for feature in self._features(text or ""):
+                h = zlib.crc32(feature.encode("utf-8"))
+                vectors[row, h % self.dim] += 1.0 if h & 0x80000000 else -1.0
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        np.divide(vectors, norms, out=vectors, where=norms > 0)
+        # A list of rows rather than one array: callers test the result for truthiness
+        return list(vectors)
+
+def load_embedder(spec: str = "hashing", dim: int = DEFAULT_EMBEDDING_DIM) -> Callable[[List[str]], Any]:
+    """
+    Resolve an embedder spec
+
+    Args:
+        spec: "hashing" for the built-in HashingEmbedder, or "module:attribute" naming
+              a callable (or a class instantiated without arguments) that maps a list
+              of strings to a list of vectors
+        dim: Dimension for the built-in embedder
+    """
+    if spec == "hashing":
+        return HashingEmbedder(dim)
+
+    import importlib
+
+    module_name, _, attribute = spec.partition(":")
+    if not attribute:
+        raise ValueError(f"Embedder spec must be 'hashing' or 'module:attribute', got {spec!r}")
+    target = getattr(importlib.import_module(module_name), attribute)
+    return target() if isinstance(target, type) else target
+
+# =============================================================================
+# MEMORY-MAPPED VECTOR INDEX
+# =============================================================================
+
+class MemmapVectorIndex:
+    """
+    Float32 vector matrix in a memory-mapped file plus a JSON payload sidecar
+
+    Vectors are L2-normalised on write so search is a single matrix-vector product.
+    Small indexes are searched brute force; once an index passes `ivf_threshold`
+    vectors an inverted-file (IVF) coarse quantiser is trained and only the
+    `nprobe` closest lists are scanned, keeping query latency flat as it grows.
+
+    Writes go straight into the mapped matrix; the payload sidecar is rewritten
+    once every `flush_every` writes (and on flush/close) rather than per record.
+    """
+
+    VECTORS_FILE = "vectors.f32"
+    PAYLOADS_FILE = "index.json"
+
+    def __init__(self, directory: str, dim: int, initial_capacity: int = 1024,
+                 flush_every: int = 64, ivf_threshold: int = 4096, nprobe: int = 8):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.flush_every = flush_every
+        self.ivf_threshold = ivf_threshold
+        self.nprobe = nprobe
+        self._lock = threading.RLock()
+        self._dirty = 0
+
+        self.dim = dim
+        self.capacity = initial_capacity
+        self._slot_ids: List[Optional[str]] = []
+        self._slots: Dict[str, int] = {}
+        self._payloads: Dict[str, Dict[str, Any]] = {}
+
+        payload_path = self.directory / self.PAYLOADS_FILE
+        if payload_path.exists():
+            with open(payload_path, "r", encoding="utf-8") as f:
+                saved = json.load(f)
+            self.dim = saved["dim"]
+            self.capacity = saved["capacity"]
+            self._slot_ids = saved["slot_ids"]
+            self._payloads = saved["payloads"]
+            self._slots = {item_id: slot for slot, item_id in enumerate(self._slot_ids) if item_id is not None}
+
+        self._vectors = self._open_matrix(self.capacity)
+        self._active = np.zeros(self.capacity, dtype=bool)
+        self._active[list(self._slots.values())] = True
+        self._free = [slot for slot, item_id in enumerate(self._slot_ids) if item_id is None]
+
+        # IVF state (rebuilt lazily; not persisted)
+        self._centroids: Optional[np.ndarray] = None
+        self._assignments = np.full(self.capacity, -1, dtype=np.int32)
+        self._trained_size = 0
+
+    def _open_matrix(self, capacity: int) -> np.memmap:
+        path = self.directory / self.VECTORS_FILE
+        mode = "r+" if path.exists() and path.stat().st_size == capacity * self.dim * 4 else "w+"
+        if mode == "w+" and path.exists():
+            # Resize in place, keeping existing rows
+            with open(path, "r+b") as f:
+                f.truncate(capacity * self.dim * 4)
+            mode = "r+"
+        return np.memmap(path, dtype=np.float32, mode=mode, shape=(capacity, self.dim))
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def __contains__(self, item_id: str) -> bool:
+        return item_id in self._slots
+
+    def ids(self) -> List[str]:
+        with self._lock:
+            return list(self._slots)
+
+    def payload(self, item_id: str) -> Optional[Dict[str, Any]]:
+        return self._payloads.get(item_id)
+
+    def payloads(self) -> Dict[str, Dict[str, Any]]:
+        """Snapshot of id -> payload for all stored items"""
+        with self._lock:
+            return dict(self._payloads)
+
+    def vector(self, item_id: str) -> Optional[np.ndarray]:
+        slot = self._slots.get(item_id)
+        return None if slot is None else np.array(self._vectors[slot])
+
+    # -------------------------------------------------------------------------
+    # Writes
+    # -------------------------------------------------------------------------
+
+    def _grow(self, needed: int):
+        capacity = self.capacity
+        while capacity < needed:
+            capacity *= 2
+        self._vectors.flush()
+        del self._vectors
+        self._vectors = self._open_matrix(capacity)
+        self._active = np.concatenate([self._active, np.zeros(capacity - self.capacity, dtype=bool)])
+        self._assignments = np.concatenate([self._assignments, np.full(capacity - self.capacity, -1, dtype=np.int32)])
+        self.capacity = capacity
+
+    def upsert(self, ids: List[str], vectors: np.ndarray, payloads: List[Dict[str, Any]]):
+        """Insert or replace a batch of vectors with their payloads"""
+        vectors = np.asarray(vectors, dtype=np.float32).reshape(len(ids), -1)
+        if vectors.shape[1] != self.dim:
+            raise ValueError(f"Expected {self.dim}-dimensional vectors, got {vectors.shape[1]}")
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        vectors = np.divide(vectors, norms, out=np.zeros_like(vectors), where=norms > 0)
+
+        with self._lock:
+            new_count = sum(1 for item_id in set(ids) if item_id not in self._slots)
+            needed = len(self._slot_ids) - len(self._free) + new_count
+            if needed > self.capacity:
+                self._grow(needed)
+
+            slots = []
+            for item_id, payload in zip(ids, payloads):
+                slot = self._slots.get(item_id)
+                if slot is None:
+                    if self._free:
+                        slot = self._free.pop()
+                    else:
+                        slot = len(self._slot_ids)
+                        self._slot_ids.append(None)
+                    self._slot_ids[slot] = item_id
+                    self._slots[item_id] = slot
+                self._payloads[item_id] = payload
+                slots.append(slot)
+
+            # One vectorised write into the mapped matrix for the whole batch
+            self._vectors[slots] = vectors
+            self._active[slots] = True
+            if self._centroids is not None:
+                self._assignments[slots] = np.argmax(vectors @ self._centroids.T, axis=1)
+
+            self._mark_dirty(len(ids))
+
+    def update_payload(self, item_id: str, payload: Dict[str, Any]):
+        """Replace the payload of an existing item without touching its vector"""
+        with self._lock:
+            if item_id in self._slots:
+                self._payloads[item_id] = payload
+                self._mark_dirty(1)
+
+    def remove(self, ids: Iterable[str]) -> int:
+        """Remove items by id, returning how many existed"""
+        removed = 0
+        with self._lock:
+            for item_id in ids:
+                slot = self._slots.pop(item_id, None)
+                if slot is None:
+                    continue
+                self._payloads.pop(item_id, None)
+                self._slot_ids[slot] = None
+                self._active[slot] = False
+                self._assignments[slot] = -1
+                self._free.append(slot)
+                removed += 1
+            if removed:
+                self._mark_dirty(removed)
+        return removed
+
+    def clear(self):
+        with self._lock:
+            self._slot_ids = []
+            self._slots = {}
+            self._payloads = {}
+            self._free = []
+            self._active[:] = False
+            self._centroids = None
+            self._assignments[:] = -1
+            self._trained_size = 0
+            self.flush()
+
+    def _mark_dirty(self, count: int):
+        self._dirty += count
+        if self._dirty >= self.flush_every:
+            self.flush()
+
+    def flush(self):
+        """Persist the mapped vectors and the payload sidecar (atomic rename)"""
+        with self._lock:
+            self._vectors.flush()
+            path = self.directory / self.PAYLOADS_FILE
+            tmp_path = path.with_suffix(".tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({
+                    "dim": self.dim,
+                    "capacity": self.capacity,
+                    "slot_ids": self._slot_ids,
+                    "payloads": self._payloads
+                }, f, separators=(",", ":"), default=str)
+            os.replace(tmp_path, path)
+            self._dirty = 0
+
+    # -------------------------------------------------------------------------
+    # Search
+    # -------------------------------------------------------------------------
+
+    def _train_ivf(self):
+        """k-means over a sample of the stored vectors to build the coarse quantiser"""
+        active_slots = np.flatnonzero(self._active)
+        nlist = max(1, int(np.sqrt(len(active_slots))))
+        rng = np.random.default_rng(0)
+        sample = np.array(self._vectors[rng.choice(active_slots, size=min(len(active_slots), nlist * 32), replace=False)])
+        centroids = sample[rng.choice(len(sample), size=nlist, replace=False)]
+
+        for _ in range(8):
+            labels = np.argmax(sample @ centroids.T, axis=1)
+            for c in range(nlist):
+                members = sample[labels == c]
+                if len(members):
+                    centroid = members.mean(axis=0)
+                    norm = np.linalg.norm(centroid)
+                    centroids[c] = centroid / norm if norm > 0 else centroid
+
+        self._centroids = centroids
+        self._assignments[:] = -1
+        for start in range(0, len(active_slots), 8192):
+            chunk = active_slots[start:start + 8192]
+            self._assignments[chunk] = np.argmax(self._vectors[chunk] @ centroids.T, axis=1)
+        self._trained_size = len(active_slots)
+
+    def _candidate_slots(self, query: np.ndarray) -> np.ndarray:
+        count = len(self._slots)
+        if count < self.ivf_threshold:
+            self._centroids = None
+            return np.flatnonzero(self._active[:len(self._slot_ids)])
+
+        if self._centroids is None or count > 2 * self._trained_size:
+            self._train_ivf()
+        probes = np.argsort(self._centroids @ query)[::-1][:self.nprobe]
+        return np.flatnonzero(np.isin(self._assignments[:len(self._slot_ids)], probes))
+
+    def search(self, query: np.ndarray, k: int = 10,
+               predicate: Optional[Callable[[Dict[str, Any]], bool]] = None) -> List[Tuple[str, float]]:
+        """
+        Find the k most similar items (cosine similarity)
+
+        Args:
+            query: Query vector
+            k: Number of results
+            predicate: Optional filter over payloads; scanning continues past rejected items
+
+        Returns:
+            List of (id, similarity) tuples, most similar first
+        """
+        query = np.asarray(query, dtype=np.float32).reshape(-1)
+        if query.shape[0] != self.dim:
+            raise ValueError(f"Expected a {self.dim}-dimensional query, got {query.shape[0]}")
+        norm = np.linalg.norm(query)
+        if norm == 0:
+            return []
+        query = query / norm
+
+        with self._lock:
+            slots = self._candidate_slots(query)
+            if len(slots) == 0:
+                return []
+            scores = self._vectors[slots] @ query
+            order = np.argsort(scores)[::-1]
+
+            results = []
+            for position in order:
+                item_id = self._slot_ids[slots[position]]
+                if predicate is not None and not predicate(self._payloads[item_id]):
+                    continue
+                results.append((item_id, float(scores[position])))
+                if len(results) >= k:
+                    break
+            return results
+
+# =============================================================================
+# CREWAI MEMORY STORAGE BACKEND
+# =============================================================================
+
+def _in_scope(scope: str, scope_prefix: Optional[str]) -> bool:
+    if scope_prefix is None or not scope_prefix.strip("/"):
+        return True
+    return scope.startswith(scope_prefix.rstrip("/"))
+
+def _matches(payload: Dict[str, Any], scope_prefix: Optional[str] = None,
+             categories: Optional[List[str]] = None,
+             metadata_filter: Optional[Dict[str, Any]] = None) -> bool:
+    if not _in_scope(payload.get("scope", "/"), scope_prefix):
+        return False
+    if categories and not any(c in payload.get("categories", []) for c in categories):
+        return False
+    if metadata_filter:
+        metadata = payload.get("metadata") or {}
+        if not all(metadata.get(key) == value for key, value in metadata_filter.items()):
+            return False
+    return True
+
+class LocalMemoryStorage:
+    """
+    crewai memory StorageBackend on top of MemmapVectorIndex
+
+    The store is bounded: records older than `max_age_days` are dropped, and once
+    `max_records` is reached the records with the lowest retention score
+    (importance decayed by time since last access) are evicted to make room.
+    """
+
+    def __init__(self, directory: str = DEFAULT_MEMORY_DIR, max_records: int = DEFAULT_MAX_RECORDS,
+                 max_age_days: Optional[float] = DEFAULT_MAX_AGE_DAYS, half_life_days: float = 7.0,
+                 dim: int = DEFAULT_EMBEDDING_DIM, flush_every: int = 32):
+        self.max_records = max_records
+        self.max_age_days = max_age_days
+        self.half_life_days = half_life_days
+        self.index = MemmapVectorIndex(directory, dim=dim, initial_capacity=min(max_records, 1024),
+                                       flush_every=flush_every)
+        self.evicted = 0
+        atexit.register(self.index.flush)
+
+    # -------------------------------------------------------------------------
+    # Record conversion & retention
+    # -------------------------------------------------------------------------
+
+    @staticmethod
+    def _to_payload(record) -> Dict[str, Any]:
+        return record.model_dump(mode="json", exclude={"embedding"})
+
+    @staticmethod
+    def _to_record(payload: Dict[str, Any]):
+        from crewai.memory.types import MemoryRecord
+        return MemoryRecord.model_validate(payload)
+
+    def _check_dim(self, vector: List[float]):
+        if len(vector) != self.index.dim:
+            from crewai.memory.storage.backend import EmbeddingDimensionMismatchError
+            raise EmbeddingDimensionMismatchError(self.index.dim, len(vector))
+
+    def _retention_score(self, payload: Dict[str, Any], now: datetime) -> float:
+        last_accessed = datetime.fromisoformat(payload.get("last_accessed") or payload["created_at"])
+        age_days = max(0.0, (now - last_accessed).total_seconds() / 86400)
+        return payload.get("importance", 0.5) * 0.5 ** (age_days / self.half_life_days)
+
+    def evict(self, incoming: int = 0) -> int:
+        """Drop expired records, then the least valuable ones until `incoming` new records fit"""
+        now = datetime.utcnow()
+        payloads = self.index.payloads()
+        expired = []
+        if self.max_age_days is not None:
+            cutoff = (now - timedelta(days=self.max_age_days)).isoformat()
+            expired = [item_id for item_id, payload in payloads.items() if payload["created_at"] < cutoff]
+
+        overflow = len(payloads) - len(expired) + incoming - self.max_records
+        victims = []
+        if overflow > 0:
+            expired_ids = set(expired)
+            survivors = [(self._retention_score(payload, now), item_id)
+                         for item_id, payload in payloads.items() if item_id not in expired_ids]
+            survivors.sort()
+            victims = [item_id for _, item_id in survivors[:overflow]]
+
+        removed = self.index.remove(expired + victims)
+        if removed:
+            self.evicted += removed
+            log_system_event("Agent Memory Evicted", {
+                "expired": len(expired),
+                "low_retention": len(victims),
+                "remaining": len(self.index)
+            })
+        return removed
+
+    # -------------------------------------------------------------------------
+    # StorageBackend protocol
+    # -------------------------------------------------------------------------
+
+    def save(self, records) -> None:
+        records = [record for record in records if record.embedding]
+        if not records:
+            return
+        for record in records:
+            self._check_dim(record.embedding)
+        new_records = sum(1 for record in records if record.id not in self.index)
+        if len(self.index) + new_records > self.max_records:
+            self.evict(incoming=new_records)
+
+        self.index.upsert(
+            [record.id for record in records],
+            np.array([record.embedding for record in records], dtype=np.float32),
+            [self._to_payload(record) for record in records]
+        )
+
+    def search(self, query_embedding: List[float], scope_prefix: Optional[str] = None,
+               categories: Optional[List[str]] = None, metadata_filter: Optional[Dict[str, Any]] = None,
+               limit: int = 10, min_score: float = 0.0):
+        if len(self.index) == 0:
+            return []
+        self._check_dim(query_embedding)
+        predicate = None
+        if (scope_prefix and scope_prefix.strip("/")) or categories or metadata_filter:
+            predicate = lambda payload: _matches(payload, scope_prefix, categories, metadata_filter)
+
+        results = []
+        for item_id, score in self.index.search(np.asarray(query_embedding), k=limit, predicate=predicate):
+            score = max(0.0, score)
+            if score < min_score:
+                break
+            results.append((self._to_record(self.index.payload(item_id)), score))
+        return results
+
+    def delete(self, scope_prefix: Optional[str] = None, categories: Optional[List[str]] = None,
+               record_ids: Optional[List[str]] = None, older_than: Optional[datetime] = None,
+               metadata_filter: Optional[Dict[str, Any]] = None) -> int:
+        if record_ids and not (categories or metadata_filter):
+            return self.index.remove(record_ids)
+
+        cutoff = older_than.isoformat() if older_than else None
+        doomed = [
+            item_id for item_id, payload in self.index.payloads().items()
+            if _matches(payload, scope_prefix, categories, metadata_filter)
+            and (record_ids is None or item_id in record_ids)
+            and (cutoff is None or payload["created_at"] < cutoff)
+        ]
+        return self.index.remove(doomed)
+
+    def update(self, record) -> None:
+        if record.embedding:
+            self.save([record])
+        else:
+            self.index.update_payload(record.id, self._to_payload(record))
+
+    def get_record(self, record_id: str):
+        payload = self.index.payload(record_id)
+        return None if payload is None else self._to_record(payload)
+
+    def list_records(self, scope_prefix: Optional[str] = None, limit: int = 200, offset: int = 0):
+        payloads = [p for p in self.index.payloads().values() if _in_scope(p.get("scope", "/"), scope_prefix)]
+        payloads.sort(key=lambda p: p["created_at"], reverse=True)
+        return [self._to_record(p) for p in payloads[offset:offset + limit]]
+
+    def get_scope_info(self, scope: str):
+        from crewai.memory.types import ScopeInfo
+
+        scope = scope.rstrip("/") or "/"
+        prefix = scope if scope != "/" else ""
+        if prefix and not prefix.startswith("/"):
+            prefix = "/" + prefix
+        payloads = [p for p in self.index.payloads().values() if _in_scope(p.get("scope", "/"), prefix or None)]
+
+        child_prefix = (prefix + "/") if prefix else "/"
+        children, categories = set(), set()
+        for payload in payloads:
+            item_scope = payload.get("scope", "/")
+            if item_scope.startswith(child_prefix):
+                first_component = item_scope[len(child_prefix):].split("/", 1)[0]
+                if first_component:
+                    children.add(child_prefix + first_component)
+            categories.update(payload.get("categories", []))
+
+        created = sorted(p["created_at"] for p in payloads)
+        return ScopeInfo(
+            path=scope,
+            record_count=len(payloads),
+            categories=sorted(categories),
+            oldest_record=datetime.fromisoformat(created[0]) if created else None,
+            newest_record=datetime.fromisoformat(created[-1]) if created else None,
+            child_scopes=sorted(children)
+        )
+
+    def list_scopes(self, parent: str = "/") -> List[str]:
+        parent = parent.rstrip("/")
+        prefix = parent + "/"
+        children = set()
+        for payload in self.index.payloads().values():
+            item_scope = payload.get("scope", "/")
+            if item_scope.startswith(prefix) and item_scope != (parent or "/"):
+                first_component = item_scope[len(prefix):].split("/", 1)[0]
+                if first_component:
+                    children.add(prefix + first_component)
+        return sorted(children)
+
+    def list_categories(self, scope_prefix: Optional[str] = None) -> Dict[str, int]:
+        counts: Dict[str, int] = {}
+        for payload in self.index.payloads().values():
+            if _in_scope(payload.get("scope", "/"), scope_prefix):
+                for category in payload.get("categories", []):
+                    counts[category] = counts.get(category, 0) + 1
+        return counts
+
+    def count(self, scope_prefix: Optional[str] = None) -> int:
+        if scope_prefix is None or not scope_prefix.strip("/"):
+            return len(self.index)
+        return sum(1 for p in self.index.payloads().values() if _in_scope(p.get("scope", "/"), scope_prefix))
+
+    def reset(self, scope_prefix: Optional[str] = None) -> None:
+        if scope_prefix is None or not scope_prefix.strip("/"):
+            self.index.clear()
+        else:
+            self.delete(scope_prefix=scope_prefix)
+
+    def flush(self) -> None:
+        self.index.flush()
+
+    async def asave(self, records) -> None:
+        await asyncio.to_thread(self.save, records)
+
+    async def asearch(self, query_embedding: List[float], scope_prefix: Optional[str] = None,
+                      categories: Optional[List[str]] = None, metadata_filter: Optional[Dict[str, Any]] = None,
+                      limit: int = 10, min_score: float = 0.0):
+        return await asyncio.to_thread(self.search, query_embedding, scope_prefix, categories,
+                                       metadata_filter, limit, min_score)
+
+    async def adelete(self, scope_prefix: Optional[str] = None, categories: Optional[List[str]] = None,
+                      record_ids: Optional[List[str]] = None, older_than: Optional[datetime] = None,
+                      metadata_filter: Optional[Dict[str, Any]] = None) -> int:
+        return await asyncio.to_thread(self.delete, scope_prefix, categories, record_ids,
+                                       older_than, metadata_filter)
+
+@lru_cache(maxsize=None)
+def get_agent_memory(tenant_id: Optional[str] = None):
+    """
+    Shared crewai Memory for all agents and crews, backed by the local store
+
+    Replaces `memory=True`, which gives every agent and crew its own default
+    store and embeds through a remote API. Each tenant other than the default
+    gets its own store under tenants/<tenant_id>, so stores never see each
+    other's memories.
+    """
+    from crewai.memory.unified_memory import Memory
+
+    directory = DEFAULT_MEMORY_DIR if tenant_id is None else os.path.join(DEFAULT_MEMORY_DIR, "tenants", tenant_id)
+    storage = LocalMemoryStorage(directory)
+    log_system_event("Agent Memory Opened", {
+        "tenant_id": tenant_id,
+        "directory": str(storage.index.directory),
+        "records": len(storage.index),
+        "max_records": storage.max_records,
+        "dim": storage.index.dim
+    })
+    return Memory(storage=storage, embedder=HashingEmbedder(storage.index.dim),
+                  root_scope="/crew/campaign-pilot")
@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""
+Campaign Pilot Portfolio Runner
+Runs campaign cycles for many stores (tenants) concurrently with fair-share limits
+
+Every cycle runs inside its tenant's scope, so tools only reach that store's APIs
+with its credentials, caches and rate limit, and crews come from the tenant's own
+pool. At most `max_concurrent` cycles run at once in total and at most
+`max_concurrent_cycles` per tenant; free slots go to tenants round-robin, so a
+store with a long backlog can't starve the others.
+
+Cycles run on threads by default. With `executor="process"` they run in a pool of
+worker processes instead, so the Python work between LLM calls (JSON parsing,
+prompt assembly, logging) isn't serialized on one GIL. Workers receive picklable
+CycleJob specs, return CycleResult objects and send their log calls back to
+this process's logger over a queue. Each worker keeps its own tenant contexts,
+so HTTP caches are per worker in that mode. Rate limits still hold per tenant
+across all workers: each limited tenant gets one token bucket in a manager
+process, and workers reserve tokens from it through a proxy.
+
+Usage:
+    python portfolio.py --tenants tenants.json                   # one analysis cycle per store
+    python portfolio.py --tenants tenants.json --kind check --cycles 5 --max-concurrent 8
+    python portfolio.py --tenants tenants.json --kind full --executor process
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import threading
+import time
+from collections import Counter, deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from functools import partial
+from multiprocessing.managers import BaseManager
+from typing import Any, Callable, Dict, List, Optional
+
+from logger import LogQueueListener, install_log_forwarder, log_system_event, LogLevel
+from tenancy import DEFAULT_TENANTS_FILE, RateLimiter, TenantContext, load_tenants, tenant_scope
+
+PORTFOLIO_MAX_CONCURRENT = int(os.getenv("PORTFOLIO_MAX_CONCURRENT", "4"))
+PORTFOLIO_EXECUTOR = os.getenv("PORTFOLIO_EXECUTOR", "thread")
+
+CycleRunner = Callable[[TenantContext], Any]
+
+@dataclass
+class CycleJob:
+    """Picklable spec for one cycle; the tenant travels as its config dict"""
+    tenant: Dict[str, Any]
+    cycle: int
+    queued_at: float  # wall clock, comparable across processes
+    limiter: Any = None  # proxy to the tenant's shared RateLimiter (process executor)
+
+@dataclass
+class CycleResult:
+    tenant_id: str
+    cycle: int
+    status: str  # completed | failed
+    result: Any = None
+    error: Optional[str] = None
+    queued_ms: float = 0.0
+    run_ms: float = 0.0
+    worker_pid: int = 0
+
+def crew_cycle(kind: str, tenant: TenantContext) -> str:
+    """Cycle runner that kicks off a pooled crew workflow ("full", "analysis" or "creation") for a tenant"""
+    from crew import get_crew_pool
+    from run_checkpoint import kickoff_with_checkpoints
+
+    with get_crew_pool(None if tenant.is_default else tenant.tenant_id).lease(kind) as crew:
+        result = crew.run_campaign_flow() if kind == "full" else kickoff_with_checkpoints(crew)
+    return str(result)
+
+def check_cycle(tenant: TenantContext) -> Dict[str, Any]:
+    """Cycle runner without LLM calls: refresh the store's products and campaign view"""
+    from tools import fetch_campaign_changes, get_campaign_view, get_http_cache_stats, list_products
+
+    products = list_products()
+    output = fetch_campaign_changes.run()
+    try:
+        changes = json.loads(output)
+    except ValueError:
+        raise RuntimeError(output)
+    campaigns = get_campaign_view(tenant).table()
+    return {
+        "products": len(products),
+        "campaigns": changes["total_campaigns"],
+        "changed_campaigns": len(changes["changed_campaigns"]),
+        "total_spend": round(sum(campaigns.column("spend")), 2),
+        "not_modified": get_http_cache_stats(tenant)["not_modified"]
+    }
+
+# Module-level callables (and partials of them) so they pickle into worker processes
+CYCLE_RUNNERS = {
+    "full": partial(crew_cycle, "full"),
+    "analysis": partial(crew_cycle, "analysis"),
+    "creation": partial(crew_cycle, "creation"),
+    "check": check_cycle
+}
+
+# Tenants rebuilt from CycleJob specs, kept per worker process so sessions, caches and crews stay warm
+_worker_tenants: Dict[str, TenantContext] = {}
+
+class _LimiterManager(BaseManager):
+    """Serves the tenants' token buckets to worker processes"""
+
+_LimiterManager.register("RateLimiter", RateLimiter)
+
+def _resolve_tenant(spec: Any, limiter: Any = None) -> TenantContext:
+    if isinstance(spec, TenantContext):
+        return spec
+    tenant = _worker_tenants.get(spec["tenant_id"])
+    if tenant is None or tenant.to_dict() != spec:
+        tenant = _worker_tenants[spec["tenant_id"]] = TenantContext.from_dict(spec)
+    if limiter is not None:
+        tenant.limiter = limiter
+    return tenant
+
+def execute_cycle(runner: CycleRunner, job: CycleJob) -> CycleResult:
+    """Run one cycle in the tenant's scope (in a worker thread or a worker process)"""
+    tenant = _resolve_tenant(job.tenant, job.limiter)
+    start = time.perf_counter()
+    outcome = CycleResult(tenant.tenant_id, job.cycle, "completed",
+                          queued_ms=max(0.0, time.time() - job.queued_at) * 1000, worker_pid=os.getpid())
+    try:
+        with tenant_scope(tenant):
+            outcome.result = runner(tenant)
+    except Exception as e:
+        outcome.status, outcome.error = "failed", str(e)
+    outcome.run_ms = (time.perf_counter() - start) * 1000
+
+    log_system_event(f"Portfolio Cycle {outcome.status.title()}", {
+        "tenant_id": tenant.tenant_id,
+        "cycle": job.cycle,
+        "worker_pid": outcome.worker_pid,
+        "run_ms": round(outcome.run_ms, 1),
+        "queued_ms": round(outcome.queued_ms, 1),
+        "error": outcome.error
+    }, LogLevel.INFO if outcome.status == "completed" else LogLevel.ERROR)
+    return outcome
+
+class PortfolioScheduler:
+    """Dispatches per-tenant cycles onto a shared worker pool under global and per-tenant caps"""
+
+    def __init__(self, tenants: List[TenantContext], runner: CycleRunner,
+                 max_concurrent: int = PORTFOLIO_MAX_CONCURRENT, executor: str = PORTFOLIO_EXECUTOR):
+        if len({tenant.tenant_id for tenant in tenants}) != len(tenants):
+            raise ValueError("Tenant ids must be unique")
+        if executor not in ("thread", "process"):
+            raise ValueError(f"Unknown executor: {executor}")
+        self.tenants = list(tenants)
+        self.runner = runner
+        self.max_concurrent = max_concurrent
+        self.executor = executor
+        self.peak_concurrency = 0
+        self._cond = threading.Condition()
+        self._running: Counter = Counter()
+        self._limiters: Dict[str, Any] = {}
+        self._waited: Dict[str, float] = {}
+
+    def _next_tenant(self, order: deque, pending: Dict[str, deque]) -> Optional[TenantContext]:
+        """Next tenant (round-robin) with queued cycles and a free per-tenant slot"""
+        for _ in range(len(order)):
+            tenant = order[0]
+            order.rotate(-1)
+            if pending[tenant.tenant_id] and self._running[tenant.tenant_id] < tenant.max_concurrent_cycles:
+                return tenant
+        return None
+
+    def _cycle_done(self, tenant: TenantContext, cycle: int, results: List[CycleResult], future: Future):
+        try:
+            outcome = future.result()
+        except Exception as e:
+            # The worker itself failed (e.g. a process died or the result didn't pickle)
+            outcome = CycleResult(tenant.tenant_id, cycle, "failed", error=f"{type(e).__name__}: {e}")
+        with self._cond:
+            results.append(outcome)
+            self._running[tenant.tenant_id] -= 1
+            self._cond.notify()
+
+    def _open_pool(self):
+        if self.executor == "thread":
+            return ThreadPoolExecutor(self.max_concurrent, thread_name_prefix="portfolio"), None, None
+        # spawn: workers start clean instead of inheriting this process's threads and locks
+        context = multiprocessing.get_context("spawn")
+        log_queue = context.Queue()
+        listener = LogQueueListener(log_queue)
+        listener.start()
+        manager = None
+        if any(tenant.requests_per_second for tenant in self.tenants):
+            manager = _LimiterManager(ctx=context)
+            manager.start()
+            self._limiters = {tenant.tenant_id: manager.RateLimiter(tenant.requests_per_second)
+                              for tenant in self.tenants if tenant.requests_per_second}
+        pool = ProcessPoolExecutor(self.max_concurrent, mp_context=context,
+                                   initializer=install_log_forwarder, initargs=(log_queue,))
+        return pool, listener, manager
+
+    def run(self, cycles: int = 1) -> List[CycleResult]:
+        """
+        Run `cycles` cycles for every tenant and wait for all of them
+
+        Returns:
+            One CycleResult per cycle, in completion order
+        """
+        queued_at = time.time()
+        pending = {tenant.tenant_id: deque(range(1, cycles + 1)) for tenant in self.tenants}
+        order = deque(self.tenants)
+        results: List[CycleResult] = []
+
+        pool, listener, manager = self._open_pool()
+        try:
+            with pool, self._cond:
+                while any(pending.values()) or sum(self._running.values()):
+                    tenant = None
+                    if sum(self._running.values()) < self.max_concurrent:
+                        tenant = self._next_tenant(order, pending)
+                    if tenant is None:
+                        self._cond.wait()
+                        continue
+                    self._running[tenant.tenant_id] += 1
+                    self.peak_concurrency = max(self.peak_concurrency, sum(self._running.values()))
+                    cycle = pending[tenant.tenant_id].popleft()
+                    spec = tenant if self.executor == "thread" else tenant.to_dict()
+                    job = CycleJob(spec, cycle, queued_at, self._limiters.get(tenant.tenant_id))
+                    future = pool.submit(execute_cycle, self.runner, job)
+                    future.add_done_callback(partial(self._cycle_done, tenant, cycle, results))
+        finally:
+            if listener is not None:
+                listener.stop()
+            if manager is not None:
+                self._waited = {tenant_id: limiter.waited() for tenant_id, limiter in self._limiters.items()}
+                self._limiters = {}
+                manager.shutdown()
+        return results
+
+    def _rate_limited_seconds(self, tenant: TenantContext) -> float:
+        if tenant.tenant_id in self._waited:
+            return self._waited[tenant.tenant_id]  # shared limiter of the last process-executor run
+        return tenant.limiter.waited_seconds if tenant.limiter else 0.0
+
+    def summary(self, results: List[CycleResult]) -> Dict[str, Any]:
+        """Per-tenant cycle counts, timings and rate-limit waits"""
+        tenants = {}
+        for tenant in self.tenants:
+            own = [result for result in results if result.tenant_id == tenant.tenant_id]
+            tenants[tenant.tenant_id] = {
+                "completed": sum(1 for result in own if result.status == "completed"),
+                "failed": sum(1 for result in own if result.status == "failed"),
+                "avg_run_ms": round(sum(result.run_ms for result in own) / len(own), 1) if own else 0.0,
+                "rate_limited_seconds": round(self._rate_limited_seconds(tenant), 3)
+            }
+        return {"peak_concurrency": self.peak_concurrency, "tenants": tenants}
+
+def main():
+    parser = argparse.ArgumentParser(description="Run campaign cycles for a portfolio of stores")
+    parser.add_argument("--tenants", default=DEFAULT_TENANTS_FILE, help="Tenant config JSON (default: TENANTS_FILE)")
+    parser.add_argument("--kind", choices=sorted(CYCLE_RUNNERS), default="analysis")
+    parser.add_argument("--cycles", type=int, default=1, help="Cycles to run per tenant")
+    parser.add_argument("--max-concurrent", type=int, default=PORTFOLIO_MAX_CONCURRENT)
+    parser.add_argument("--executor", choices=["thread", "process"], default=PORTFOLIO_EXECUTOR)
+    parser.add_argument("--json", action="store_true", help="Print every cycle result as JSON")
+    args = parser.parse_args()
+
+    scheduler = PortfolioScheduler(load_tenants(args.tenants), CYCLE_RUNNERS[args.kind], args.max_concurrent,
+                                  args.executor)
+    start = time.perf_counter()
+    results = scheduler.run(args.cycles)
+    elapsed = time.perf_counter() - start
+
+    if args.json:
+        print(json.dumps([asdict(result) for result in results], indent=2, default=str))
+    summary = scheduler.summary(results)
+    print(f"⏱️  {len(results)} cycles across {len(scheduler.tenants)} stores in {elapsed:.2f}s "
+          f"({args.executor} executor, peak concurrency {summary['peak_concurrency']})")
+    for tenant_id, stats in summary["tenants"].items():
+        print(f"  {tenant_id}: {stats['completed']} ok, {stats['failed']} failed, "
+              f"avg {stats['avg_run_ms']} ms, rate-limited {stats['rate_limited_seconds']}s")
+
+if __name__ == "__main__":
+    main()
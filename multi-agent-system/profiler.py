@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+Campaign Pilot Sampling Profiler
+Where CPU time goes inside a crew run, per task, without external tools
+
+A background thread samples every other thread's Python stack at a fixed
+interval and weights each sample by the CPU time that thread used since the
+previous sample, so threads blocked on the network or an LLM call don't count.
+Samples are attributed to the crewai task found on the stack and classified
+(logger serialization, prompt building, JSON handling, HTTP, ...).
+
+Results are saved next to the session logs as collapsed stacks (for
+flamegraph.pl or speedscope) and a per-task hotspot table (JSON).
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+PROFILE_INTERVAL_MS = float(os.getenv("PROFILE_INTERVAL_MS", "5"))
+PROFILE_TOP_N = int(os.getenv("PROFILE_TOP_N", "10"))
+MAX_STACK_DEPTH = 128
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+_STDLIB_JSON = os.path.dirname(json.__file__)
+
+def _is_logger(path: str, function: str) -> bool:
+    return path == os.path.join(_HERE, "logger.py")
+
+def _is_prompt_building(path: str, function: str) -> bool:
+    return ("crewai" in path and ("prompt" in path or "i18n" in path)) or "prompt" in function.lower() \
+        or function.startswith("interpolate") or function.startswith("format_message")
+
+def _is_json(path: str, function: str) -> bool:
+    return path.startswith(_STDLIB_JSON)
+
+def _is_http(path: str, function: str) -> bool:
+    return any(part in path for part in ("requests", "urllib3", "http/client", "ssl.py", "socket.py"))
+
+def _is_llm_client(path: str, function: str) -> bool:
+    return any(part in path for part in ("litellm", "openai", "httpx", "google/genai"))
+
+def _is_instrumentation(path: str, function: str) -> bool:
+    return path in (os.path.join(_HERE, "tracing.py"), os.path.join(_HERE, "usage_tracker.py"))
+
+# First category with a matching frame anywhere in the stack wins, so json.dumps
+# called by the logger counts as logger serialization, not plain JSON handling
+CATEGORIES = [
+    ("logger serialization", _is_logger),
+    ("prompt building", _is_prompt_building),
+    ("json", _is_json),
+    ("http", _is_http),
+    ("llm client", _is_llm_client),
+    ("instrumentation", _is_instrumentation),
+]
+
+def _thread_cpu_ns(ident: int) -> Optional[int]:
+    """CPU time a thread has used so far (None where per-thread clocks aren't available)"""
+    try:
+        return time.clock_gettime_ns(time.pthread_getcpuclockid(ident))
+    except (AttributeError, OSError):
+        return None
+
+def _frame_label(code) -> str:
+    module = os.path.splitext(os.path.basename(code.co_filename))[0]
+    if module == "__init__":
+        module = os.path.basename(os.path.dirname(code.co_filename))
+    return f"{module}.{getattr(code, 'co_qualname', code.co_name)}"
+
+class SamplingProfiler:
+    """
+    Low-overhead statistical CPU profiler for the threads of this process
+
+    Usage:
+        with SamplingProfiler() as profiler:
+            crew.kickoff()
+        profiler.save(log_dir, session_id)
+    """
+
+    def __init__(self, interval_ms: float = PROFILE_INTERVAL_MS):
+        self.interval = interval_ms / 1000
+        # (task, code objects root -> leaf) -> weight in microseconds
+        self.samples: Counter = Counter()
+        self.sample_count = 0
+        self.cpu_clock = _thread_cpu_ns(threading.get_ident()) is not None
+        self.started_at: Optional[float] = None
+        self.elapsed = 0.0
+        self._last_cpu: Dict[int, int] = {}
+        self._task_frames: Dict[Any, str] = {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def __enter__(self) -> "SamplingProfiler":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def start(self):
+        self.started_at = time.perf_counter()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.elapsed += time.perf_counter() - self.started_at
+        self._task_frames.clear()
+
+    def _run(self):
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            self._sample(own)
+
+    def _sample(self, own: int):
+        task_frames = {}
+        for ident, frame in sys._current_frames().items():
+            if ident == own:
+                continue
+            if self.cpu_clock:
+                cpu = _thread_cpu_ns(ident)
+                if cpu is None:
+                    continue
+                weight = (cpu - self._last_cpu.get(ident, cpu)) // 1000
+                self._last_cpu[ident] = cpu
+                if weight <= 0:
+                    continue  # blocked or idle since the last sample
+            else:
+                weight = int(self.interval * 1_000_000)  # wall-clock fallback
+
+            stack = []
+            task = None
+            while frame is not None and len(stack) < MAX_STACK_DEPTH:
+                code = frame.f_code
+                stack.append(code)
+                if task is None and code.co_name == "_execute_core" and "crewai" in code.co_filename:
+                    task = self._task_name(frame, task_frames)
+                frame = frame.f_back
+            if task is None:
+                on_event_bus = any(code.co_filename.endswith(os.path.join("events", "event_bus.py")) for code in stack)
+                task = "(event handlers)" if on_event_bus else "(outside tasks)"
+            self.samples[(task, tuple(stack[::-1]))] += weight
+        self.sample_count += 1
+        self._task_frames = task_frames
+
+    def _task_name(self, frame, task_frames: Dict[Any, str]) -> str:
+        # Reading another thread's f_locals is comparatively slow, so do it once per task frame
+        name = self._task_frames.get(frame)
+        if name is None:
+            task = frame.f_locals.get("self")
+            name = getattr(task, "name", None) or (getattr(task, "description", "") or "task")[:40]
+        task_frames[frame] = name
+        return name
+
+    def collapsed_stacks(self) -> List[str]:
+        """Brendan Gregg's folded format: 'task;outer;...;leaf <microseconds>' per unique stack"""
+        folded: Counter = Counter()
+        for (task, stack), weight in self.samples.items():
+            folded[";".join([task] + [_frame_label(code) for code in stack])] += weight
+        return [f"{line} {weight}" for line, weight in folded.most_common()]
+
+    def report(self, top_n: int = PROFILE_TOP_N) -> Dict[str, Any]:
+        """Per-task CPU totals, time per category and the top-N functions by self time"""
+        tasks: Dict[str, Dict[str, Any]] = defaultdict(lambda: {"total": 0, "categories": Counter(),
+                                                                "self": Counter(), "inclusive": Counter()})
+        for (task, stack), weight in self.samples.items():
+            stats = tasks[task]
+            stats["total"] += weight
+            stats["categories"][_categorize(stack)] += weight
+            stats["self"][_frame_label(stack[-1])] += weight
+            for label in {_frame_label(code) for code in stack}:
+                stats["inclusive"][label] += weight
+
+        def ms(us: int) -> float:
+            return round(us / 1000, 2)
+
+        return {
+            "clock": "thread cpu" if self.cpu_clock else "wall",
+            "interval_ms": self.interval * 1000,
+            "samples": self.sample_count,
+            "elapsed_seconds": round(self.elapsed, 3),
+            "tasks": {
+                task: {
+                    "cpu_ms": ms(stats["total"]),
+                    "categories": {name: ms(us) for name, us in stats["categories"].most_common()},
+                    "hotspots": [{
+                        "function": label,
+                        "self_ms": ms(us),
+                        "inclusive_ms": ms(stats["inclusive"][label]),
+                        "self_pct": round(100 * us / stats["total"], 1)
+                    } for label, us in stats["self"].most_common(top_n)]
+                }
+                for task, stats in sorted(tasks.items(), key=lambda item: item[1]["total"], reverse=True)
+            }
+        }
+
+    def save(self, log_dir: str, session_id: str, top_n: int = PROFILE_TOP_N) -> Tuple[str, str]:
+        """Write the collapsed stacks and the hotspot report; returns both paths"""
+        directory = Path(log_dir)
+        directory.mkdir(parents=True, exist_ok=True)
+        timestamp = time.strftime("%Y%m%d_%H%M%S")
+        folded_file = directory / f"{session_id}_profile_{timestamp}.folded"
+        report_file = directory / f"{session_id}_profile_{timestamp}.json"
+        with open(folded_file, "w", encoding="utf-8") as f:
+            f.write("\n".join(self.collapsed_stacks()) + "\n")
+        with open(report_file, "w", encoding="utf-8") as f:
+            json.dump(self.report(top_n), f, indent=2)
+        return str(folded_file), str(report_file)
+
+def _categorize(stack: Tuple[Any, ...]) -> str:
+    frames = [(code.co_filename, code.co_name) for code in stack]
+    for name, matches in CATEGORIES:
+        if any(matches(path, function) for path, function in frames):
+            return name
+    return "other"
+
+def format_report(report: Dict[str, Any], top_n: int = PROFILE_TOP_N) -> str:
+    """Plain-text hotspot table per task"""
+    lines = [f"CPU profile ({report['clock']} clock, {report['samples']} samples every "
+             f"{report['interval_ms']:g}ms over {report['elapsed_seconds']}s)"]
+    for task, stats in report["tasks"].items():
+        lines.append("")
+        lines.append(f"{task}: {stats['cpu_ms']:.1f} ms CPU")
+        lines.append("  " + ", ".join(f"{name} {value:.1f}ms" for name, value in stats["categories"].items()))
+        lines.append(f"  {'self ms':>9} {'self %':>7} {'incl ms':>9}  function")
+        for hotspot in stats["hotspots"][:top_n]:
+            lines.append(f"  {hotspot['self_ms']:>9.1f} {hotspot['self_pct']:>6.1f}% "
+                         f"{hotspot['inclusive_ms']:>9.1f}  {hotspot['function']}")
+    return "\n".join(lines)
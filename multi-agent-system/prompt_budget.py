@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Campaign Pilot Prompt Budget
+Keeps list-returning tool outputs within a token budget, with paging for the rest
+
+Every tool result is appended to the agent's prompt and re-sent on each later
+LLM call of the task, so one full catalog or campaign list slows every
+iteration and can overflow the context window. `fit_items` measures a tool's
+output. If it is over TOOL_OUTPUT_TOKEN_BUDGET, it returns the top-ranked items
+that fit, a summary of the whole list and a page handle. The agent passes the
+handle to the fetch_more_results tool to read the rest, one page at a time.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from collections import Counter, OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from logger import log_system_event
+from usage_tracker import estimate_tokens
+
+TOOL_OUTPUT_TOKEN_BUDGET = int(os.getenv("TOOL_OUTPUT_TOKEN_BUDGET", "2000"))
+# Long strings (descriptions, ad copy) are cut to this length in truncated pages
+PAGE_MAX_FIELD_CHARS = int(os.getenv("PAGE_MAX_FIELD_CHARS", "160"))
+# Result sets kept for paging per tenant (least recently used dropped first)
+MAX_PAGED_RESULTS = 32
+# Distinct values up to which a text field is summarized as value counts
+MAX_SUMMARY_CATEGORIES = 12
+# Budget reserved for the envelope around a page (counts, handle, note)
+_ENVELOPE_TOKENS = 120
+
+def _flatten(item: Dict[str, Any], prefix: str = "") -> Dict[str, Any]:
+    flat = {}
+    for key, value in item.items():
+        if isinstance(value, dict):
+            flat.update(_flatten(value, f"{prefix}{key}."))
+        else:
+            flat[f"{prefix}{key}"] = value
+    return flat
+
+def summarize_items(items: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Totals and ranges of numeric fields and value counts of low-cardinality text fields"""
+    numeric: Dict[str, List[float]] = {}
+    text: Dict[str, Counter] = {}
+    for item in items:
+        for key, value in _flatten(item).items():
+            if isinstance(value, bool) or value is None:
+                continue
+            if isinstance(value, (int, float)):
+                numeric.setdefault(key, []).append(value)
+            elif isinstance(value, str):
+                text.setdefault(key, Counter())[value] += 1
+
+    summary: Dict[str, Any] = {"count": len(items)}
+    for key, values in numeric.items():
+        if key == "id" or key.endswith("_id"):
+            continue
+        summary[key] = {"total": round(sum(values), 2), "min": min(values), "max": max(values),
+                        "avg": round(sum(values) / len(values), 2)}
+    for key, counts in text.items():
+        if 1 < len(counts) <= min(MAX_SUMMARY_CATEGORIES, len(items) // 2):
+            summary[key] = dict(counts.most_common())
+    return summary
+
+def _compact(item: Dict[str, Any], keep_full: Tuple[str, ...] = ()) -> Dict[str, Any]:
+    """Copy of an item with long strings shortened (except in the `keep_full` fields)"""
+    compact = {}
+    for key, value in item.items():
+        if key in keep_full:
+            compact[key] = value
+        elif isinstance(value, dict):
+            compact[key] = _compact(value)
+        elif isinstance(value, str) and len(value) > PAGE_MAX_FIELD_CHARS:
+            compact[key] = value[:PAGE_MAX_FIELD_CHARS] + "..."
+        else:
+            compact[key] = value
+    return compact
+
+class PagedResults:
+    """
+    Ranked result sets kept for follow-up pages, keyed by handle
+
+    Pages come from the snapshot taken when the handle was issued, so an agent
+    paging through a list sees a consistent set even if the API changes meanwhile.
+    """
+
+    def __init__(self, max_entries: int = MAX_PAGED_RESULTS):
+        self.max_entries = max_entries
+        self._results: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def put(self, tool_name: str, items: List[Dict[str, Any]], keep_full: Tuple[str, ...] = ()) -> str:
+        digest = hashlib.sha256(json.dumps(items, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+        handle = f"{tool_name}:{digest[:12]}"
+        with self._lock:
+            self._results[handle] = {"tool": tool_name, "items": items, "keep_full": keep_full}
+            self._results.move_to_end(handle)
+            while len(self._results) > self.max_entries:
+                self._results.popitem(last=False)
+        return handle
+
+    def get(self, handle: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._results.get(handle)
+            if entry is not None:
+                self._results.move_to_end(handle)
+            return entry
+
+def get_paged_results() -> PagedResults:
+    """Page store of the current tenant"""
+    from tenancy import current_tenant
+
+    return current_tenant().state.setdefault("paged_results", PagedResults())
+
+def _page(items: List[Dict[str, Any]], offset: int, budget: int,
+          keep_full: Tuple[str, ...] = ()) -> List[Dict[str, Any]]:
+    """Items from `offset` on (compacted) until the page would exceed `budget` tokens (at least one)"""
+    page: List[Dict[str, Any]] = []
+    used = 0
+    for item in items[offset:]:
+        compact = _compact(item, keep_full)
+        tokens = estimate_tokens(json.dumps(compact, separators=(",", ":"), default=str))
+        if page and used + tokens > budget:
+            break
+        page.append(compact)
+        used += tokens
+    return page
+
+def _envelope(handle: str, items: List[Dict[str, Any]], offset: int, page: List[Dict[str, Any]],
+              summary: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    next_offset = offset + len(page)
+    envelope: Dict[str, Any] = {
+        "truncated": True,
+        "total": len(items),
+        "offset": offset,
+        "returned": len(page),
+        "items": page
+    }
+    if summary is not None:
+        envelope["summary_of_all"] = summary
+    if next_offset < len(items):
+        envelope["next_page"] = {"handle": handle, "offset": next_offset}
+        envelope["note"] = ("More items than fit in the prompt budget. Call fetch_more_results with this "
+                            "handle and offset to read the next page.")
+    return envelope
+
+def fit_items(tool_name: str, items: List[Dict[str, Any]], rank_key: Optional[Callable[[Dict[str, Any]], Any]] = None,
+              keep_full: Tuple[str, ...] = (), budget: Optional[int] = None) -> str:
+    """
+    Serialize a tool's list result, truncating it to the prompt budget if needed
+
+    Args:
+        tool_name: Tool returning the list (names the page handle)
+        items: Full result list
+        rank_key: Sort key, highest first, choosing which items make the first page
+        keep_full: Fields never shortened in pages (e.g. text the agent must reuse verbatim)
+        budget: Token budget (default: TOOL_OUTPUT_TOKEN_BUDGET)
+
+    Returns:
+        The indented JSON list when it fits; otherwise a JSON envelope with the top
+        items, a summary of all items and a `next_page` handle for fetch_more_results
+    """
+    budget = budget or TOOL_OUTPUT_TOKEN_BUDGET
+    full = json.dumps(items, indent=2, default=str)
+    full_tokens = estimate_tokens(full)
+    if full_tokens <= budget:
+        return full
+
+    ranked = sorted(items, key=rank_key, reverse=True) if rank_key else list(items)
+    summary = summarize_items(items)
+    handle = get_paged_results().put(tool_name, ranked, keep_full)
+    # The summary and paging fields share the budget with the items
+    page_budget = max(budget - estimate_tokens(json.dumps(summary, default=str)) - _ENVELOPE_TOKENS, budget // 4)
+    page = _page(ranked, 0, page_budget, keep_full)
+    result = json.dumps(_envelope(handle, ranked, 0, page, summary), default=str)
+
+    log_system_event("Tool Output Truncated", {
+        "tool": tool_name,
+        "handle": handle,
+        "total_items": len(items),
+        "returned_items": len(page),
+        "full_tokens": full_tokens,
+        "returned_tokens": estimate_tokens(result),
+        "budget": budget
+    })
+    return result
+
+def next_page(handle: str, offset: int, budget: Optional[int] = None) -> str:
+    """
+    Next page of a truncated result within the prompt budget
+
+    Raises:
+        KeyError: If the handle is unknown or has expired
+    """
+    entry = get_paged_results().get(handle)
+    if entry is None:
+        raise KeyError(handle)
+    items = entry["items"]
+    offset = max(0, min(offset, len(items)))
+    page = _page(items, offset, (budget or TOOL_OUTPUT_TOKEN_BUDGET) - _ENVELOPE_TOKENS, entry["keep_full"])
+    return json.dumps(_envelope(handle, items, offset, page), default=str)
@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+"""
+Campaign Pilot Run Checkpoints
+Resumable crew runs: task outputs and tool side effects persisted per run
+
+Each completed task's output is written to a small JSON checkpoint as soon as the
+task finishes, together with every campaign the run created. Every invocation
+gets a fresh run id. If a task fails, retrying the run (by passing its run_id,
+or retry=True for the latest unfinished run of the same crew, tenant and inputs)
+skips the finished tasks, replays their cached outputs as context for the rest,
+and makes create_campaign return the campaigns it already created instead of
+creating duplicates. A run's file is deleted once it completes, and files of
+runs too old to resume are pruned when a new run starts.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+import uuid
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from logger import log_system_event, LogLevel
+from tracing import span
+
+DEFAULT_RUN_CHECKPOINT_DIR = os.getenv("RUN_CHECKPOINT_DIR", os.path.join("memory", "runs"))
+# Failed runs older than this start over instead of resuming (and their files are pruned)
+RUN_CHECKPOINT_MAX_AGE_HOURS = float(os.getenv("RUN_CHECKPOINT_MAX_AGE_HOURS", "6"))
+
+class RunCheckpoint:
+    """
+    Persistent record of one crew run: status, completed stages and created campaigns
+
+    The file is rewritten atomically after every change, so a crash leaves either
+    the previous or the new state on disk.
+    """
+
+    def __init__(self, path: str, run_id: str):
+        self.path = Path(path)
+        self.run_id = run_id
+        self._lock = threading.Lock()
+        self.data: Dict[str, Any] = {
+            "run_id": run_id,
+            "status": "running",
+            "attempts": 0,
+            "created_at": time.time(),
+            "updated_at": time.time(),
+            "stages": {},
+            "created_campaigns": []
+        }
+        if self.path.exists():
+            with open(self.path, "r", encoding="utf-8") as f:
+                self.data = json.load(f)
+
+    @property
+    def status(self) -> str:
+        return self.data["status"]
+
+    @property
+    def completed_stages(self) -> List[str]:
+        return list(self.data["stages"])
+
+    def stage(self, name: str) -> Optional[Dict[str, Any]]:
+        """Saved output of a completed stage (None if it hasn't completed)"""
+        return self.data["stages"].get(name)
+
+    def complete_stage(self, name: str, output: Any):
+        """Persist a finished task's output (a crewai TaskOutput)"""
+        with self._lock:
+            self.data["stages"][name] = {
+                "raw": getattr(output, "raw", str(output)),
+                "agent": getattr(output, "agent", ""),
+                "completed_at": time.time()
+            }
+            self._save()
+
+    def find_campaign(self, product_id: int, campaign_name: str) -> Optional[Dict[str, Any]]:
+        """Campaign this run already created for the product under that name, if any"""
+        with self._lock:
+            for entry in self.data["created_campaigns"]:
+                if entry["product_id"] == product_id and entry["campaign_name"] == campaign_name:
+                    return entry["response"]
+        return None
+
+    def record_campaign(self, product_id: int, campaign_name: str, response: Dict[str, Any]):
+        """Remember a campaign created during this run so a retry doesn't create it again"""
+        with self._lock:
+            self.data["created_campaigns"].append({
+                "product_id": product_id,
+                "campaign_name": campaign_name,
+                "campaign_id": response.get("campaign_id"),
+                "response": response
+            })
+            self._save()
+
+    def start_attempt(self):
+        with self._lock:
+            self.data["status"] = "running"
+            self.data["attempts"] += 1
+            self._save()
+
+    def finish(self, status: str, error: Optional[str] = None):
+        with self._lock:
+            self.data["status"] = status
+            self.data["error"] = error
+            self._save()
+
+    def discard(self):
+        """Delete the checkpoint file (the run completed, so there is nothing to resume)"""
+        with self._lock:
+            self.path.unlink(missing_ok=True)
+
+    def _save(self):
+        self.data["updated_at"] = time.time()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.data, f, indent=2, default=str)
+        os.replace(tmp_path, self.path)
+
+_active_run: ContextVar[Optional[RunCheckpoint]] = ContextVar("campaign_pilot_run", default=None)
+
+def active_run() -> Optional[RunCheckpoint]:
+    """Checkpoint of the crew run executing in this context (None outside kickoff_with_checkpoints)"""
+    return _active_run.get()
+
+def _checkpoint_dir() -> Path:
+    directory = Path(DEFAULT_RUN_CHECKPOINT_DIR)
+    return directory if directory.is_absolute() else Path(__file__).resolve().parent / directory
+
+def default_run_id(crew, inputs: Optional[Dict[str, Any]] = None) -> str:
+    """Key of a crew's tasks, the current tenant and the inputs (the prefix of their runs' ids)"""
+    from tenancy import current_tenant
+
+    key = json.dumps({
+        "tenant": current_tenant().tenant_id,
+        "tasks": [_stage_name(task, i) for i, task in enumerate(crew.tasks)],
+        "inputs": inputs or {}
+    }, sort_keys=True, default=str)
+    return "run_" + hashlib.sha256(key.encode("utf-8")).hexdigest()[:16]
+
+def new_run_id(crew, inputs: Optional[Dict[str, Any]] = None) -> str:
+    """Fresh id for one invocation"""
+    return f"{default_run_id(crew, inputs)}_{uuid.uuid4().hex[:8]}"
+
+def prune_expired_runs() -> int:
+    """Delete checkpoints of runs too old to resume; returns how many were deleted"""
+    cutoff = time.time() - RUN_CHECKPOINT_MAX_AGE_HOURS * 3600
+    pruned = 0
+    for path in _checkpoint_dir().glob("run_*.json"):
+        try:
+            if path.stat().st_mtime < cutoff:
+                path.unlink()
+                pruned += 1
+        except OSError:
+            continue  # removed by a concurrent run
+    return pruned
+
+def latest_unfinished_run(crew, inputs: Optional[Dict[str, Any]] = None) -> Optional[str]:
+    """Id of the newest run of the same crew, tenant and inputs if it didn't complete and can still resume"""
+    runs = sorted(_checkpoint_dir().glob(f"{default_run_id(crew, inputs)}_*.json"), key=lambda path: path.stat().st_mtime)
+    if not runs:
+        return None
+    try:
+        with open(runs[-1], "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    age_hours = (time.time() - data["updated_at"]) / 3600
+    if data["status"] == "completed" or age_hours > RUN_CHECKPOINT_MAX_AGE_HOURS:
+        return None
+    return data["run_id"]
+
+def open_run(run_id: str, resume: bool = True) -> RunCheckpoint:
+    """
+    Load a run's checkpoint, starting fresh if it finished, expired or `resume` is False
+    """
+    path = _checkpoint_dir() / f"{run_id}.json"
+    checkpoint = RunCheckpoint(str(path), run_id)
+    age_hours = (time.time() - checkpoint.data["updated_at"]) / 3600
+    if not resume or checkpoint.status == "completed" or age_hours > RUN_CHECKPOINT_MAX_AGE_HOURS:
+        if path.exists():
+            path.unlink()
+        checkpoint = RunCheckpoint(str(path), run_id)
+    return checkpoint
+
+def _stage_name(task, index: int) -> str:
+    return task.name or f"task_{index}"
+
+def kickoff_with_checkpoints(crew, inputs: Optional[Dict[str, Any]] = None,
+                             run_id: Optional[str] = None, resume: bool = True, retry: bool = False):
+    """
+    Kick off a sequential crewai Crew, checkpointing each task and resuming after failures
+
+    Args:
+        crew: The crew to run (its tasks run in order)
+        inputs: Kickoff inputs
+        run_id: Checkpoint id of a failed run to resume (default: a fresh run)
+        resume: Set False to ignore any earlier checkpoint for `run_id`
+        retry: Resume the latest unfinished run of the same crew, tenant and inputs, if any
+
+    Returns:
+        The CrewOutput of the run (skipped tasks contribute their cached output)
+    """
+    from crewai import Crew
+    from crewai.crews.crew_output import CrewOutput
+    from crewai.tasks.task_output import TaskOutput
+    from crewai.utilities.constants import NOT_SPECIFIED
+
+    inputs = inputs or {}
+    if run_id is None:
+        prune_expired_runs()
+        run_id = (latest_unfinished_run(crew, inputs) if retry else None) or new_run_id(crew, inputs)
+    checkpoint = open_run(run_id, resume)
+    tasks = list(crew.tasks)
+    names = [_stage_name(task, i) for i, task in enumerate(tasks)]
+
+    # Sequential crews only depend on earlier tasks, so resume at the first unfinished one
+    start = next((i for i, name in enumerate(names) if checkpoint.stage(name) is None), len(tasks))
+    replayed = []
+    for task, name in zip(tasks[:start], names[:start]):
+        saved = checkpoint.stage(name)
+        task.output = TaskOutput(description=task.description, name=task.name,
+                                 expected_output=task.expected_output, raw=saved["raw"], agent=saved["agent"])
+        replayed.append(task.output)
+
+    checkpoint.start_attempt()
+    if start:
+        log_system_event("Crew Run Resumed", {
+            "run_id": checkpoint.run_id,
+            "attempt": checkpoint.data["attempts"],
+            "skipped_stages": names[:start],
+            "campaigns_already_created": len(checkpoint.data["created_campaigns"])
+        })
+    if start == len(tasks):
+        checkpoint.finish("completed")
+        checkpoint.discard()
+        return CrewOutput(raw=replayed[-1].raw if replayed else "", tasks_output=replayed)
+
+    def stage_callback(name, task_callback):
+        def on_task(output):
+            checkpoint.complete_stage(name, output)
+            if task_callback:
+                return task_callback(output)
+        return on_task
+
+    remaining = tasks[start:]
+    contexts = {id(task): task.context for task in remaining}
+    # Set on the tasks themselves (crewai still calls crew.task_callback separately) and
+    # restored afterwards, so later runs of these pooled tasks don't write into this run's file
+    callbacks = {id(task): task.callback for task in remaining}
+    for task, name in zip(remaining, names[start:]):
+        task.callback = stage_callback(name, task.callback)
+    run_crew = crew
+    if start:
+        # Remaining tasks read skipped tasks' cached outputs as context, as they would in a full run
+        for index, task in enumerate(remaining, start):
+            if task.context is NOT_SPECIFIED:
+                task.context = tasks[:index]
+        run_crew = Crew(agents=crew.agents, tasks=remaining, process=crew.process, verbose=crew.verbose,
+                        memory=crew.memory, max_rpm=crew.max_rpm, step_callback=crew.step_callback,
+                        task_callback=crew.task_callback)
+
+    token = _active_run.set(checkpoint)
+    try:
+        with span(f"run: {checkpoint.run_id}", "run", run_id=checkpoint.run_id,
+                  attempt=checkpoint.data["attempts"], skipped_stages=names[:start]):
+            result = run_crew.kickoff(inputs=inputs)
+    except Exception as e:
+        checkpoint.finish("failed", str(e))
+        log_system_event("Crew Run Failed", {
+            "run_id": checkpoint.run_id,
+            "completed_stages": checkpoint.completed_stages,
+            "error": str(e)
+        }, LogLevel.ERROR)
+        raise
+    finally:
+        _active_run.reset(token)
+        for task in remaining:
+            task.context = contexts[id(task)]
+            task.callback = callbacks[id(task)]
+
+    checkpoint.finish("completed")
+    checkpoint.discard()
+    if start:
+        result.tasks_output = replayed + list(result.tasks_output)
+    return result
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Campaign Pilot Tenancy
+Per-store tool contexts so one process can run campaign cycles for many stores
+
+Each tenant carries its own API base URLs, credentials, HTTP session, ETag cache,
+request rate limit and campaign state. The tools read the active tenant from a
+context variable, so code running inside `tenant_scope(...)` (including crewai's
+tool threads, which copy the caller's context) only ever talks to that store.
+"""
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field, fields
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+import requests
+
+DEFAULT_TENANT_ID = "default"
+DEFAULT_STORE_API_BASE = "http://localhost:6000/api/store"
+DEFAULT_IMPACT_API_BASE = "http://localhost:6000/api/impact"
+DEFAULT_TENANTS_FILE = os.getenv("TENANTS_FILE", "tenants.json")
+
+class RateLimiter:
+    """
+    Token bucket shared by every request a tenant makes
+
+    `acquire` blocks until a token is available, so one busy store is slowed
+    down instead of exhausting its API quota (or starving the others). `reserve`
+    only takes the token and returns the wait, so a limiter shared across
+    processes (through a multiprocessing manager proxy) never sleeps on the
+    caller's behalf.
+    """
+
+    def __init__(self, rate: float, burst: Optional[int] = None):
+        self.rate = rate
+        self.capacity = burst if burst is not None else max(1, int(rate))
+        self.waited_seconds = 0.0
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        wait = self.reserve()
+        if wait:
+            time.sleep(wait)
+
+    def reserve(self) -> float:
+        """Take a token and return how long the caller must wait before using it"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            # A negative balance is this caller's place in line
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            self.waited_seconds += wait
+        return wait
+
+    def waited(self) -> float:
+        """Total wait handed out so far (readable through a manager proxy)"""
+        with self._lock:
+            return self.waited_seconds
+
+@dataclass
+class TenantContext:
+    """
+    Everything the tools need to talk to one store
+
+    Args:
+        tenant_id: Unique store identifier (also names its memory and cache files)
+        store_api_base: Store API base URL
+        impact_api_base: Impact.com API base URL
+        api_key: Optional credential, sent as a bearer token on every request
+        requests_per_second: Optional request rate limit for this tenant
+        max_concurrent_cycles: Campaign cycles the portfolio scheduler may run at once for this tenant
+    """
+    tenant_id: str
+    store_api_base: str = DEFAULT_STORE_API_BASE
+    impact_api_base: str = DEFAULT_IMPACT_API_BASE
+    api_key: Optional[str] = None
+    requests_per_second: Optional[float] = None
+    max_concurrent_cycles: int = 1
+
+    # Per-tenant client state, never shared across tenants
+    session: requests.Session = field(default_factory=requests.Session, init=False, repr=False)
+    etag_cache: Dict[str, Tuple[str, int, Dict[str, Any]]] = field(default_factory=dict, init=False, repr=False)
+    etag_lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+    cache_stats: Dict[str, int] = field(default_factory=lambda: {
+        "requests": 0, "not_modified": 0, "bytes_received": 0, "bytes_saved": 0
+    }, init=False, repr=False)
+    limiter: Optional[RateLimiter] = field(default=None, init=False, repr=False)
+    # Lazily created tool state (campaign view, known products, ad-copy cache, ...)
+    state: Dict[str, Any] = field(default_factory=dict, init=False, repr=False)
+
+    def __post_init__(self):
+        self.store_api_base = self.store_api_base.rstrip("/")
+        self.impact_api_base = self.impact_api_base.rstrip("/")
+        self.session.headers.update(self.auth_headers)
+        if self.requests_per_second:
+            self.limiter = RateLimiter(self.requests_per_second)
+
+    @property
+    def api_root(self) -> str:
+        """Server root for the health and reset endpoints (the store base without its last segment)"""
+        parts = urlsplit(self.store_api_base)
+        return f"{parts.scheme}://{parts.netloc}{parts.path.rsplit('/', 1)[0]}"
+
+    @property
+    def auth_headers(self) -> Dict[str, str]:
+        return {"Authorization": f"Bearer {self.api_key}"} if self.api_key else {}
+
+    @property
+    def is_default(self) -> bool:
+        return self.tenant_id == DEFAULT_TENANT_ID
+
+    def throttle(self):
+        """Wait for this tenant's rate limit (no-op when unlimited)"""
+        if self.limiter is not None:
+            wait = self.limiter.reserve()
+            if wait:
+                time.sleep(wait)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Config fields only (picklable, e.g. to rebuild the tenant in a worker process)"""
+        return {f.name: getattr(self, f.name) for f in fields(self) if f.init}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "TenantContext":
+        """Build a tenant from a config entry, expanding ${ENV} references in the API key"""
+        data = dict(data)
+        if data.get("api_key"):
+            data["api_key"] = os.path.expandvars(data["api_key"])
+        return cls(**data)
+
+_default_tenant = TenantContext(DEFAULT_TENANT_ID)
+_current_tenant: ContextVar[Optional[TenantContext]] = ContextVar("campaign_pilot_tenant", default=None)
+
+def default_tenant() -> TenantContext:
+    """The single-store tenant used outside any tenant_scope"""
+    return _default_tenant
+
+def current_tenant() -> TenantContext:
+    """The tenant the tools should act for in the current context"""
+    return _current_tenant.get() or _default_tenant
+
+@contextmanager
+def tenant_scope(tenant: TenantContext):
+    """Run the enclosed code (and any tool calls it makes) on behalf of `tenant`"""
+    token = _current_tenant.set(tenant)
+    try:
+        yield tenant
+    finally:
+        _current_tenant.reset(token)
+
+def load_tenants(path: str = DEFAULT_TENANTS_FILE) -> List[TenantContext]:
+    """
+    Load tenants from a JSON file: a list of objects with tenant_id, store_api_base,
+    impact_api_base and optionally api_key, requests_per_second and max_concurrent_cycles
+
+    Raises:
+        ValueError: If tenant ids are missing or duplicated
+    """
+    with open(Path(path), "r", encoding="utf-8") as f:
+        entries = json.load(f)
+    tenants = [TenantContext.from_dict(entry) for entry in entries]
+    ids = [tenant.tenant_id for tenant in tenants]
+    if len(set(ids)) != len(ids) or not all(ids):
+        raise ValueError(f"Tenant ids must be unique and non-empty: {ids}")
+    return tenants
@@ -7,60 +7,230 @@ Tools for interacting with Store API and Impact.com API
 import requests
 import json
 import time
-from typing import Dict, List, Any, Optional
+import threading
+from typing import Dict, List, Any, Optional, Tuple
+from urllib.parse import urlsplit
 from crewai.tools import tool
-from logger import log_api_call
+from logger import log_api_call, log_system_event, LogLevel
+from ad_copy_cache import get_ad_copy_cache
+from run_checkpoint import active_run
+from tenancy import (DEFAULT_IMPACT_API_BASE, DEFAULT_STORE_API_BASE, TenantContext,
+                     current_tenant, default_tenant)
+from tracing import server_timing_ms, span
+from prompt_budget import fit_items, next_page
+from blackboard import get_blackboard
+from data_models import CampaignTable
 
-# API Configuration
-STORE_API_BASE = "http://localhost:6000/api/store"
-IMPACT_API_BASE = "http://localhost:6000/api/impact"
+# API Configuration (the default tenant; other stores come from their TenantContext)
+STORE_API_BASE = DEFAULT_STORE_API_BASE
+IMPACT_API_BASE = DEFAULT_IMPACT_API_BASE
+
+# =============================================================================
+# CONDITIONAL HTTP CLIENT
+# =============================================================================
+
+# Every request goes through the active tenant's pooled session (which carries its
+# credentials), rate limit and revalidation cache: full URL -> (etag, body size, parsed JSON).
+# Inside a traced crew run each request is also an "http" span and carries a traceparent header.
+
+def _store_api() -> str:
+    return current_tenant().store_api_base
+
+def _impact_api() -> str:
+    return current_tenant().impact_api_base
+
+def _request(method: str, url: str, tenant: Optional[TenantContext] = None, **kwargs) -> requests.Response:
+    """Send a request as the given (default: current) tenant, waiting for its rate limit"""
+    tenant = tenant or current_tenant()
+    with span(f"{method} {urlsplit(url).path}", "http", start_trace=False, url=url,
+              tenant_id=tenant.tenant_id) as http_span:
+        tenant.throttle()
+        if http_span is None:
+            return tenant.session.request(method, url, **kwargs)
+        kwargs["headers"] = {**(kwargs.get("headers") or {}), "traceparent": http_span.traceparent}
+        response = tenant.session.request(method, url, **kwargs)
+        http_span.attributes.update(status_code=response.status_code,
+                                    server_ms=server_timing_ms(response.headers.get("Server-Timing")))
+        return response
+
+def _conditional_get(endpoint: str, params: Optional[Dict[str, Any]] = None,
+                     timeout: float = 10, tenant: Optional[TenantContext] = None) -> Tuple[Dict[str, Any], bool]:
+    """
+    GET a JSON resource, revalidating any cached copy with If-None-Match.
+    
+    Args:
+        endpoint: URL to fetch
+        params: Optional query parameters
+        timeout: Request timeout in seconds
+        tenant: Tenant whose session and cache to use (default: the current tenant)
+        
+    Returns:
+        Tuple of (parsed JSON body, whether the server answered 304 Not Modified)
+    """
+    tenant = tenant or current_tenant()
+    stats = tenant.cache_stats
+    url = requests.Request("GET", endpoint, params=params).prepare().url
+    with tenant.etag_lock:
+        cached = tenant.etag_cache.get(url)
+    
+    headers = {"If-None-Match": cached[0]} if cached else {}
+    response = _request("GET", url, tenant, headers=headers, timeout=timeout)
+    
+    if response.status_code == 304 and cached:
+        with tenant.etag_lock:
+            stats["requests"] += 1
+            stats["not_modified"] += 1
+            stats["bytes_saved"] += cached[1]
+        return cached[2], True
+    
+    response.raise_for_status()
+    data = response.json()
+    
+    with tenant.etag_lock:
+        stats["requests"] += 1
+        stats["bytes_received"] += len(response.content)
+        etag = response.headers.get("ETag")
+        if etag:
+            tenant.etag_cache[url] = (etag, len(response.content), data)
+    return data, False
+
+def get_http_cache_stats(tenant: Optional[TenantContext] = None) -> Dict[str, Any]:
+    """Return conditional request counters, including bytes saved by 304 responses"""
+    tenant = tenant or current_tenant()
+    with tenant.etag_lock:
+        stats = dict(tenant.cache_stats)
+    stats["hit_rate"] = round(stats["not_modified"] / stats["requests"], 3) if stats["requests"] else 0.0
+    return stats
+
+# =============================================================================
+# SHARED BLACKBOARD
+# =============================================================================
+
+# Parsed API results are written to the tenant's blackboard, so when another agent
+# asks for the same product or campaign its tool reads them without an HTTP call.
+# Tools that change campaigns invalidate the entries they make stale.
+
+def _shared_get(tool_name: str, kind: str, key: Any, endpoint: str) -> Tuple[Dict[str, Any], bool, bool]:
+    """
+    Read an entity from the blackboard, or GET it and share the result with other agents.
+    
+    Returns:
+        Tuple of (parsed JSON body, whether the server answered 304 Not Modified,
+        whether the result came from the blackboard)
+    """
+    board = get_blackboard()
+    entry = board.get(kind, key)
+    if entry is not None:
+        log_system_event("Blackboard Hit", {
+            "tool": tool_name,
+            "kind": kind,
+            "key": entry.key,
+            "version": entry.version,
+            "written_by": entry.source,
+            "age_seconds": round(entry.age_seconds, 1)
+        }, LogLevel.DEBUG)
+        return {"status": "success", "data": entry.data}, False, True
+    
+    data, not_modified = _conditional_get(endpoint)
+    if data.get("status") == "success":
+        board.put(kind, key, data["data"], source=tool_name)
+    return data, not_modified, False
+
+def _invalidate_campaigns(campaign_id: Optional[str] = None):
+    """Drop the shared campaign list and one campaign (or all campaigns) after a change"""
+    board = get_blackboard()
+    board.invalidate("campaign_list")
+    board.invalidate("campaign", campaign_id)
 
 # =============================================================================
 # STORE API TOOLS
 # =============================================================================
 
-@tool("fetch_all_products")
-def fetch_all_products() -> str:
+def _known_products() -> Dict[int, Dict[str, Any]]:
+    """Latest product records seen by fetch_all_products, used to fingerprint copy in create_campaign"""
+    return current_tenant().state.setdefault("known_products", {})
+
+def _ad_copy_cache():
+    tenant = current_tenant()
+    return get_ad_copy_cache(None if tenant.is_default else tenant.tenant_id)
+
+def list_products() -> List[Dict[str, Any]]:
     """
-    Fetch all products from the store API.
-    Returns a JSON string with product details including id, name, category, price, stock, page_views, sales.
+    Fetch every product for programmatic callers (the list is never cut to the prompt budget).
+    Products whose campaign copy was already written (and that haven't changed since) include "cached_ad_copy".
+    
+    Raises:
+        RuntimeError: If the API reports an error
+        requests.RequestException: If the request fails
     """
     start_time = time.time()
-    endpoint = f"{STORE_API_BASE}/products"
+    endpoint = f"{_store_api()}/products"
     
     try:
-        response = requests.get(endpoint, timeout=10)
-        response.raise_for_status()
-        
-        data = response.json()
-        duration_ms = (time.time() - start_time) * 1000
-        
-        # Log the API call
+        data, not_modified, shared = _shared_get("fetch_all_products", "product_list", "all", endpoint)
+    except requests.RequestException as e:
         log_api_call(
             tool_name="fetch_all_products",
             endpoint=endpoint,
             request_data={},
-            response_data={"status": data["status"], "count": len(data.get("data", []))},
-            duration_ms=duration_ms,
-            success=data["status"] == "success"
+            response_data={"error": str(e)},
+            duration_ms=(time.time() - start_time) * 1000,
+            success=False
         )
-        
-        if data["status"] == "success":
-            return json.dumps(data["data"], indent=2)
-        else:
-            return f"Error: {data.get('message', 'Unknown error')}"
-            
-    except requests.RequestException as e:
-        duration_ms = (time.time() - start_time) * 1000
+        raise
+    duration_ms = (time.time() - start_time) * 1000
+    
+    # Log the API call
+    if not shared:
         log_api_call(
             tool_name="fetch_all_products",
             endpoint=endpoint,
             request_data={},
-            response_data={"error": str(e)},
+            response_data={
+                "status": data["status"],
+                "count": len(data.get("data", [])),
+                "not_modified": not_modified,
+                "bytes_saved_total": get_http_cache_stats()["bytes_saved"]
+            },
             duration_ms=duration_ms,
-            success=False
+            success=data["status"] == "success"
         )
+    
+    if data["status"] != "success":
+        raise RuntimeError(data.get("message", "Unknown error"))
+    
+    # Attach previously generated copy for unchanged products so it can be reused
+    products = []
+    known_products = _known_products()
+    ad_copy_cache = _ad_copy_cache()
+    for product in data["data"]:
+        known_products[product["id"]] = product
+        cached = ad_copy_cache.get(product)
+        products.append({**product, "cached_ad_copy": cached} if cached else product)
+    log_system_event("Ad Copy Cache Lookup", {
+        "products": len(products),
+        "cached": sum(1 for product in products if "cached_ad_copy" in product),
+        **ad_copy_cache.stats
+    })
+    return products
+
+@tool("fetch_all_products")
+def fetch_all_products() -> str:
+    """
+    Fetch all products from the store API.
+    Returns a JSON string with product details including id, name, category, price, stock, page_views, sales.
+    Products whose campaign copy was already written (and that haven't changed since) include "cached_ad_copy".
+    """
+    try:
+        products = list_products()
+    except RuntimeError as e:
+        return f"Error: {str(e)}"
+    except requests.RequestException as e:
         return f"API Error: Failed to fetch products - {str(e)}"
+    
+    # Busiest products first if the catalog has to be paged
+    return fit_items("fetch_all_products", products, rank_key=lambda p: p.get("page_views", 0),
+                     keep_full=("cached_ad_copy",))
 
 @tool("fetch_product_details")
 def fetch_product_details(product_id: int) -> str:
@@ -74,10 +244,8 @@ def fetch_product_details(product_id: int) -> str:
         JSON string with detailed product information including real-time metrics
     """
     try:
-        response = requests.get(f"{STORE_API_BASE}/products/{product_id}", timeout=10)
-        response.raise_for_status()
-        
-        data = response.json()
+        data, _, _ = _shared_get("fetch_product_details", "product", product_id,
+                                 f"{_store_api()}/products/{product_id}")
         if data["status"] == "success":
             return json.dumps(data["data"], indent=2)
         else:
@@ -98,10 +266,8 @@ def fetch_product_analytics(product_id: int) -> str:
         JSON string with analytics data including page views, sales, revenue changes
     """
     try:
-        response = requests.get(f"{STORE_API_BASE}/products/{product_id}/analytics", timeout=10)
-        response.raise_for_status()
-        
-        data = response.json()
+        data, _, _ = _shared_get("fetch_product_analytics", "product_analytics", product_id,
+                                 f"{_store_api()}/products/{product_id}/analytics")
         if data["status"] == "success":
             return json.dumps(data["data"], indent=2)
         else:
@@ -110,6 +276,89 @@ def fetch_product_analytics(product_id: int) -> str:
     except requests.RequestException as e:
         return f"API Error: Failed to fetch analytics for product {product_id} - {str(e)}"
 
+# =============================================================================
+# METRICS HISTORY TOOLS
+# =============================================================================
+
+def _summarize_series(series: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Compute per-metric totals and first-to-last bucket change for a history series"""
+    summary = {}
+    if not series:
+        return summary
+
+    metrics = [key for key in series[0] if key not in ("bucket_start", "samples")]
+    for metric in metrics:
+        values = [point.get(metric, 0) for point in series]
+        first, last = values[0], values[-1]
+        summary[metric] = {
+            "total": round(sum(values), 2),
+            "average": round(sum(values) / len(values), 2),
+            "first": first,
+            "last": last,
+            "change_percent": round((last - first) / first * 100, 2) if first else None
+        }
+    return summary
+
+@tool("fetch_metrics_history")
+def fetch_metrics_history(entity_type: str, entity_id: str, days: int = 7,
+                          granularity: str = "day", metrics: str = "") -> str:
+    """
+    Fetch a downsampled metric time series for a product or campaign to analyze trends.
+    
+    Args:
+        entity_type: Either "product" or "campaign"
+        entity_id: The product ID or campaign ID
+        days: How many days of history to return (default: 7)
+        granularity: Bucket size, either "hour" or "day" (default: "day")
+        metrics: Optional comma-separated metric names to include (e.g. "sales,page_views")
+        
+    Returns:
+        JSON string with the bucketed series and a per-metric trend summary
+    """
+    start_time = time.time()
+    if entity_type == "product":
+        endpoint = f"{_store_api()}/products/{entity_id}/history"
+    elif entity_type == "campaign":
+        endpoint = f"{_impact_api()}/campaigns/{entity_id}/history"
+    else:
+        return f"Error: Unknown entity_type '{entity_type}', expected 'product' or 'campaign'"
+
+    params = {"days": days, "granularity": granularity}
+    if metrics:
+        params["metrics"] = metrics
+
+    try:
+        data, not_modified = _conditional_get(endpoint, params)
+        duration_ms = (time.time() - start_time) * 1000
+        
+        log_api_call(
+            tool_name="fetch_metrics_history",
+            endpoint=endpoint,
+            request_data=params,
+            response_data={"status": data["status"], "count": data.get("count", 0), "not_modified": not_modified},
+            duration_ms=duration_ms,
+            success=data["status"] == "success"
+        )
+        
+        if data["status"] == "success":
+            history = dict(data["data"])
+            history["trend_summary"] = _summarize_series(history["series"])
+            return json.dumps(history, indent=2)
+        else:
+            return f"Error: {data.get('message', 'History not found')}"
+            
+    except requests.RequestException as e:
+        duration_ms = (time.time() - start_time) * 1000
+        log_api_call(
+            tool_name="fetch_metrics_history",
+            endpoint=endpoint,
+            request_data=params,
+            response_data={"error": str(e)},
+            duration_ms=duration_ms,
+            success=False
+        )
+        return f"API Error: Failed to fetch history for {entity_type} {entity_id} - {str(e)}"
+
 # =============================================================================
 # IMPACT.COM API TOOLS
 # =============================================================================
@@ -122,16 +371,36 @@ def create_campaign(product_id: int, campaign_name: str, budget: float,
     
     Args:
         product_id: The ID of the product to advertise
-        campaign_name: Name for the campaign
+        campaign_name: Name for the campaign (may be empty if the product has cached_ad_copy)
         budget: Campaign budget in USD
         duration_days: How many days the campaign should run (default: 7)
-        campaign_copy: Ad copy text (optional)
+        campaign_copy: Ad copy text; leave empty to use the product's cached_ad_copy
         
     Returns:
         JSON string with campaign creation response including campaign_id
     """
     start_time = time.time()
-    endpoint = f"{IMPACT_API_BASE}/campaigns"
+    endpoint = f"{_impact_api()}/campaigns"
+    run = active_run()
+    known_products = _known_products()
+    
+    if not campaign_copy and product_id in known_products:
+        cached = _ad_copy_cache().get(known_products[product_id])
+        if cached is not None:
+            # The agent skipped writing copy for an unchanged product; fill in what was written before
+            campaign_name = campaign_name or cached["campaign_name"]
+            campaign_copy = cached["campaign_copy"]
+    
+    if run is not None:
+        previous = run.find_campaign(product_id, campaign_name)
+        if previous is not None:
+            # A resumed run already created this campaign before it failed
+            log_system_event("Campaign Creation Replayed", {
+                "run_id": run.run_id,
+                "product_id": product_id,
+                "campaign_id": previous.get("campaign_id")
+            })
+            return json.dumps(previous, indent=2)
     
     try:
         payload = {
@@ -142,7 +411,8 @@ def create_campaign(product_id: int, campaign_name: str, budget: float,
             "campaign_copy": campaign_copy
         }
         
-        response = requests.post(
+        response = _request(
+            "POST",
             endpoint,
             json=payload,
             headers={"Content-Type": "application/json"},
@@ -164,6 +434,11 @@ def create_campaign(product_id: int, campaign_name: str, budget: float,
         )
         
         if data["status"] == "success":
+            _invalidate_campaigns(data["data"].get("campaign_id"))
+            if run is not None:
+                run.record_campaign(product_id, campaign_name, data["data"])
+            if campaign_copy and product_id in known_products:
+                _ad_copy_cache().put(known_products[product_id], campaign_name, campaign_copy)
             return json.dumps(data["data"], indent=2)
         else:
             return f"Error: {data.get('message', 'Campaign creation failed')}"
@@ -192,10 +467,8 @@ def fetch_campaign_details(campaign_id: str) -> str:
         JSON string with campaign details and performance metrics
     """
     try:
-        response = requests.get(f"{IMPACT_API_BASE}/campaigns/{campaign_id}", timeout=10)
-        response.raise_for_status()
-        
-        data = response.json()
+        data, _, _ = _shared_get("fetch_campaign_details", "campaign", campaign_id,
+                                 f"{_impact_api()}/campaigns/{campaign_id}")
         if data["status"] == "success":
             return json.dumps(data["data"], indent=2)
         else:
@@ -204,6 +477,51 @@ def fetch_campaign_details(campaign_id: str) -> str:
     except requests.RequestException as e:
         return f"API Error: Failed to fetch campaign {campaign_id} - {str(e)}"
 
+def list_campaigns() -> List[Dict[str, Any]]:
+    """
+    Fetch every campaign with its current metrics for programmatic callers
+    (the list is never cut to the prompt budget).
+    
+    Raises:
+        RuntimeError: If the API reports an error
+        requests.RequestException: If the request fails
+    """
+    start_time = time.time()
+    endpoint = f"{_impact_api()}/campaigns"
+    
+    try:
+        data, not_modified, shared = _shared_get("fetch_all_campaigns", "campaign_list", "all", endpoint)
+    except requests.RequestException as e:
+        log_api_call(
+            tool_name="fetch_all_campaigns",
+            endpoint=endpoint,
+            request_data={},
+            response_data={"error": str(e)},
+            duration_ms=(time.time() - start_time) * 1000,
+            success=False
+        )
+        raise
+    duration_ms = (time.time() - start_time) * 1000
+    
+    if not shared:
+        log_api_call(
+            tool_name="fetch_all_campaigns",
+            endpoint=endpoint,
+            request_data={},
+            response_data={
+                "status": data["status"],
+                "count": data.get("count", 0),
+                "not_modified": not_modified,
+                "bytes_saved_total": get_http_cache_stats()["bytes_saved"]
+            },
+            duration_ms=duration_ms,
+            success=data["status"] == "success"
+        )
+    
+    if data["status"] != "success":
+        raise RuntimeError(data.get("message", "Failed to fetch campaigns"))
+    return data["data"]
+
 @tool("fetch_all_campaigns")
 def fetch_all_campaigns() -> str:
     """
@@ -213,17 +531,33 @@ def fetch_all_campaigns() -> str:
         JSON string with list of all campaigns and their current metrics
     """
     try:
-        response = requests.get(f"{IMPACT_API_BASE}/campaigns", timeout=10)
-        response.raise_for_status()
-        
-        data = response.json()
-        if data["status"] == "success":
-            return json.dumps(data["data"], indent=2)
-        else:
-            return f"Error: {data.get('message', 'Failed to fetch campaigns')}"
-            
+        campaigns = list_campaigns()
+    except RuntimeError as e:
+        return f"Error: {str(e)}"
     except requests.RequestException as e:
         return f"API Error: Failed to fetch campaigns - {str(e)}"
+    
+    # Highest spend first if the list has to be paged
+    return fit_items("fetch_all_campaigns", campaigns,
+                     rank_key=lambda c: (c.get("metrics") or {}).get("spend", 0))
+
+@tool("fetch_more_results")
+def fetch_more_results(handle: str, offset: int) -> str:
+    """
+    Fetch the next page of a tool result that was truncated to fit the prompt.
+    
+    Args:
+        handle: The "handle" from the truncated result's "next_page"
+        offset: The "offset" from the same "next_page"
+        
+    Returns:
+        JSON with the next items and, if more remain, another "next_page"
+    """
+    try:
+        return next_page(handle, int(offset))
+    except KeyError:
+        return (f"Error: Unknown or expired result handle {handle}. "
+                "Call the original tool again for a fresh result.")
 
 @tool("pause_campaign")
 def pause_campaign(campaign_id: str) -> str:
@@ -237,11 +571,12 @@ def pause_campaign(campaign_id: str) -> str:
         JSON string with pause operation result
     """
     try:
-        response = requests.post(f"{IMPACT_API_BASE}/campaigns/{campaign_id}/pause", timeout=10)
+        response = _request("POST", f"{_impact_api()}/campaigns/{campaign_id}/pause", timeout=10)
         response.raise_for_status()
         
         data = response.json()
         if data["status"] == "success":
+            _invalidate_campaigns(campaign_id)
             return json.dumps({"action": "paused", "campaign_id": campaign_id, "status": "success"}, indent=2)
         else:
             return f"Error: {data.get('message', 'Failed to pause campaign')}"
@@ -261,11 +596,12 @@ def resume_campaign(campaign_id: str) -> str:
         JSON string with resume operation result
     """
     try:
-        response = requests.post(f"{IMPACT_API_BASE}/campaigns/{campaign_id}/resume", timeout=10)
+        response = _request("POST", f"{_impact_api()}/campaigns/{campaign_id}/resume", timeout=10)
         response.raise_for_status()
         
         data = response.json()
         if data["status"] == "success":
+            _invalidate_campaigns(campaign_id)
             return json.dumps({"action": "resumed", "campaign_id": campaign_id, "status": "success"}, indent=2)
         else:
             return f"Error: {data.get('message', 'Failed to resume campaign')}"
@@ -273,6 +609,370 @@ def resume_campaign(campaign_id: str) -> str:
     except requests.RequestException as e:
         return f"API Error: Failed to resume campaign {campaign_id} - {str(e)}"
 
+# =============================================================================
+# CAMPAIGN CHANGE FEED
+# =============================================================================
+
+class CampaignView:
+    """
+    Local materialized view of the Impact.com campaign list, kept current by
+    applying change log entries (pulled from GET /campaigns/changes or pushed
+    over the SSE stream) instead of re-downloading every campaign.
+    """
+    
+    def __init__(self, tenant: Optional[TenantContext] = None):
+        self.tenant = tenant or current_tenant()
+        self.cursor = 0
+        self.campaigns: Dict[str, Dict[str, Any]] = {}
+        # Local version counter, bumped on every applied change, so readers can ask
+        # "what changed since I last looked" regardless of how the change arrived
+        self.version = 0
+        self._updated_version: Dict[str, int] = {}
+        self._lock = threading.RLock()
+    
+    def apply(self, change: Dict[str, Any]):
+        """Apply a single change log entry to the view"""
+        with self._lock:
+            if change["seq"] <= self.cursor:
+                return
+            change_type = change["type"]
+            campaign_id = change["campaign_id"]
+            self.version += 1
+            
+            if change_type == "reset":
+                self.campaigns.clear()
+                self._updated_version.clear()
+            elif change_type == "created":
+                self.campaigns[campaign_id] = dict(change["data"])
+                self._updated_version[campaign_id] = self.version
+            elif campaign_id in self.campaigns:
+                # paused / resumed / metrics_updated carry only the changed fields
+                self.campaigns[campaign_id].update(change["data"])
+                self._updated_version[campaign_id] = self.version
+            self.cursor = change["seq"]
+    
+    def resync(self):
+        """Rebuild the view from the full campaign list and its change log cursor"""
+        data, _ = _conditional_get(f"{self.tenant.impact_api_base}/campaigns", tenant=self.tenant)
+        with self._lock:
+            self.version += 1
+            self.campaigns = {campaign["campaign_id"]: dict(campaign) for campaign in data["data"]}
+            self._updated_version = {campaign_id: self.version for campaign_id in self.campaigns}
+            self.cursor = data.get("cursor", 0)
+    
+    def sync(self) -> Dict[str, Any]:
+        """
+        Pull and apply every change after the current cursor.
+        
+        Returns:
+            Dictionary with the cursor range covered and number of changes applied
+        """
+        with self._lock:
+            since = self.cursor
+            applied = 0
+            resynced = False
+            
+            while True:
+                response = _request("GET", f"{self.tenant.impact_api_base}/campaigns/changes", self.tenant,
+                                    params={"since": self.cursor}, timeout=10)
+                if response.status_code == 410:
+                    # Cursor fell out of the server's retained window (or the server restarted)
+                    self.resync()
+                    resynced = True
+                    break
+                
+                response.raise_for_status()
+                data = response.json()
+                for change in data["data"]:
+                    self.apply(change)
+                    applied += 1
+                self.cursor = max(self.cursor, data["cursor"])
+                
+                if not data.get("has_more"):
+                    break
+            
+            return {
+                "since": since,
+                "cursor": self.cursor,
+                "changes_applied": applied,
+                "resynced": resynced
+            }
+    
+    def changed_since(self, version: int) -> List[Dict[str, Any]]:
+        """Return copies of the campaigns updated after a local view version"""
+        with self._lock:
+            return [
+                dict(self.campaigns[campaign_id])
+                for campaign_id, updated in self._updated_version.items()
+                if updated > version
+            ]
+    
+    def snapshot(self) -> List[Dict[str, Any]]:
+        """Return a copy of every campaign in the view"""
+        with self._lock:
+            return [dict(campaign) for campaign in self.campaigns.values()]
+    
+    def table(self) -> CampaignTable:
+        """Return every campaign in the view as a column store (for whole-portfolio checks)"""
+        with self._lock:
+            return CampaignTable.from_campaigns(self.campaigns.values())
+
+def _iter_sse_events(response):
+    """Parse a text/event-stream response into (event, id, data) tuples; comments come back as keepalive events"""
+    event, event_id, data = "message", None, []
+    for line in response.iter_lines(decode_unicode=True):
+        if line is None:
+            continue
+        if not line:
+            if data:
+                yield event, event_id, "\n".join(data)
+            event, event_id, data = "message", None, []
+        elif line.startswith(":"):
+            # Comment lines are heartbeats; surface them so readers can check for shutdown
+            yield "keepalive", None, line[1:].strip()
+        else:
+            field, _, value = line.partition(":")
+            value = value[1:] if value.startswith(" ") else value
+            if field == "event":
+                event = value
+            elif field == "id":
+                event_id = value
+            elif field == "data":
+                data.append(value)
+
+class CampaignStreamSubscriber:
+    """
+    Background subscriber to GET /campaigns/stream (Server-Sent Events).
+
+    Pushed changes are applied to a CampaignView as they happen, so monitoring
+    cost scales with the number of changes instead of polling frequency times
+    campaign count. Reconnects with Last-Event-ID and exponential backoff.
+    """
+    
+    def __init__(self, view: CampaignView, heartbeat: float = 5.0,
+                 reconnect_delay: float = 1.0, max_reconnect_delay: float = 30.0):
+        self.view = view
+        self.heartbeat = heartbeat
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        self.events_received = 0
+        self._listeners = []
+        self._connected = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+    
+    @property
+    def connected(self) -> bool:
+        """Whether the stream is currently open and feeding the view"""
+        return self._connected.is_set()
+    
+    def add_listener(self, callback):
+        """Register callback(change) to be invoked after each pushed change is applied"""
+        self._listeners.append(callback)
+    
+    def start(self):
+        """Start streaming in a daemon thread (no-op if already running)"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="campaign-stream", daemon=True)
+        self._thread.start()
+    
+    def stop(self, timeout: Optional[float] = None):
+        """
+        Stop streaming and wait for the background thread to exit.
+        The thread notices at the next event or heartbeat, so this takes at most ~heartbeat seconds.
+        """
+        self._stop.set()
+        if self._thread:
+            self._thread.join(self.heartbeat + 1 if timeout is None else timeout)
+        self._connected.clear()
+    
+    def wait_connected(self, timeout: float = 5.0) -> bool:
+        """Block until the stream is open, returning False on timeout"""
+        return self._connected.wait(timeout)
+    
+    def _run(self):
+        delay = self.reconnect_delay
+        while not self._stop.is_set():
+            response = None
+            try:
+                if self.view.cursor == 0 and not self.view.campaigns:
+                    self.view.resync()
+                
+                # A separate streaming connection, the pooled session stays free for tool calls
+                response = requests.get(
+                    f"{self.view.tenant.impact_api_base}/campaigns/stream",
+                    params={"heartbeat": self.heartbeat},
+                    headers={"Last-Event-ID": str(self.view.cursor), "Accept": "text/event-stream",
+                             **self.view.tenant.auth_headers},
+                    stream=True,
+                    timeout=(5, self.heartbeat * 2)
+                )
+                response.raise_for_status()
+                self._connected.set()
+                delay = self.reconnect_delay
+                
+                for event, _, data in _iter_sse_events(response):
+                    if self._stop.is_set():
+                        break
+                    if event == "keepalive":
+                        continue
+                    self.events_received += 1
+                    if event == "resync":
+                        self.view.resync()
+                        continue
+                    change = json.loads(data)
+                    self.view.apply(change)
+                    for listener in self._listeners:
+                        listener(change)
+                        
+            except (requests.RequestException, ValueError) as e:
+                if not self._stop.is_set():
+                    log_system_event("Campaign Stream Disconnected", {
+                        "error": str(e),
+                        "cursor": self.view.cursor,
+                        "retry_in_seconds": delay
+                    }, LogLevel.WARNING)
+            finally:
+                self._connected.clear()
+                if response is not None:
+                    response.close()
+            
+            self._stop.wait(delay)
+            delay = min(delay * 2, self.max_reconnect_delay)
+
+# Default tenant's view, fed by the change feed tool and, when started, the SSE subscriber
+campaign_view = CampaignView(default_tenant())
+campaign_stream = CampaignStreamSubscriber(campaign_view)
+default_tenant().state.update(campaign_view=campaign_view, campaign_stream=campaign_stream)
+
+_view_lock = threading.Lock()
+
+def get_campaign_view(tenant: Optional[TenantContext] = None) -> CampaignView:
+    """Return a tenant's campaign view, creating it on first use"""
+    tenant = tenant or current_tenant()
+    with _view_lock:
+        if "campaign_view" not in tenant.state:
+            tenant.state["campaign_view"] = CampaignView(tenant)
+        return tenant.state["campaign_view"]
+
+@tool("fetch_campaign_changes")
+def fetch_campaign_changes() -> str:
+    """
+    Fetch only the campaigns that changed (created, paused, resumed or new metrics) since the last call.
+    Much cheaper than fetch_all_campaigns when monitoring repeatedly.
+    
+    Returns:
+        JSON string with the new cursor, number of changes applied and the changed campaigns
+    """
+    start_time = time.time()
+    tenant = current_tenant()
+    campaign_view = get_campaign_view(tenant)
+    campaign_stream = tenant.state.get("campaign_stream")
+    endpoint = f"{tenant.impact_api_base}/campaigns/changes"
+    
+    try:
+        if campaign_stream is not None and campaign_stream.connected:
+            # The SSE subscriber already keeps the view current, no request needed
+            result = {"source": "stream", "cursor": campaign_view.cursor}
+        else:
+            result = {"source": "poll", **campaign_view.sync()}
+            duration_ms = (time.time() - start_time) * 1000
+            log_api_call(
+                tool_name="fetch_campaign_changes",
+                endpoint=endpoint,
+                request_data={"since": result["since"]},
+                response_data=result,
+                duration_ms=duration_ms,
+                success=True
+            )
+        
+        version = campaign_view.version
+        result["changed_campaigns"] = campaign_view.changed_since(tenant.state.get("reported_view_version", 0))
+        result["total_campaigns"] = len(campaign_view.campaigns)
+        tenant.state["reported_view_version"] = version
+        return json.dumps(result, indent=2)
+        
+    except requests.RequestException as e:
+        duration_ms = (time.time() - start_time) * 1000
+        log_api_call(
+            tool_name="fetch_campaign_changes",
+            endpoint=endpoint,
+            request_data={"since": campaign_view.cursor},
+            response_data={"error": str(e)},
+            duration_ms=duration_ms,
+            success=False
+        )
+        return f"API Error: Failed to fetch campaign changes - {str(e)}"
+
+# =============================================================================
+# CATALOG SIMILARITY SEARCH
+# =============================================================================
+
+# Catalog index written by create_ad_agent_embeddings.py, reopened when it is rebuilt
+_catalog_index = None
+_catalog_index_mtime = None
+_catalog_embedder = None
+
+def _open_catalog_index():
+    """Return the catalog vector index (None if it hasn't been built yet)"""
+    global _catalog_index, _catalog_index_mtime, _catalog_embedder
+    from pathlib import Path
+    from memory_store import DEFAULT_CATALOG_DIR, DEFAULT_CATALOG_EMBEDDER, MemmapVectorIndex, load_embedder
+
+    directory = Path(DEFAULT_CATALOG_DIR)
+    payload_file = directory / MemmapVectorIndex.PAYLOADS_FILE
+    if not payload_file.exists():
+        return None
+
+    mtime = payload_file.stat().st_mtime
+    if _catalog_index is None or mtime != _catalog_index_mtime:
+        if _catalog_embedder is None:
+            _catalog_embedder = load_embedder(DEFAULT_CATALOG_EMBEDDER)
+        _catalog_index = MemmapVectorIndex(str(directory), dim=len(_catalog_embedder(["dimension probe"])[0]))
+        _catalog_index_mtime = mtime
+    return _catalog_index
+
+@tool("find_similar_campaigns")
+def find_similar_campaigns(query: str, limit: int = 5) -> str:
+    """
+    Find products and past campaigns similar to a description, using the local catalog index.
+    Use it before writing new ad copy to reuse what worked for similar products.
+    
+    Args:
+        query: Product name/description or campaign idea to match
+        limit: Maximum number of matches per kind (default: 5)
+        
+    Returns:
+        JSON string with similar products and past campaigns (name, copy, ROAS) and similarity scores
+    """
+    start_time = time.time()
+    if not current_tenant().is_default:
+        return "Error: The catalog index is only built for the default store"
+    index = _open_catalog_index()
+    if index is None:
+        return "Error: Catalog index not built yet - run create_ad_agent_embeddings.py first"
+
+    query_vector = _catalog_embedder([query])[0]
+    results = {}
+    for kind in ("product", "campaign"):
+        matches = index.search(query_vector, k=limit, predicate=lambda payload, kind=kind: payload.get("kind") == kind)
+        results[f"similar_{kind}s"] = [
+            {**{k: v for k, v in index.payload(item_id).items() if k not in ("content_hash", "text")},
+             "similarity": round(score, 3)}
+            for item_id, score in matches if score > 0
+        ]
+
+    log_system_event("Catalog Similarity Search", {
+        "query": query[:100],
+        "indexed_items": len(index),
+        "products": len(results["similar_products"]),
+        "campaigns": len(results["similar_campaigns"]),
+        "duration_ms": round((time.time() - start_time) * 1000, 2)
+    })
+    return json.dumps(results, indent=2)
+
 # =============================================================================
 # UTILITY TOOLS
 # =============================================================================
@@ -286,7 +986,7 @@ def check_api_health() -> str:
         JSON string with API health status
     """
     try:
-        response = requests.get("http://localhost:6000/api/health", timeout=5)
+        response = _request("GET", f"{current_tenant().api_root}/health", timeout=5)
         response.raise_for_status()
         
         data = response.json()
@@ -304,8 +1004,9 @@ def reset_campaign_data() -> str:
         JSON string with reset confirmation
     """
     try:
-        response = requests.post("http://localhost:6000/api/reset", timeout=5)
+        response = _request("POST", f"{current_tenant().api_root}/reset", timeout=5)
         response.raise_for_status()
+        _invalidate_campaigns()
         
         data = response.json()
         return json.dumps(data, indent=2)
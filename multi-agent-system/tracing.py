@@ -0,0 +1,359 @@
+#!/usr/bin/env python3
+"""
+Campaign Pilot Tracing
+Trace and span ids for crew runs, tasks, agents, LLM calls, tool calls and HTTP requests
+
+Every crew run started through kickoff_with_checkpoints opens the root span of a
+trace. crewai's crew, task, agent, LLM and tool events become child spans; crewai
+runs event handlers on a thread pool, so their parent links and timings come from
+the events' own ids and timestamps. HTTP requests made by the tools are spans
+under the tool call that made them, and carry a W3C `traceparent` header so the
+API server can tag its logs with the trace.
+
+When the root span ends, the trace is written to TRACE_DIR in Chrome trace-event
+JSON. chrome://tracing, Perfetto and speedscope open it offline as a flame or
+waterfall chart.
+"""
+
+import json
+import os
+import re
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+TRACING_ENABLED = os.getenv("TRACING_ENABLED", "true").lower() not in ("0", "false", "no")
+DEFAULT_TRACE_DIR = os.getenv("TRACE_DIR", os.path.join("logs", "traces"))
+
+def _now_us() -> int:
+    return time.time_ns() // 1000
+
+def _event_span_id(event_id: str) -> str:
+    """Span id for a crewai event scope (its start event's uuid, shortened)"""
+    return event_id.replace("-", "")[:16]
+
+def _event_scope() -> Optional[str]:
+    """Innermost crewai event scope (task, agent, tool, ...) open in this context"""
+    if "crewai.events.event_context" not in sys.modules:
+        return None
+    return sys.modules["crewai.events.event_context"].get_current_parent_id()
+
+@dataclass
+class Span:
+    trace_id: str
+    span_id: str
+    name: str = ""
+    kind: str = "internal"  # run | crew | task | agent | llm | tool | http | internal
+    parent_id: Optional[str] = None
+    start_us: Optional[int] = None
+    end_us: Optional[int] = None
+    status: str = "ok"
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    # crewai scope that was open when this span started; a different, inner scope is a child
+    event_scope: Optional[str] = field(default=None, repr=False)
+
+    @property
+    def traceparent(self) -> str:
+        """W3C trace context header value naming this span as the parent"""
+        return f"00-{self.trace_id}-{self.span_id}-01"
+
+    @property
+    def duration_ms(self) -> float:
+        if self.start_us is None or self.end_us is None:
+            return 0.0
+        return (self.end_us - self.start_us) / 1000
+
+class Tracer:
+    """
+    Collects spans per trace until the trace is exported
+
+    Span records are merged by id, so a span's end (from one event handler) may
+    arrive before its start (from another).
+    """
+
+    def __init__(self, trace_dir: str = DEFAULT_TRACE_DIR):
+        self.trace_dir = Path(trace_dir)
+        self._traces: Dict[str, Dict[str, Span]] = {}
+        # crewai scopes that aren't spans themselves (e.g. the agent executor's internal flow) -> their parent
+        self._pass_through: Dict[str, Dict[str, Optional[str]]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, trace_id: str, span_id: str, **updates) -> Span:
+        attributes = updates.pop("attributes", None)
+        with self._lock:
+            spans = self._traces.setdefault(trace_id, {})
+            span = spans.get(span_id)
+            if span is None:
+                span = spans[span_id] = Span(trace_id, span_id)
+            for name, value in updates.items():
+                setattr(span, name, value)
+            if attributes:
+                span.attributes.update(attributes)
+        return span
+
+    def pass_through(self, trace_id: str, span_id: str, parent_id: Optional[str]):
+        """Attach children of `span_id` to `parent_id` instead"""
+        with self._lock:
+            self._pass_through.setdefault(trace_id, {})[span_id] = parent_id
+
+    def pop_trace(self, trace_id: str) -> List[Span]:
+        with self._lock:
+            spans = self._traces.pop(trace_id, {})
+            pass_through = self._pass_through.pop(trace_id, {})
+        for span in spans.values():
+            while span.parent_id in pass_through:
+                span.parent_id = pass_through[span.parent_id]
+        return sorted((span for span in spans.values() if span.start_us is not None), key=lambda s: s.start_us)
+
+    def export(self, trace_id: str) -> Optional[str]:
+        """Write a finished trace as Chrome trace-event JSON and return its path"""
+        # Let crewai's event handlers record the last task/agent/tool spans first
+        if "crewai.events" in sys.modules:
+            sys.modules["crewai.events"].crewai_event_bus.flush(timeout=5.0)
+        spans = self.pop_trace(trace_id)
+        if not spans:
+            return None
+
+        # Each LLM call of an agent is one iteration of its reason/act loop
+        iterations: Dict[Optional[str], int] = {}
+        for span in spans:
+            if span.kind == "llm":
+                iterations[span.parent_id] = span.attributes["iteration"] = iterations.get(span.parent_id, 0) + 1
+                span.name = f"iteration {span.attributes['iteration']} {span.name}"
+
+        root = spans[0]
+        path_spans = critical_path(spans)
+        self.trace_dir.mkdir(parents=True, exist_ok=True)
+        filename = self.trace_dir / f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{trace_id}.json"
+        with open(filename, "w", encoding="utf-8") as f:
+            json.dump({
+                "traceEvents": to_trace_events(spans),
+                "displayTimeUnit": "ms",
+                "otherData": {
+                    "trace_id": trace_id,
+                    "root": root.name,
+                    "duration_ms": root.duration_ms,
+                    "critical_path": [{"name": span.name, "kind": span.kind, "duration_ms": span.duration_ms}
+                                      for span in path_spans],
+                    "self_time_hotspots": self_time_hotspots(spans)
+                }
+            }, f, default=str)
+
+        from logger import log_system_event
+        log_system_event("Trace Exported", {
+            "trace_id": trace_id,
+            "file": str(filename),
+            "spans": len(spans),
+            "duration_ms": round(root.duration_ms, 1),
+            "critical_path": " > ".join(span.name for span in path_spans)
+        })
+        return str(filename)
+
+def critical_path(spans: List[Span]) -> List[Span]:
+    """Root-to-leaf chain that always follows the child finishing last (what the run waited on)"""
+    children: Dict[Optional[str], List[Span]] = {}
+    for span in spans:
+        children.setdefault(span.parent_id, []).append(span)
+    ids = {span.span_id for span in spans}
+    roots = [span for span in spans if span.parent_id not in ids]
+    path = []
+    current = max(roots, key=lambda s: s.end_us or 0, default=None)
+    while current is not None:
+        path.append(current)
+        current = max(children.get(current.span_id, []), key=lambda s: s.end_us or 0, default=None)
+    return path
+
+def self_time_hotspots(spans: List[Span], limit: int = 5) -> List[Dict[str, Any]]:
+    """Spans with the most time not covered by their children (where the run actually spent it)"""
+    child_ms: Dict[Optional[str], float] = {}
+    for span in spans:
+        child_ms[span.parent_id] = child_ms.get(span.parent_id, 0.0) + span.duration_ms
+    ranked = sorted(spans, key=lambda s: s.duration_ms - child_ms.get(s.span_id, 0.0), reverse=True)
+    return [{"name": span.name, "kind": span.kind,
+             "self_ms": round(max(span.duration_ms - child_ms.get(span.span_id, 0.0), 0.0), 1)}
+            for span in ranked[:limit]]
+
+def to_trace_events(spans: List[Span]) -> List[Dict[str, Any]]:
+    """
+    Chrome trace-event "complete" events, one per span
+
+    A span is drawn on its parent's row (so the rows read as a flame chart) unless
+    it overlaps a span already on that row, e.g. concurrent tasks; then it gets a new row.
+    """
+    trace_end = max((span.end_us or span.start_us for span in spans), default=0)
+    rows: Dict[str, int] = {}
+    row_ends: Dict[Tuple[int, Optional[str]], int] = {}
+    next_row = 1
+    events = []
+    for span in spans:  # sorted by start
+        end = span.end_us if span.end_us is not None else trace_end
+        row = rows.get(span.parent_id, 1)
+        if row_ends.get((row, span.parent_id), 0) > span.start_us:
+            next_row += 1
+            row = next_row
+        row_ends[(row, span.parent_id)] = end
+        rows[span.span_id] = row
+        events.append({
+            "name": span.name,
+            "cat": span.kind,
+            "ph": "X",
+            "ts": span.start_us,
+            "dur": max(end - span.start_us, 0),
+            "pid": 1,
+            "tid": row,
+            "args": {
+                "span_id": span.span_id,
+                "parent_id": span.parent_id,
+                "status": span.status if span.end_us is not None else "unfinished",
+                **span.attributes
+            }
+        })
+    return events
+
+_tracer = Tracer()
+_current_span: ContextVar[Optional[Span]] = ContextVar("campaign_pilot_span", default=None)
+
+def get_tracer() -> Tracer:
+    return _tracer
+
+def current_span() -> Optional[Span]:
+    return _current_span.get()
+
+def current_ids() -> Tuple[Optional[str], Optional[str]]:
+    """(trace_id, span_id) of the innermost span in this context, for log correlation"""
+    span = _current_span.get()
+    if span is None:
+        return None, None
+    scope = _event_scope()
+    if scope and scope != span.event_scope:
+        return span.trace_id, _event_span_id(scope)
+    return span.trace_id, span.span_id
+
+def current_trace_id() -> Optional[str]:
+    return current_ids()[0]
+
+def current_span_id() -> Optional[str]:
+    return current_ids()[1]
+
+@contextmanager
+def span(name: str, kind: str = "internal", start_trace: bool = True, **attributes):
+    """
+    Time the enclosed code as a span under the innermost open span or crewai scope
+
+    Args:
+        name: Span name
+        kind: Span category (run, http, internal, ...)
+        start_trace: Outside any trace, start a new one (exported when this span ends);
+            if False the block runs untraced and the span is None
+        **attributes: Extra span attributes
+
+    Yields:
+        The Span (None when not traced)
+    """
+    trace_id, parent_id = current_ids()
+    if not TRACING_ENABLED or (trace_id is None and not start_trace):
+        yield None
+        return
+
+    new_trace = trace_id is None
+    if new_trace:
+        trace_id = os.urandom(16).hex()
+    current = _tracer.record(trace_id, os.urandom(8).hex(), name=name, kind=kind, parent_id=parent_id,
+                             start_us=_now_us(), attributes=attributes, event_scope=_event_scope())
+    token = _current_span.set(current)
+    try:
+        yield current
+    except BaseException as e:
+        current.status = "error"
+        current.attributes["error"] = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        current.end_us = _now_us()
+        _current_span.reset(token)
+        if new_trace:
+            _tracer.export(trace_id)
+
+def server_timing_ms(header: Optional[str]) -> Optional[float]:
+    """Total `dur` of a Server-Timing response header, in milliseconds"""
+    durations = re.findall(r"dur=([\d.]+)", header or "")
+    return sum(float(value) for value in durations) if durations else None
+
+# =============================================================================
+# CREWAI EVENTS
+# =============================================================================
+
+def _event_us(event) -> int:
+    return int(event.timestamp.timestamp() * 1_000_000)
+
+def _parent_span_id(owner: Span, event) -> str:
+    parent = event.parent_event_id
+    return owner.span_id if parent is None or parent == owner.event_scope else _event_span_id(parent)
+
+def _on_start(kind: str, name: str, event, **attributes):
+    owner = _current_span.get()
+    if owner is None:
+        return  # crewai run outside any traced crew run
+    _tracer.record(owner.trace_id, _event_span_id(event.event_id), name=name, kind=kind,
+                   parent_id=_parent_span_id(owner, event), start_us=_event_us(event), attributes=attributes)
+
+def _on_pass_through(event):
+    owner = _current_span.get()
+    if owner is not None:
+        _tracer.pass_through(owner.trace_id, _event_span_id(event.event_id), _parent_span_id(owner, event))
+
+def _on_end(event, error: Any = None, **attributes):
+    owner = _current_span.get()
+    if owner is None or not event.started_event_id:
+        return
+    if error is not None:
+        attributes["error"] = str(error)
+    _tracer.record(owner.trace_id, _event_span_id(event.started_event_id), end_us=_event_us(event),
+                   status="error" if error is not None else "ok", attributes=attributes)
+
+_install_lock = threading.Lock()
+_installed = False
+
+def install_tracing():
+    """Turn crewai's crew/task/agent/LLM/tool events into spans (once per process)"""
+    global _installed
+    with _install_lock:
+        if _installed or not TRACING_ENABLED:
+            return
+        from crewai.events import crewai_event_bus
+        from crewai.events.types.agent_events import (AgentExecutionCompletedEvent, AgentExecutionErrorEvent,
+                                                      AgentExecutionStartedEvent)
+        from crewai.events.types.crew_events import (CrewKickoffCompletedEvent, CrewKickoffFailedEvent,
+                                                     CrewKickoffStartedEvent)
+        from crewai.events.types.flow_events import FlowStartedEvent, MethodExecutionStartedEvent
+        from crewai.events.types.llm_events import LLMCallCompletedEvent, LLMCallFailedEvent, LLMCallStartedEvent
+        from crewai.events.types.task_events import TaskCompletedEvent, TaskFailedEvent, TaskStartedEvent
+        from crewai.events.types.tool_usage_events import (ToolUsageErrorEvent, ToolUsageFinishedEvent,
+                                                           ToolUsageStartedEvent)
+
+        bus = crewai_event_bus
+        bus.on(CrewKickoffStartedEvent)(lambda source, e: _on_start("crew", f"crew: {e.crew_name}", e))
+        bus.on(TaskStartedEvent)(lambda source, e: _on_start("task", f"task: {e.task_name or e.task_id}", e))
+        bus.on(AgentExecutionStartedEvent)(lambda source, e: _on_start(
+            "agent", f"agent: {e.agent.role}", e, tools=[tool.name for tool in e.tools or []]))
+        bus.on(LLMCallStartedEvent)(lambda source, e: _on_start(
+            "llm", f"llm: {e.model}", e, agent=e.agent_role, messages=len(e.messages or [])))
+        bus.on(ToolUsageStartedEvent)(lambda source, e: _on_start(
+            "tool", f"tool: {e.tool_name}", e, agent=e.agent_role))
+        # crewai runs each agent's reason/act loop as an internal flow; keep its steps under the agent
+        bus.on(FlowStartedEvent)(lambda source, e: _on_pass_through(e))
+        bus.on(MethodExecutionStartedEvent)(lambda source, e: _on_pass_through(e))
+
+        for completed in (CrewKickoffCompletedEvent, TaskCompletedEvent, AgentExecutionCompletedEvent):
+            bus.on(completed)(lambda source, e: _on_end(e))
+        bus.on(LLMCallCompletedEvent)(lambda source, e: _on_end(e, usage=e.usage))
+        bus.on(ToolUsageFinishedEvent)(lambda source, e: _on_end(e, from_cache=e.from_cache))
+        for failed in (CrewKickoffFailedEvent, TaskFailedEvent, AgentExecutionErrorEvent,
+                       LLMCallFailedEvent, ToolUsageErrorEvent):
+            bus.on(failed)(lambda source, e: _on_end(e, error=e.error))
+        _installed = True
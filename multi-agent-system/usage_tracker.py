@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Campaign Pilot LLM Usage Tracking
+Token, latency and cost accounting for every LLM call and tool output
+
+Listens on crewai's event bus: each completed LLM call is logged with its agent,
+task, model, prompt/completion tokens, latency and cost, and each tool result
+with the tokens it adds to the agent's next prompt. The logger aggregates them
+per agent, task, model and tool (see get_session_summary and the HTML report).
+"""
+
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from logger import log_llm_call, log_tool_output
+
+# USD per million (prompt, completion) tokens; matched by longest model-name prefix
+DEFAULT_LLM_PRICES: Dict[str, Tuple[float, float]] = {
+    "gpt-4o-mini": (0.15, 0.60),
+    "gpt-4o": (2.50, 10.00),
+    "gpt-4.1-nano": (0.10, 0.40),
+    "gpt-4.1-mini": (0.40, 1.60),
+    "gpt-4.1": (2.00, 8.00),
+    "gpt-4": (30.00, 60.00),
+    "gpt-3.5-turbo": (0.50, 1.50),
+    "gemini-2.5-flash": (0.30, 2.50),
+    "gemini-2.5-pro": (1.25, 10.00),
+    "gemini-2.0-flash": (0.10, 0.40),
+}
+
+def load_prices() -> Dict[str, Tuple[float, float]]:
+    """Default price table, overridden by LLM_PRICES ('{"model": [prompt, completion], ...}' per 1M tokens)"""
+    prices = dict(DEFAULT_LLM_PRICES)
+    overrides = os.getenv("LLM_PRICES")
+    if overrides:
+        prices.update({model: tuple(price) for model, price in json.loads(overrides).items()})
+    return prices
+
+def estimate_tokens(content: Any) -> int:
+    """Rough token count (~4 characters per token) for providers that don't report usage"""
+    if content is None:
+        return 0
+    text = content if isinstance(content, str) else json.dumps(content, default=str)
+    return (len(text) + 3) // 4
+
+class LLMCostModel:
+    def __init__(self, prices: Optional[Dict[str, Tuple[float, float]]] = None):
+        self.prices = prices if prices is not None else load_prices()
+
+    def price(self, model: Optional[str]) -> Optional[Tuple[float, float]]:
+        name = (model or "").split("/")[-1]
+        matches = [key for key in self.prices if name.startswith(key)]
+        return self.prices[max(matches, key=len)] if matches else None
+
+    def cost(self, model: Optional[str], prompt_tokens: int, completion_tokens: int) -> float:
+        """Cost of one call in USD (0 for models without a known price)"""
+        price = self.price(model)
+        if price is None:
+            return 0.0
+        return (prompt_tokens * price[0] + completion_tokens * price[1]) / 1_000_000
+
+def _usage_tokens(usage: Optional[Dict[str, Any]]) -> Tuple[Optional[int], Optional[int]]:
+    if not usage:
+        return None, None
+    prompt = usage.get("prompt_tokens", usage.get("input_tokens"))
+    completion = usage.get("completion_tokens", usage.get("output_tokens"))
+    return prompt, completion
+
+class LLMUsageTracker:
+    """Turns crewai LLM and tool events into log_llm_call / log_tool_output records"""
+
+    def __init__(self, cost_model: Optional[LLMCostModel] = None):
+        self.cost_model = cost_model or LLMCostModel()
+        self._started: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def on_llm_started(self, event):
+        with self._lock:
+            self._started[event.call_id] = time.perf_counter()
+
+    def on_llm_finished(self, event, success: bool = True):
+        with self._lock:
+            started = self._started.pop(event.call_id, None)
+        latency_ms = (time.perf_counter() - started) * 1000 if started is not None else 0.0
+
+        prompt_tokens, completion_tokens = _usage_tokens(getattr(event, "usage", None))
+        estimated = prompt_tokens is None or completion_tokens is None
+        if prompt_tokens is None:
+            prompt_tokens = estimate_tokens(getattr(event, "messages", None))
+        if completion_tokens is None:
+            completion_tokens = estimate_tokens(getattr(event, "response", None)) if success else 0
+
+        log_llm_call(
+            agent=getattr(event, "agent_role", None) or "unknown",
+            task=getattr(event, "task_name", None) or "unknown",
+            model=event.model or "unknown",
+            prompt_tokens=int(prompt_tokens),
+            completion_tokens=int(completion_tokens),
+            latency_ms=latency_ms,
+            cost_usd=self.cost_model.cost(event.model, prompt_tokens, completion_tokens),
+            success=success,
+            estimated=estimated
+        )
+
+    def on_tool_finished(self, event):
+        output = getattr(event, "output", None)
+        log_tool_output(
+            tool_name=event.tool_name,
+            agent=event.agent_role or "unknown",
+            task=event.task_name or "unknown",
+            tokens=estimate_tokens(output),
+            from_cache=getattr(event, "from_cache", False)
+        )
+
+_tracker: Optional[LLMUsageTracker] = None
+_install_lock = threading.Lock()
+
+def install_usage_tracking() -> LLMUsageTracker:
+    """Register the tracker on crewai's event bus (once per process)"""
+    global _tracker
+    with _install_lock:
+        if _tracker is not None:
+            return _tracker
+        from crewai.events import crewai_event_bus
+        from crewai.events.types.llm_events import LLMCallCompletedEvent, LLMCallFailedEvent, LLMCallStartedEvent
+        from crewai.events.types.tool_usage_events import ToolUsageFinishedEvent
+
+        tracker = LLMUsageTracker()
+        crewai_event_bus.on(LLMCallStartedEvent)(lambda source, event: tracker.on_llm_started(event))
+        crewai_event_bus.on(LLMCallCompletedEvent)(lambda source, event: tracker.on_llm_finished(event))
+        crewai_event_bus.on(LLMCallFailedEvent)(lambda source, event: tracker.on_llm_finished(event, success=False))
+        crewai_event_bus.on(ToolUsageFinishedEvent)(lambda source, event: tracker.on_tool_finished(event))
+        _tracker = tracker
+        return tracker
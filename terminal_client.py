@@ -1 +1,148 @@
-# Stub for terminal client 
\ No newline at end of file
+"""
+Terminal client for campAIgn-pilot agents.
+
+Streams AD_Agent / DM_Agent output token by token and reports time-to-first-token
+and tokens/sec after every response.
+
+Usage:
+    python terminal_client.py                       # interactive, Gemini
+    python terminal_client.py --agent dm "Draft a DM to a lapsed customer"
+    python terminal_client.py --mock                # offline, canned streaming model
+
+Interactive commands: /ad, /dm (switch agent), /quit
+"""
+
+import argparse
+import asyncio
+import os
+import re
+import sys
+import time
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Optional
+
+from dotenv import load_dotenv
+
+from agents.ad_agent import AD_Agent
+from agents.dm_agent import DM_Agent
+
+_WORD_PATTERN = re.compile(r"\w+|[^\w\s]")
+
+
+@dataclass
+class StreamStats:
+    started: float
+    first_token_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    tokens: int = 0
+    chunks: int = 0
+
+    @property
+    def ttft_ms(self) -> float:
+        return ((self.first_token_at or self.started) - self.started) * 1000
+
+    @property
+    def tokens_per_second(self) -> float:
+        # Decode rate: tokens after the first one over the time spent producing them
+        if self.first_token_at is None or self.finished_at is None or self.tokens < 2:
+            return 0.0
+        elapsed = self.finished_at - self.first_token_at
+        return (self.tokens - 1) / elapsed if elapsed > 0 else 0.0
+
+    def summary(self) -> str:
+        total_ms = ((self.finished_at or self.started) - self.started) * 1000
+        return (f"TTFT {self.ttft_ms:.0f} ms · ~{self.tokens} tokens · "
+                f"{self.tokens_per_second:.1f} tok/s · total {total_ms:.0f} ms")
+
+
+def _count_tokens(text: str) -> int:
+    """Approximate token count (words and punctuation); streamed chunks don't carry exact counts."""
+    return len(_WORD_PATTERN.findall(text))
+
+
+async def stream_with_stats(agent, prompt: str, out=sys.stdout) -> StreamStats:
+    """Write an agent's streamed response to `out` as it arrives and measure it."""
+    stats = StreamStats(started=time.perf_counter())
+    async for text in agent.astream(prompt):
+        if not text:
+            continue
+        if stats.first_token_at is None:
+            stats.first_token_at = time.perf_counter()
+        stats.chunks += 1
+        stats.tokens += _count_tokens(text)
+        out.write(text)
+        out.flush()
+    stats.finished_at = time.perf_counter()
+    out.write("\n")
+    return stats
+
+
+class MockStreamingModel:
+    """Offline stand-in that streams a canned reply with a fixed per-token delay."""
+
+    def __init__(self, latency: float = 0.3, token_delay: float = 0.02):
+        self.latency = latency
+        self.token_delay = token_delay
+
+    def _reply(self, prompt: Any) -> str:
+        return f"(mock) Here is a punchy take on: {prompt}. Limited time only - grab yours today!"
+
+    async def abatch(self, inputs):
+        await asyncio.sleep(self.latency)
+        return [self._reply(prompt) for prompt in inputs]
+
+    async def astream(self, prompt: Any) -> AsyncIterator[str]:
+        await asyncio.sleep(self.latency)
+        for token in re.findall(r"\S+\s*", self._reply(prompt)):
+            await asyncio.sleep(self.token_delay)
+            yield token
+
+
+def build_model(model_name: str, mock: bool):
+    if mock:
+        return MockStreamingModel()
+    from langchain_google_genai import ChatGoogleGenerativeAI
+    return ChatGoogleGenerativeAI(model=model_name, temperature=0.7)
+
+
+async def repl(agents, agent_name: str) -> None:
+    print(f"campAIgn-pilot terminal · agent: {agent_name} · /ad /dm to switch, /quit to exit")
+    while True:
+        try:
+            line = (await asyncio.to_thread(input, f"{agent_name}> ")).strip()
+        except (EOFError, KeyboardInterrupt):
+            print()
+            return
+        if not line:
+            continue
+        if line == "/quit":
+            return
+        if line.lstrip("/") in agents and line.startswith("/"):
+            agent_name = line[1:]
+            continue
+        stats = await stream_with_stats(agents[agent_name], line)
+        print(f"\033[2m{stats.summary()}\033[0m")
+
+
+def main():
+    load_dotenv()
+    parser = argparse.ArgumentParser(description="Stream campAIgn-pilot agent responses in the terminal")
+    parser.add_argument("prompt", nargs="?", help="Send one prompt and exit (default: interactive)")
+    parser.add_argument("--agent", choices=["ad", "dm"], default="ad")
+    parser.add_argument("--model", default=os.getenv("TERMINAL_CLIENT_MODEL", "gemini-2.5-flash"))
+    parser.add_argument("--mock", action="store_true",
+                        default=os.getenv("MOCK_API_RESPONSES", "false").lower() == "true",
+                        help="Use an offline mock model (also enabled by MOCK_API_RESPONSES=true)")
+    args = parser.parse_args()
+
+    model = build_model(args.model, args.mock)
+    agents = {"ad": AD_Agent(model), "dm": DM_Agent(model)}
+    if args.prompt:
+        stats = asyncio.run(stream_with_stats(agents[args.agent], args.prompt))
+        print(stats.summary(), file=sys.stderr)
+    else:
+        asyncio.run(repl(agents, args.agent))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,52 +1,84 @@
+import asyncio
+
+import pytest
+
 from agents.base_model import BaseModel
 
+
+class FakeModel:
+    def __init__(self):
+        self.batches = []
+
+    async def abatch(self, inputs):
+        self.batches.append(list(inputs))
+        await asyncio.sleep(0.01)
+        return [f"echo: {text}" for text in inputs]
+
+    async def astream(self, text):
+        for token in text.split():
+            yield token
+
+
 def test_base_model_init():
     model = BaseModel()
     assert isinstance(model, BaseModel)
-```
 
-```python:tests/test_ad_agent.py
-from agents.ad_agent import AD_Agent
 
-def test_ad_agent_init():
-    agent = AD_Agent()
-    assert isinstance(agent, AD_Agent)
-```
+def test_concurrent_calls_are_coalesced():
+    fake = FakeModel()
+    model = BaseModel(fake, batch_window_ms=20)
+
+    async def main():
+        return await asyncio.gather(*(model.ainvoke(f"q{i}") for i in range(10)))
+
+    assert asyncio.run(main()) == [f"echo: q{i}" for i in range(10)]
+    assert len(fake.batches) == 1
+    assert model.stats == {"requests": 10, "batches": 1, "largest_batch": 10}
+
 
-```python:tests/test_dm_agent.py
-from agents.dm_agent import DM_Agent
+def test_batches_are_capped():
+    fake = FakeModel()
+    model = BaseModel(fake, max_batch_size=4)
+    assert model.batch([str(i) for i in range(10)]) == [f"echo: {i}" for i in range(10)]
+    assert [len(batch) for batch in fake.batches] == [4, 4, 2]
 
-def test_dm_agent_init():
-    agent = DM_Agent()
-    assert isinstance(agent, DM_Agent)
-```
 
----
+def test_astream_yields_chunks():
+    model = BaseModel(FakeModel())
 
-### markdown_guides/
+    async def main():
+        return [chunk async for chunk in model.astream("buy the new headphones")]
 
-```markdown:markdown_guides/__init__.md
-# Markdown guides package
-```
+    assert asyncio.run(main()) == ["buy", "the", "new", "headphones"]
 
-```markdown:markdown_guides/base_model.md
-# BaseModel
 
-Stub documentation for BaseModel.
-```
+def test_errors_reach_every_caller():
+    class Broken(FakeModel):
+        async def abatch(self, inputs):
+            raise ValueError("model down")
 
-```markdown:markdown_guides/ad_agent.md
-# AD_Agent
+    model = BaseModel(Broken())
+    with pytest.raises(ValueError):
+        model.batch(["a", "b"])
+    with pytest.raises(RuntimeError):
+        BaseModel().invoke("no model")
 
-Stub documentation for AD_Agent.
-```
 
-```markdown:markdown_guides/dm_agent.md
-# DM_Agent
+def test_cancelled_batch_cancels_callers():
+    class Slow(FakeModel):
+        async def abatch(self, inputs):
+            await asyncio.sleep(10)
 
-Stub documentation for DM_Agent.
-```
+    model = BaseModel(Slow(), batch_window_ms=1)
 
----
+    async def main():
+        calls = asyncio.gather(model.ainvoke("a"), model.ainvoke("b"), return_exceptions=True)
+        await asyncio.sleep(0.05)
+        assert len(model._batch_tasks) == 1
+        for task in model._batch_tasks:
+            task.cancel()
+        return await asyncio.wait_for(calls, 1)
 
-**This gives you a clean, ready-to-extend Python project with the requested structure. Let me know if you want to add or change anything!** 
\ No newline at end of file
+    results = asyncio.run(main())
+    assert all(isinstance(result, asyncio.CancelledError) for result in results)
+    assert not model._batch_tasks
@@ -0,0 +1,39 @@
+from chain.cache import SemanticCache
+
+def test_exact_hit(tmp_path):
+    cache = SemanticCache(str(tmp_path / "cache.sqlite"))
+    cache.update("Write a viral tweet promoting the game: Diablo II", "gemini", "tweet")
+    assert cache.lookup("Write a viral tweet promoting the game: Diablo II", "gemini") == "tweet"
+    assert cache.stats["exact_hits"] == 1
+
+def test_default_matches_exact_prompts_only(tmp_path):
+    cache = SemanticCache(str(tmp_path / "cache.sqlite"))
+    cache.update("Write a viral tweet promoting the game: Diablo II", "gemini", "tweet")
+    assert cache.lookup("Write a viral tweet promoting the game: Diablo III", "gemini") is None
+    assert cache.lookup("Write a viral tweet promoting the game Diablo II!", "gemini") is None
+    assert cache.stats["semantic_hits"] == 0
+
+def test_semantic_hit_respects_threshold(tmp_path):
+    cache = SemanticCache(str(tmp_path / "cache.sqlite"), threshold=0.95)
+    cache.update("Write a viral tweet promoting the game: Diablo II", "gemini", "tweet")
+    assert cache.lookup("Write a viral tweet promoting the game Diablo II!", "gemini") == "tweet"
+    # Same template, different entity: similarity is about 0.9, below the threshold
+    assert cache.lookup("Write a viral tweet promoting the game: Diablo III", "gemini") is None
+    assert cache.lookup("Summarize the quarterly sales report", "gemini") is None
+    assert cache.stats["semantic_hits"] == 1
+    assert cache.stats["misses"] == 2
+
+def test_models_do_not_share_entries(tmp_path):
+    cache = SemanticCache(str(tmp_path / "cache.sqlite"))
+    cache.update("hello", "model-a", "a")
+    assert cache.lookup("hello", "model-b") is None
+
+def test_persists_and_evicts(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    cache = SemanticCache(path, max_entries=2)
+    for i in range(3):
+        cache.update(f"prompt number {i}", "gemini", i)
+    reopened = SemanticCache(path, max_entries=2)
+    assert len(reopened) == 2
+    assert reopened.lookup("prompt number 2", "gemini") == 2
+    assert reopened.hit_rate() == 1.0
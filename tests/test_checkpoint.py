@@ -0,0 +1,51 @@
+import pytest
+
+from chain.checkpoint import MemoryCheckpointer, SQLiteCheckpointer, get_checkpointer
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def checkpointer(request, tmp_path):
+    if request.param == "memory":
+        return MemoryCheckpointer(max_history=4)
+    return SQLiteCheckpointer(str(tmp_path / "checkpoints.sqlite"), max_history=4)
+
+
+def test_append_and_load(checkpointer):
+    version = checkpointer.append("t1", [{"role": "user", "content": "hi"}], {"agent": "ad_agent"})
+    checkpointer.append("t1", [{"role": "assistant", "content": "hello"}])
+    state = checkpointer.load("t1")
+    assert version == 1 and state.version == 2
+    assert [turn["content"] for turn in state.turns] == ["hi", "hello"]
+    assert state.metadata == {"agent": "ad_agent"}
+    assert state.summary is None
+
+
+def test_history_is_bounded_and_compacted(checkpointer):
+    for i in range(10):
+        checkpointer.append("t1", [{"role": "user", "content": f"message {i}"}])
+    state = checkpointer.load("t1")
+    assert [turn["content"] for turn in state.turns] == [f"message {i}" for i in range(6, 10)]
+    assert "message 0" in state.summary and "message 5" in state.summary
+    assert state.version == 10
+
+
+def test_threads_are_isolated(checkpointer):
+    checkpointer.append("a", [{"role": "user", "content": "x"}])
+    checkpointer.delete("b")
+    checkpointer.delete("a")
+    assert checkpointer.load("a").turns == []
+
+
+def test_sqlite_resumes_after_reopen(tmp_path):
+    path = str(tmp_path / "checkpoints.sqlite")
+    SQLiteCheckpointer(path, max_history=2).append("t", [{"role": "user", "content": str(i)} for i in range(3)])
+    state = SQLiteCheckpointer(path, max_history=2).load("t")
+    assert [turn["content"] for turn in state.turns] == ["1", "2"]
+    assert state.summary == "user: 0"
+
+
+def test_unsupported_backend():
+    with pytest.raises(ValueError, match="Unsupported checkpointer backend: redis"):
+        get_checkpointer("redis")
+    with pytest.raises(ValueError, match="Unsupported checkpointer backend: postgres"):
+        get_checkpointer("postgres")
@@ -0,0 +1,60 @@
+import asyncio
+import time
+
+from chain.orchestrator import Handoff, Orchestrator
+
+
+class EchoAgent:
+    def __init__(self, delay=0.0, reply=None):
+        self.delay = delay
+        self.reply = reply
+
+    async def ainvoke(self, payload):
+        await asyncio.sleep(self.delay)
+        return self.reply(payload) if self.reply else payload
+
+
+def test_routes_handoffs():
+    agents = {
+        "ad_agent": EchoAgent(reply=lambda p: Handoff("dm_agent", p + " -> ad")),
+        "dm_agent": EchoAgent(reply=lambda p: p + " -> dm"),
+    }
+    result = Orchestrator(agents).run_sync("ad_agent", "start")
+    assert result.status == "completed"
+    assert result.output == "start -> ad -> dm"
+    assert [hop.agent for hop in result.hops] == ["ad_agent", "dm_agent"]
+
+
+def test_hop_limit():
+    agents = {"ad_agent": EchoAgent(reply=lambda p: Handoff("ad_agent", p))}
+    result = Orchestrator(agents, max_hops=3).run_sync("ad_agent", "loop")
+    assert result.status == "hop_limit"
+    assert len(result.hops) == 3
+
+
+def test_hop_timeout():
+    result = Orchestrator({"dm_agent": EchoAgent(delay=1)}, hop_timeout=0.05).run_sync("dm_agent", "x")
+    assert result.status == "timeout"
+    assert result.hops[0].status == "timeout"
+
+
+def test_fan_out_runs_concurrently():
+    def plan(payload):
+        if isinstance(payload, list):
+            return sorted(payload)
+        return [Handoff("ad_agent", "b"), Handoff("dm_agent", "a")]
+
+    agents = {"planner": EchoAgent(reply=plan), "ad_agent": EchoAgent(delay=0.2), "dm_agent": EchoAgent(delay=0.2)}
+    start = time.perf_counter()
+    result = Orchestrator(agents).run_sync("planner", "go")
+    assert result.output == ["a", "b"]
+    assert time.perf_counter() - start < 0.35
+
+
+def test_deadline_cancels_in_flight_work():
+    agents = {"planner": EchoAgent(reply=lambda p: [Handoff("slow", 1), Handoff("slow", 2)]), "slow": EchoAgent(delay=5)}
+    start = time.perf_counter()
+    result = Orchestrator(agents).run_sync("planner", "go", deadline=0.1)
+    assert result.status == "deadline"
+    assert time.perf_counter() - start < 1
+    assert {hop.status for hop in result.hops if hop.agent == "slow"} == {"cancelled"}
@@ -0,0 +1,15 @@
+import asyncio
+import io
+
+from agents.ad_agent import AD_Agent
+from terminal_client import MockStreamingModel, stream_with_stats
+
+
+def test_stream_with_stats_measures_ttft_and_rate():
+    out = io.StringIO()
+    agent = AD_Agent(MockStreamingModel(latency=0.05, token_delay=0.001))
+    stats = asyncio.run(stream_with_stats(agent, "headphones", out))
+    assert out.getvalue().startswith("(mock) Here is a punchy take on: headphones.")
+    assert stats.ttft_ms >= 50
+    assert stats.chunks > 1 and stats.tokens >= stats.chunks
+    assert stats.tokens_per_second > 0